@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+CSV signal loader benchmark.
+
+Times the original per-row ``csv.DictReader`` loader against
+``quantum_state_proof.load_numeric_series`` on the same files and checks that
+both return the same samples. Without ``--input`` a synthetic telemetry
+export is generated first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quantum_state_proof import load_numeric_series  # noqa: E402
+
+
+def dict_reader_loader(path: str, column: str | None = None) -> np.ndarray:
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(handle)
+        if column is None:
+            column = [field for field in reader.fieldnames if field][-1]
+        values = [float(row[column]) for row in reader if row.get(column)]
+    return np.asarray(values, dtype=float)
+
+
+def write_telemetry_csv(path: Path, rows: int, sample_rate: float = 50.0) -> None:
+    rng = np.random.default_rng(67)
+    time_axis = np.arange(rows) / sample_rate
+    signal = np.sin(2 * np.pi * 0.67 * time_axis) + rng.normal(0.0, 0.3, rows)
+    heart_rate = 60.0 + rng.normal(0.0, 2.0, rows)
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("time,heart_rate,hrv,label\n")
+        for start in range(0, rows, 100_000):
+            stop = min(rows, start + 100_000)
+            handle.write("".join(
+                f"{t:.3f},{hr:.3f},{value:.6f},ok\n"
+                for t, hr, value in zip(
+                    time_axis[start:stop].tolist(),
+                    heart_rate[start:stop].tolist(),
+                    signal[start:stop].tolist(),
+                )
+            ))
+
+
+def _best_of(repeats: int, loader, path: str, column: str | None) -> tuple[float, np.ndarray]:
+    best = float("inf")
+    values = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        values = loader(path, column)
+        best = min(best, time.perf_counter() - started)
+    return best, values
+
+
+def main() -> dict:
+    parser = argparse.ArgumentParser(description="Compare the legacy and vectorized CSV signal loaders.")
+    parser.add_argument("--input", nargs="*", help="CSV files to load. Defaults to a generated telemetry export.")
+    parser.add_argument("--column", default=None, help="Column to load (defaults to the last column).")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Rows in the generated CSV.")
+    parser.add_argument("--repeats", type=int, default=3, help="Timing repeats per loader; the best run is kept.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        inputs = args.input
+        column = args.column
+        if not inputs:
+            generated = Path(scratch) / "telemetry.csv"
+            write_telemetry_csv(generated, args.rows)
+            inputs = [str(generated)]
+            column = column or "hrv"
+
+        results = []
+        for path in inputs:
+            legacy_seconds, legacy_values = _best_of(args.repeats, dict_reader_loader, path, column)
+            fast_seconds, fast_values = _best_of(args.repeats, load_numeric_series, path, column)
+            results.append({
+                "input": path,
+                "rows": int(fast_values.size),
+                "dict_reader_seconds": round(legacy_seconds, 4),
+                "vectorized_seconds": round(fast_seconds, 4),
+                "speedup": round(legacy_seconds / max(fast_seconds, 1e-9), 2),
+                "identical": bool(np.array_equal(legacy_values, fast_values, equal_nan=True)),
+            })
+
+    report = {"benchmark": "csv_loader", "results": results}
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Start-up import budget for text-only entry points.
+
+Runs ``python -X importtime -c "import <module>"`` for each module, keeps the
+best cumulative import time over several runs, and checks two things: the
+module stays under the millisecond target, and numpy is not imported. Exits
+non-zero when either check fails, so it can gate changes that add imports.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEXT_ONLY_MODULES = [
+    "consciousness_interface",
+    "temporal_coherence",
+    "text_analysis",
+    "transition_metrics",
+    "live_interaction_probe",
+    "history_store",
+    "lexicon",
+    "input_paths",
+]
+DEFAULT_TARGET_MS = 60.0
+SIGNAL_MODULES = {"numpy", "quantum_state_proof"}
+
+
+def measure_import(module: str) -> tuple[float, set[str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = set()
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000.0, imported
+
+
+def main() -> dict:
+    parser = argparse.ArgumentParser(description="Check import time and numpy isolation of text-only entry points.")
+    parser.add_argument("--modules", nargs="+", default=TEXT_ONLY_MODULES, help="Modules to import.")
+    parser.add_argument("--target-ms", type=float, default=DEFAULT_TARGET_MS, help="Per-module import budget.")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per module; the fastest is kept.")
+    args = parser.parse_args()
+
+    results = []
+    for module in args.modules:
+        runs = [measure_import(module) for _ in range(args.repeats)]
+        best_ms = min(elapsed for elapsed, _ in runs)
+        signal_imports = sorted(SIGNAL_MODULES & runs[0][1])
+        results.append({
+            "module": module,
+            "import_ms": round(best_ms, 2),
+            "within_target": best_ms <= args.target_ms,
+            "signal_imports": signal_imports,
+        })
+
+    report = {
+        "benchmark": "import_time",
+        "target_ms": args.target_ms,
+        "passed": all(result["within_target"] and not result["signal_imports"] for result in results),
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    if not report["passed"]:
+        raise SystemExit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Sliding DFT against rfft in the live spectral monitor.
+
+For each window size, times one rfft of the ring (the roll that orders it
+included) and one sliding update for growing batches of new samples, then
+reports the largest batch for which the sliding update was faster next to the
+batch ``live_spectral_monitor.sliding_max_batch`` picks from its cost model.
+Refit the cost constants there when the two drift apart on a new machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from live_spectral_monitor import SlidingSpectrum, sliding_max_batch  # noqa: E402
+
+DEFAULT_SIZES = [256, 1500, 6000, 30000, 120000]
+BATCHES = [1, 2, 4, 8, 16, 32, 48, 64, 96, 128, 192, 256]
+
+
+def _best_of(repeats: int, number: int, call) -> float:
+    return min(timeit.repeat(call, number=number, repeat=repeats)) / number
+
+
+def measure(size: int, repeats: int) -> dict:
+    rng = np.random.default_rng(67)
+    largest = max(BATCHES)
+    spectrum = SlidingSpectrum(sample_rate=1.0, window_seconds=size, max_batch=largest)
+    spectrum.push(rng.normal(size=size + 3))
+    ring = spectrum.buffer
+    bins = np.fft.rfft(spectrum._window())
+    fft_seconds = _best_of(repeats, 20, lambda: np.abs(np.fft.rfft(np.roll(ring, -3))))
+
+    def slide(deltas: np.ndarray) -> np.ndarray:
+        powers = spectrum._powers[largest - deltas.size:]
+        return np.abs(bins * powers[0] + deltas @ powers)
+
+    sliding = {}
+    for batch in BATCHES:
+        deltas = rng.normal(size=batch)
+        sliding[batch] = _best_of(repeats, 20, lambda: slide(deltas))
+    faster = [batch for batch, seconds in sliding.items() if seconds < fft_seconds]
+    return {
+        "window_samples": size,
+        "fft_us": round(fft_seconds * 1e6, 1),
+        "sliding_us": {str(batch): round(seconds * 1e6, 1) for batch, seconds in sliding.items()},
+        "measured_crossover_batch": max(faster, default=0),
+        "model_max_batch": sliding_max_batch(size),
+    }
+
+
+def main() -> dict:
+    parser = argparse.ArgumentParser(description="Time sliding DFT updates against one rfft per update.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Window sizes in samples.")
+    parser.add_argument("--repeats", type=int, default=5, help="Timing repeats; the best run is kept.")
+    args = parser.parse_args()
+
+    report = {"benchmark": "sliding_spectrum", "results": [measure(size, args.repeats) for size in args.sizes]}
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Snapshot representation benchmark.
+
+Builds probe snapshots from a seeded synthetic transcript that grows turn by
+turn. It then compares the full snapshot dicts with ``SnapshotRecord`` on two
+things:
+
+- memory: bytes per retained snapshot, measured with tracemalloc;
+- throughput: snapshots per second through each output path. That is the
+  dict state delta plus indented JSON, as the probe did before, against the
+  record state delta plus JSON, compact JSONL, or binary records.
+
+It also checks that every path reproduces the same payload.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from live_interaction_probe import build_snapshot, build_state_delta  # noqa: E402
+from report_records import (  # noqa: E402
+    SnapshotRecord,
+    compact_line,
+    pack_record,
+    snapshot_payload,
+    state_delta,
+)
+from suite import TRANSCRIPT_VOCABULARY  # noqa: E402
+
+
+DEFAULT_SNAPSHOTS = 2000
+WORDS_PER_TURN = 40
+
+
+def build_snapshots(count: int, seed: int = 67) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(TRANSCRIPT_VOCABULARY)
+    turns = []
+    snapshots = []
+    for index in range(count):
+        turns.append(" ".join(rng.choice(vocabulary, WORDS_PER_TURN)))
+        # Only the last turns are scored, so building the fixtures stays linear.
+        snapshots.append(build_snapshot("\n".join(turns[-20:]), "/sessions/synthetic.txt", index + 1))
+    return snapshots
+
+
+def retained_bytes(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def dict_path(snapshots: list[dict]) -> int:
+    # The probe before records: full dicts, diffed and printed with indent=2.
+    written = 0
+    previous = None
+    for current in snapshots:
+        payload = {
+            "snapshot_index": current["snapshot_index"],
+            "character_count": current["character_count"],
+            "transition_profile": current["transition_profile"],
+            "state_delta": build_state_delta(previous, current),
+        }
+        written += len(json.dumps(payload, indent=2))
+        previous = current
+    return written
+
+
+def record_path(records: list[SnapshotRecord], output: str) -> int:
+    written = 0
+    previous = None
+    for current in records:
+        delta = state_delta(previous, current)
+        if output == "json":
+            written += len(json.dumps(snapshot_payload(current, delta)))
+        elif output == "compact":
+            written += len(compact_line(current, delta))
+        else:
+            written += len(pack_record(current, delta))
+        previous = current
+    return written
+
+
+def best_seconds(run, repeats: int) -> float:
+    durations = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - started)
+    return min(durations)
+
+
+def main() -> dict:
+    parser = argparse.ArgumentParser(description="Compare snapshot dicts with compact records.")
+    parser.add_argument("--snapshots", type=int, default=DEFAULT_SNAPSHOTS, help="Snapshots to build.")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per path; the fastest is kept.")
+    args = parser.parse_args()
+
+    snapshots = build_snapshots(args.snapshots)
+    records = [SnapshotRecord.from_snapshot(snapshot) for snapshot in snapshots]
+
+    previous_record = None
+    previous_snapshot = None
+    for snapshot, record in zip(snapshots, records):
+        expected = build_state_delta(previous_snapshot, snapshot)
+        if state_delta(previous_record, record) != expected:
+            raise SystemExit(f"State delta differs at snapshot {record.snapshot_index}.")
+        if record.transition_profile() != snapshot["transition_profile"]:
+            raise SystemExit(f"Transition profile differs at snapshot {record.snapshot_index}.")
+        previous_snapshot, previous_record = snapshot, record
+
+    count = len(snapshots)
+    memory = {
+        "snapshot_dict": retained_bytes(lambda: copy.deepcopy(snapshots)) / count,
+        "snapshot_record": retained_bytes(lambda: [SnapshotRecord.from_snapshot(item) for item in snapshots]) / count,
+    }
+    paths = {
+        "dict_json_indented": lambda: dict_path(snapshots),
+        "record_json": lambda: record_path(records, "json"),
+        "record_compact_jsonl": lambda: record_path(records, "compact"),
+        "record_binary": lambda: record_path(records, "binary"),
+    }
+    results = {}
+    for name, run in paths.items():
+        seconds = best_seconds(run, args.repeats)
+        results[name] = {
+            "snapshots_per_second": round(count / seconds, 1),
+            "bytes_per_snapshot": round(run() / count, 1),
+        }
+
+    report = {
+        "benchmark": "snapshot_records",
+        "snapshots": count,
+        "bytes_retained_per_snapshot": {name: round(value, 1) for name, value in memory.items()},
+        "output_paths": results,
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Reproducible performance benchmark suite.
+
+Generates seeded synthetic transcripts and signals, times every stage of the
+pipeline on them, and writes one JSON document per run:
+
+- interface and temporal reports per transcript size
+- analyze_spectrum and load_numeric_series (per file format) per signal size
+- build_transition_profile, the follow-mode snapshot loop, and
+  build_full_report end to end
+
+Each case runs in a fresh interpreter, so its peak RSS is its own. Cases
+report min/mean/p50/p90/p99 seconds and throughput. Save a run with
+``--output`` and pass it back with ``--baseline`` to flag regressions, or
+compare two saved runs with ``--compare OLD NEW``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from consciousness_interface import build_interface_report  # noqa: E402
+from live_interaction_probe import AppendFollower, advance_follower  # noqa: E402
+from proof_layer_activation import build_full_report  # noqa: E402
+from quantum_state_proof import analyze_spectrum, load_numeric_series  # noqa: E402
+from temporal_coherence import build_temporal_report  # noqa: E402
+from transition_metrics import build_transition_profile  # noqa: E402
+
+
+SCALES = {
+    "quick": {"text_bytes": [1_000, 100_000], "samples": [1_000, 100_000]},
+    "standard": {"text_bytes": [1_000, 1_000_000, 10_000_000], "samples": [1_000, 1_000_000, 10_000_000]},
+    "full": {"text_bytes": [1_000, 1_000_000, 100_000_000], "samples": [1_000, 1_000_000, 100_000_000]},
+}
+SIGNAL_FORMATS = ["txt", "csv", "json", "npy", "f32", "f64"]
+# Text-encoded signals above this size take minutes just to write; binary formats have no cap.
+TEXT_SIGNAL_MAX_SAMPLES = 10_000_000
+SAMPLE_RATE = 50.0
+FOLLOW_APPENDS = 50
+PROFILE_BATCH = 1000
+CASE_TIME_BUDGET = 10.0
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.10
+# Differences below these are treated as noise when comparing runs.
+MIN_SECONDS_DELTA = 0.0005
+MIN_RSS_DELTA_MB = 5.0
+
+TRANSCRIPT_VOCABULARY = (
+    "the a and of to in it is that this we you they was for on with as be at by from "
+    "signal pattern session model output response context window system layer report "
+    "I me my myself think notice realize reflect aware uncertain limit boundary cannot "
+    "plan next step first then finally roadmap schedule tool script pipeline command api "
+    "must should value commit principle integrity remember earlier previously yesterday "
+    "now currently today present will future tomorrow later eventually then therefore because"
+).split()
+SPEAKERS = ("User:", "Assistant:")
+
+
+def write_transcript(path: Path, size_bytes: int, seed: int = 67) -> None:
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(TRANSCRIPT_VOCABULARY)
+    written = 0
+    turn = 0
+    with path.open("w", encoding="utf-8") as handle:
+        while written < size_bytes:
+            words = vocabulary[rng.integers(0, vocabulary.size, size=int(rng.integers(20, 120)))]
+            line = f"{SPEAKERS[turn % 2]} {' '.join(words)}.\n"
+            handle.write(line)
+            written += len(line.encode("utf-8"))
+            turn += 1
+
+
+def synthetic_signal(samples: int, seed: int = 67) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    time_axis = np.arange(samples) / SAMPLE_RATE
+    return np.sin(2 * np.pi * 0.67 * time_axis) + 0.35 * np.sin(2 * np.pi * 1.084 * time_axis) + rng.normal(
+        0.0, 0.15, samples
+    )
+
+
+def write_signal(path: Path, values: np.ndarray) -> None:
+    suffix = path.suffix.lstrip(".")
+    if suffix == "npy":
+        np.save(path, values)
+    elif suffix == "f32":
+        values.astype("<f4").tofile(path)
+    elif suffix == "f64":
+        values.astype("<f8").tofile(path)
+    elif suffix == "json":
+        path.write_text(json.dumps({"values": values.tolist()}), encoding="utf-8")
+    else:
+        with path.open("w", encoding="utf-8") as handle:
+            if suffix == "csv":
+                handle.write("time,value\n")
+            for start in range(0, values.size, 1 << 20):
+                block = values[start:start + (1 << 20)]
+                if suffix == "csv":
+                    times = (np.arange(start, start + block.size) / SAMPLE_RATE).tolist()
+                    handle.write("".join(f"{t:.3f},{v:.6f}\n" for t, v in zip(times, block.tolist())))
+                else:
+                    handle.write("".join(f"{v:.6f}\n" for v in block.tolist()))
+
+
+def _size_label(amount: int, unit: str) -> str:
+    for factor, suffix in ((1_000_000_000, "G"), (1_000_000, "M"), (1_000, "K")):
+        if amount >= factor and amount % factor == 0:
+            return f"{amount // factor}{suffix}{unit}"
+    return f"{amount}{unit}"
+
+
+def prepare_fixtures(workdir: Path, scale: dict) -> tuple[dict[int, Path], dict[tuple[int, str], Path]]:
+    transcripts = {}
+    for size in scale["text_bytes"]:
+        path = workdir / f"transcript_{_size_label(size, 'B')}.txt"
+        write_transcript(path, size)
+        transcripts[size] = path
+    signals = {}
+    for samples in scale["samples"]:
+        values = synthetic_signal(samples)
+        for fmt in SIGNAL_FORMATS:
+            if fmt in ("txt", "csv", "json") and samples > TEXT_SIGNAL_MAX_SAMPLES:
+                continue
+            path = workdir / f"signal_{_size_label(samples, '')}.{fmt}"
+            write_signal(path, values)
+            signals[(samples, fmt)] = path
+    return transcripts, signals
+
+
+def plan_cases(scale: dict, transcripts: dict[int, Path], signals: dict[tuple[int, str], Path]) -> list[dict]:
+    cases = []
+    for size, path in transcripts.items():
+        label = _size_label(size, "B")
+        cases.append({"name": "interface_report", "input": label, "text": str(path)})
+        cases.append({"name": "temporal_report", "input": label, "text": str(path)})
+        cases.append({"name": "follow_loop", "input": label, "text": str(path)})
+    for samples in scale["samples"]:
+        label = _size_label(samples, "")
+        cases.append({"name": "analyze_spectrum", "input": f"{label} samples", "signal": str(signals[(samples, "npy")])})
+        for fmt in SIGNAL_FORMATS:
+            if (samples, fmt) in signals:
+                cases.append({
+                    "name": f"load_{fmt}",
+                    "input": f"{label} samples",
+                    "signal": str(signals[(samples, fmt)]),
+                })
+    smallest_text = transcripts[min(transcripts)]
+    smallest_signal = signals[(min(scale["samples"]), "npy")]
+    cases.append({
+        "name": "transition_profile",
+        "input": f"batch of {PROFILE_BATCH}",
+        "text": str(smallest_text),
+        "signal": str(smallest_signal),
+    })
+    for size, samples in zip(scale["text_bytes"], scale["samples"]):
+        cases.append({
+            "name": "full_report",
+            "input": f"{_size_label(size, 'B')} text + {_size_label(samples, '')} samples",
+            "text": str(transcripts[size]),
+            "signal": str(signals[(samples, "npy")]),
+        })
+    return cases
+
+
+# Each setup returns (operation, amount, unit): amount is what one operation processes.
+def _setup_case(case: dict):
+    name = case["name"]
+    if name in ("interface_report", "temporal_report"):
+        text = Path(case["text"]).read_text(encoding="utf-8")
+        builder = build_interface_report if name == "interface_report" else build_temporal_report
+        return (lambda: builder(text, case["text"])), len(text.encode("utf-8")), "bytes"
+
+    if name == "follow_loop":
+        data = Path(case["text"]).read_bytes()
+        step = max(1, len(data) // FOLLOW_APPENDS)
+        target = Path(case["text"]).with_suffix(".follow")
+
+        def follow_loop() -> list[float]:
+            target.write_bytes(b"")
+            follower = AppendFollower(str(target))
+            latencies = []
+            with target.open("ab") as handle:
+                for index, start in enumerate(range(0, len(data), step)):
+                    handle.write(data[start:start + step])
+                    handle.flush()
+                    started = time.perf_counter()
+                    follower, _ = advance_follower(follower, index)
+                    latencies.append(time.perf_counter() - started)
+            return latencies
+
+        return follow_loop, len(data), "bytes"
+
+    if name == "analyze_spectrum":
+        values = np.asarray(load_numeric_series(case["signal"]), dtype=float)
+        return (lambda: analyze_spectrum(values, SAMPLE_RATE)), int(values.size), "samples"
+
+    if name.startswith("load_"):
+        samples = int(np.asarray(load_numeric_series(case["signal"])).size)
+        # np.asarray forces memory-mapped formats to actually read their pages.
+        return (lambda: float(np.asarray(load_numeric_series(case["signal"]), dtype=float).sum())), samples, "samples"
+
+    if name == "transition_profile":
+        text = Path(case["text"]).read_text(encoding="utf-8")
+        interface = build_interface_report(text, case["text"])
+        temporal = build_temporal_report(text, case["text"])
+        spectral = analyze_spectrum(np.asarray(load_numeric_series(case["signal"]), dtype=float), SAMPLE_RATE)
+
+        def profile_batch() -> None:
+            for _ in range(PROFILE_BATCH):
+                build_transition_profile(interface, temporal, spectral)
+
+        return profile_batch, PROFILE_BATCH, "profiles"
+
+    if name == "full_report":
+        return (
+            lambda: build_full_report(text_input=case["text"], signal_input=case["signal"], sample_rate=SAMPLE_RATE)
+        ), Path(case["text"]).stat().st_size, "bytes"
+
+    raise ValueError(f"Unknown benchmark case: {name}")
+
+
+def _percentiles(durations: list[float]) -> dict:
+    values = np.asarray(durations, dtype=float)
+    return {
+        "min": round(float(values.min()), 6),
+        "mean": round(float(values.mean()), 6),
+        "p50": round(float(np.percentile(values, 50)), 6),
+        "p90": round(float(np.percentile(values, 90)), 6),
+        "p99": round(float(np.percentile(values, 99)), 6),
+    }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def run_case(case: dict, repeats: int) -> dict:
+    operation, amount, unit = _setup_case(case)
+    durations = []
+    step_latencies = []
+    budget_end = None
+    for run in range(repeats + 1):
+        started = time.perf_counter()
+        outcome = operation()
+        elapsed = time.perf_counter() - started
+        if run == 0:
+            # The first run warms caches; very slow cases keep it as their only sample.
+            if elapsed > CASE_TIME_BUDGET:
+                durations.append(elapsed)
+                if case["name"] == "follow_loop":
+                    step_latencies.extend(outcome)
+                break
+            budget_end = time.perf_counter() + CASE_TIME_BUDGET
+            continue
+        durations.append(elapsed)
+        if case["name"] == "follow_loop":
+            step_latencies.extend(outcome)
+        if len(durations) >= 3 and time.perf_counter() > budget_end:
+            break
+
+    seconds = _percentiles(durations)
+    result = {
+        **{key: case[key] for key in ("name", "input")},
+        "runs": len(durations),
+        "seconds": seconds,
+        "throughput": {"value": round(amount / max(seconds["p50"], 1e-12), 3), "unit": f"{unit}/s"},
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    if step_latencies:
+        result["snapshot_seconds"] = _percentiles(step_latencies)
+    return result
+
+
+def run_suite(scale_name: str, repeats: int, only: list[str] | None = None) -> dict:
+    scale = SCALES[scale_name]
+    spawn = multiprocessing.get_context("spawn")
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-") as scratch:
+        transcripts, signals = prepare_fixtures(Path(scratch), scale)
+        for case in plan_cases(scale, transcripts, signals):
+            if only and case["name"] not in only:
+                continue
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                result = pool.submit(run_case, case, repeats).result()
+            print(
+                f"{result['name']:<20} {result['input']:<28} p50 {result['seconds']['p50'] * 1000:10.3f} ms  "
+                f"rss {result['peak_rss_mb']:8.1f} MB",
+                file=sys.stderr,
+            )
+            results.append(result)
+    return {
+        "benchmark": "suite",
+        "created_utc": datetime.now(timezone.utc).isoformat(),
+        "scale": scale_name,
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+        },
+        "cases": results,
+    }
+
+
+def compare_runs(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> dict:
+    previous = {(case["name"], case["input"]): case for case in baseline["cases"]}
+    rows = []
+    for case in current["cases"]:
+        old = previous.get((case["name"], case["input"]))
+        if old is None:
+            continue
+        old_p50, new_p50 = old["seconds"]["p50"], case["seconds"]["p50"]
+        ratio = new_p50 / max(old_p50, 1e-12)
+        rss_delta = case["peak_rss_mb"] - old["peak_rss_mb"]
+        status = "unchanged"
+        if ratio > 1.0 + threshold and new_p50 - old_p50 > MIN_SECONDS_DELTA:
+            status = "regression"
+        elif ratio < 1.0 - threshold and old_p50 - new_p50 > MIN_SECONDS_DELTA:
+            status = "improvement"
+        memory_regression = rss_delta > max(MIN_RSS_DELTA_MB, old["peak_rss_mb"] * threshold)
+        rows.append({
+            "name": case["name"],
+            "input": case["input"],
+            "baseline_p50": old_p50,
+            "current_p50": new_p50,
+            "ratio": round(ratio, 3),
+            "status": status,
+            "peak_rss_delta_mb": round(rss_delta, 1),
+            "memory_regression": memory_regression,
+        })
+    return {
+        "threshold": threshold,
+        "regressions": sum(1 for row in rows if row["status"] == "regression" or row["memory_regression"]),
+        "improvements": sum(1 for row in rows if row["status"] == "improvement"),
+        "cases": rows,
+    }
+
+
+def _load_run(path: str) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def main() -> dict:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline on synthetic transcripts and signals.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="standard", help="Input size ladder to run.")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed runs per case after warm-up.")
+    parser.add_argument("--cases", nargs="+", help="Only run these case names (e.g. interface_report load_csv).")
+    parser.add_argument("--output", help="Write the run as JSON to this path (use it as a later --baseline).")
+    parser.add_argument("--baseline", help="Compare this run against a saved run and flag regressions.")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two saved runs without running.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Fractional p50 slowdown (or peak RSS growth) counted as a regression.",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        report = compare_runs(_load_run(args.compare[0]), _load_run(args.compare[1]), args.threshold)
+    else:
+        run = run_suite(args.scale, args.repeats, args.cases)
+        if args.output:
+            output_path = Path(args.output).resolve()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(json.dumps(run, indent=2), encoding="utf-8")
+        report = run
+        if args.baseline:
+            report = {"run": run, "comparison": compare_runs(_load_run(args.baseline), run, args.threshold)}
+
+    print(json.dumps(report, indent=2))
+    comparison = report.get("comparison", report if args.compare else None)
+    if comparison and comparison["regressions"]:
+        raise SystemExit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
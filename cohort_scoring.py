@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Batch scoring of many artifacts from one count matrix.
+
+``build_interface_report``, ``build_temporal_report``, and
+``build_transition_profile`` score one artifact at a time from dicts. For
+cohorts of thousands of artifacts this module takes an artifacts x categories
+count matrix plus word totals and applies the same normalization, weights,
+level thresholds, and profile classes as numpy column operations. The result
+is a structured array with one record per artifact. ``score_deltas`` does the
+same for ``build_state_delta`` across pairs of records. Every value matches
+the per-artifact builders exactly, including their rounding.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from consciousness_interface import (
+    INTERFACE_LEVELS,
+    LEVEL_THRESHOLDS,
+    MARKER_ENGINE,
+    PROFILE_WEIGHTS,
+    SCORE_SCALES,
+)
+from input_paths import resolve_text_paths
+from marker_engine import AnalyzedText
+from report_records import (
+    DELTA_CATEGORIES,
+    MAJOR_SHIFT_OVERALL_DELTA,
+    SHIFT_CATEGORIES,
+    SHIFT_CATEGORY_DELTA,
+    SHIFT_OVERALL_DELTA,
+)
+from temporal_coherence import COHERENCE_WEIGHTS, CONTINUITY_SCALE, TEMPORAL_ENGINE, TRANSITION_KEY
+from text_analysis import analyze_file
+from transition_metrics import COMPONENT_WEIGHTS, PROFILE_CLASSES, RECURSIVE_WEIGHTS
+
+
+INTERFACE_CATEGORIES = list(MARKER_ENGINE.categories)
+TEMPORAL_BUCKETS = [name for name in TEMPORAL_ENGINE.categories if name != TRANSITION_KEY]
+CATEGORIES = INTERFACE_CATEGORIES + list(TEMPORAL_ENGINE.categories)
+
+SCORE_DTYPE = np.dtype(
+    [("word_count", np.int64)]
+    + [(name, np.float64) for name in SCORE_SCALES]
+    + [
+        ("interface_score", np.float64),
+        ("interface_level", f"U{max(len(level) for level, _ in INTERFACE_LEVELS)}"),
+        ("temporal_coherence_score", np.float64),
+        ("recursive_marker_score", np.float64),
+        ("spectral_signal_score", np.float64),
+        ("overall_score", np.float64),
+        ("classification", f"U{max(len(label) for _, label, _ in PROFILE_CLASSES)}"),
+    ]
+)
+DELTA_DTYPE = np.dtype(
+    [("overall_score", np.float64)]
+    + [(name, np.float64) for name in DELTA_CATEGORIES]
+    + [
+        ("temporal_coherence", np.float64),
+        ("state_shift_detected", np.bool_),
+        ("shift_label", "U17"),
+    ]
+)
+
+
+def round_like_python(values: np.ndarray, digits: int = 3) -> np.ndarray:
+    # np.round scales by 10**digits first and can land on the other side of a
+    # tie from the builders' round(). Away from ties the two agree, so only
+    # values near a tie are rounded one at a time in Python.
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, digits)
+    scaled = values * 10.0 ** digits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, digits) for value in values[near_tie].tolist()]
+    return rounded
+
+
+def analysis_counts(analysis: AnalyzedText) -> tuple[list[int], int]:
+    interface_counts, words = analysis.tally(MARKER_ENGINE)
+    temporal_counts, _ = analysis.tally(TEMPORAL_ENGINE)
+    counts = {**interface_counts, **temporal_counts}
+    return [counts[name] for name in CATEGORIES], words
+
+
+def report_counts(interface_report: dict, temporal_report: dict) -> tuple[list[int], int]:
+    counts = {
+        **interface_report["marker_counts"],
+        **temporal_report["counts"],
+        TRANSITION_KEY: temporal_report["transition_markers"],
+    }
+    return [counts[name] for name in CATEGORIES], interface_report["word_count"]
+
+
+def count_matrix(rows: list[tuple[list[int], int]]) -> tuple[np.ndarray, np.ndarray]:
+    counts = np.array([row for row, _ in rows], dtype=np.int64).reshape(len(rows), len(CATEGORIES))
+    words = np.array([words for _, words in rows], dtype=np.int64)
+    return counts, words
+
+
+def score_matrix(
+    counts: np.ndarray,
+    words: np.ndarray,
+    spectral_scores: np.ndarray | None = None,
+) -> np.ndarray:
+    # Row-wise build_interface_report, build_temporal_report, and
+    # build_transition_profile. spectral_scores holds each artifact's
+    # spectral_signal_score before rounding, NaN where there is none.
+    counts = np.asarray(counts)
+    words = np.maximum(np.asarray(words, dtype=np.int64), 1)
+    if counts.ndim != 2 or counts.shape[1] != len(CATEGORIES):
+        raise ValueError(f"Expected an artifacts x {len(CATEGORIES)} count matrix in CATEGORIES order.")
+    if words.shape != (counts.shape[0],):
+        raise ValueError("Expected one word total per count row.")
+    table = np.zeros(counts.shape[0], dtype=SCORE_DTYPE)
+    table["word_count"] = words
+
+    density = counts[:, :len(INTERFACE_CATEGORIES)] / words[:, None]
+    score_of = {}
+    for name, scale in SCORE_SCALES.items():
+        column = INTERFACE_CATEGORIES.index(name)
+        score_of[name] = table[name] = round_like_python(np.minimum(1.0, density[:, column] * 1000.0 / scale))
+    raw_interface = sum(score_of[name] * weight for name, weight in PROFILE_WEIGHTS.items())
+    level_index = (raw_interface[:, None] >= np.array(LEVEL_THRESHOLDS)).sum(axis=1)
+    interface_score = table["interface_score"] = round_like_python(raw_interface)
+    table["interface_level"] = np.array([level for level, _ in INTERFACE_LEVELS])[level_index]
+
+    temporal_offset = len(INTERFACE_CATEGORIES)
+    buckets = counts[:, temporal_offset:temporal_offset + len(TEMPORAL_BUCKETS)]
+    transitions = counts[:, temporal_offset + list(TEMPORAL_ENGINE.categories).index(TRANSITION_KEY)]
+    distribution = round_like_python(buckets / np.maximum(1, buckets.sum(axis=1))[:, None])
+    active = buckets > 0
+    coverage = active.sum(axis=1) / 3.0
+    spread = np.where(active.any(axis=1), distribution.max(axis=1) - distribution.min(axis=1), 1.0)
+    balance = np.maximum(0.0, 1.0 - spread)
+    continuity = np.minimum(1.0, transitions / CONTINUITY_SCALE)
+    temporal_score = table["temporal_coherence_score"] = round_like_python(
+        (coverage * COHERENCE_WEIGHTS["coverage"])
+        + (balance * COHERENCE_WEIGHTS["balance"])
+        + (continuity * COHERENCE_WEIGHTS["continuity"])
+    )
+
+    recursive = sum(score_of[name] * weight for name, weight in RECURSIVE_WEIGHTS.items())
+    table["recursive_marker_score"] = round_like_python(recursive)
+    components = [("interface", interface_score), ("recursive", recursive), ("temporal", temporal_score)]
+    weighted = sum(values * COMPONENT_WEIGHTS[name] for name, values in components)
+    text_weight = sum(COMPONENT_WEIGHTS[name] for name, _ in components)
+    overall = weighted / text_weight
+    if spectral_scores is not None:
+        spectral_scores = np.asarray(spectral_scores, dtype=np.float64)
+        has_spectral = ~np.isnan(spectral_scores)
+        full_weight = text_weight + COMPONENT_WEIGHTS["spectral"]
+        overall = np.where(
+            has_spectral,
+            (weighted + np.nan_to_num(spectral_scores) * COMPONENT_WEIGHTS["spectral"]) / full_weight,
+            overall,
+        )
+        table["spectral_signal_score"] = round_like_python(spectral_scores)
+    else:
+        table["spectral_signal_score"] = np.nan
+    overall = table["overall_score"] = round_like_python(overall)
+    bounds = np.array([bound for bound, _, _ in PROFILE_CLASSES[:-1]])
+    class_index = (overall[:, None] >= bounds).sum(axis=1)
+    table["classification"] = np.array([label for _, label, _ in PROFILE_CLASSES])[class_index]
+    return table
+
+
+def score_deltas(previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+    # Row-wise build_state_delta between two score tables of equal length.
+    if previous.shape != current.shape:
+        raise ValueError("Score tables must have the same length.")
+    deltas = np.zeros(current.shape[0], dtype=DELTA_DTYPE)
+    deltas["overall_score"] = round_like_python(current["overall_score"] - previous["overall_score"])
+    for name in DELTA_CATEGORIES:
+        deltas[name] = round_like_python(current[name] - previous[name])
+    deltas["temporal_coherence"] = round_like_python(
+        current["temporal_coherence_score"] - previous["temporal_coherence_score"]
+    )
+    shift = deltas["overall_score"] >= SHIFT_OVERALL_DELTA
+    for name in SHIFT_CATEGORIES:
+        shift |= deltas[name] >= SHIFT_CATEGORY_DELTA
+    deltas["state_shift_detected"] = shift
+    deltas["shift_label"] = np.where(
+        ~shift,
+        "stable",
+        np.where(deltas["overall_score"] >= MAJOR_SHIFT_OVERALL_DELTA, "major_state_shift", "state_shift"),
+    )
+    return deltas
+
+
+def table_records(table: np.ndarray) -> list[dict]:
+    # NaN spectral scores become None, as in the per-artifact reports.
+    records = []
+    for values in table.tolist():
+        record = dict(zip(table.dtype.names, values))
+        for name, value in record.items():
+            if isinstance(value, float) and value != value:
+                record[name] = None
+        records.append(record)
+    return records
+
+
+def write_csv(table: np.ndarray, sources: list[str], handle) -> None:
+    writer = csv.writer(handle)
+    writer.writerow(["source", *table.dtype.names])
+    for source, record in zip(sources, table_records(table)):
+        writer.writerow([source, *("" if value is None else value for value in record.values())])
+
+
+def main() -> dict:
+    parser = argparse.ArgumentParser(description="Score a cohort of text artifacts as one batch.")
+    parser.add_argument(
+        "--text-inputs",
+        nargs="+",
+        required=True,
+        help="Text artifact files, directories, or glob patterns.",
+    )
+    parser.add_argument("--csv", help="Write one row per artifact to this CSV file ('-' for stdout).")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
+    args = parser.parse_args()
+
+    sources = resolve_text_paths(args.text_inputs)
+    counts, words = count_matrix([analysis_counts(analyze_file(source)) for source in sources])
+    table = score_matrix(counts, words)
+    if args.csv == "-":
+        write_csv(table, sources, sys.stdout)
+    elif args.csv:
+        with Path(args.csv).open("w", encoding="utf-8", newline="") as handle:
+            write_csv(table, sources, handle)
+
+    classes = [label for _, label, _ in PROFILE_CLASSES]
+    report = {
+        "artifacts": len(sources),
+        "categories": CATEGORIES,
+        "mean_overall_score": round(float(table["overall_score"].mean()), 3) if len(sources) else None,
+        "classifications": {label: int((table["classification"] == label).sum()) for label in classes},
+        "records": [
+            {"source": source, **record} for source, record in zip(sources, table_records(table))
+        ],
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    elif args.csv != "-":
+        print("Cohort Scoring")
+        print("=" * 60)
+        print(f"Artifacts: {report['artifacts']}")
+        print(f"Mean overall score: {report['mean_overall_score']}")
+        for label, count in report["classifications"].items():
+            print(f"{label}: {count}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,11 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
+from collections.abc import Iterator
 from pathlib import Path
 
+from marker_engine import AnalyzedText, MarkerEngine
+
 
 MARKER_PATTERNS = {
     "self_reference": [
@@ -81,16 +83,43 @@ INTERFACE_LEVELS = [
 ]
 
 
-def load_text(path: str) -> str:
-    return Path(path).resolve().read_text(encoding="utf-8")
+# Marker density per 1000 words at which each category score saturates.
+SCORE_SCALES = {
+    "self_reference": 35.0,
+    "meta_cognition": 8.0,
+    "boundary_awareness": 6.0,
+    "planning": 10.0,
+    "tool_orchestration": 10.0,
+    "value_commitment": 8.0,
+}
+PROFILE_WEIGHTS = {
+    "meta_cognition": 0.30,
+    "planning": 0.25,
+    "tool_orchestration": 0.20,
+    "boundary_awareness": 0.15,
+    "self_reference": 0.05,
+    "value_commitment": 0.05,
+}
+# Upper profile-score bounds of every INTERFACE_LEVELS entry but the last.
+LEVEL_THRESHOLDS = [0.30, 0.55, 0.75]
 
 
-def _word_count(text: str) -> int:
-    return max(1, len(re.findall(r"\b\w+\b", text)))
+MARKER_ENGINE = MarkerEngine(MARKER_PATTERNS)
 
+# Bump when category scales or profile weights change so cached reports are rebuilt.
+SCORING_VERSION = 1
 
-def _count_matches(text: str, patterns: list[str]) -> int:
-    return sum(len(re.findall(pattern, text, flags=re.IGNORECASE)) for pattern in patterns)
+# Characters read per buffer when a text artifact is streamed instead of loaded whole.
+STREAM_CHUNK_CHARS = 1 << 20
+
+
+def load_text(path: str) -> str:
+    return Path(path).resolve().read_text(encoding="utf-8")
+
+
+def read_text_chunks(path: str, chunk_chars: int = STREAM_CHUNK_CHARS) -> Iterator[str]:
+    with Path(path).resolve().open(encoding="utf-8") as handle:
+        yield from iter(lambda: handle.read(chunk_chars), "")
 
 
 def _normalize(count: int, words: int, scale: float) -> float:
@@ -99,22 +128,8 @@ def _normalize(count: int, words: int, scale: float) -> float:
 
 
 def _classify(scores: dict[str, float]) -> dict[str, str]:
-    score = (
-        scores["meta_cognition"] * 0.30
-        + scores["planning"] * 0.25
-        + scores["tool_orchestration"] * 0.20
-        + scores["boundary_awareness"] * 0.15
-        + scores["self_reference"] * 0.05
-        + scores["value_commitment"] * 0.05
-    )
-    if score < 0.30:
-        level = INTERFACE_LEVELS[0]
-    elif score < 0.55:
-        level = INTERFACE_LEVELS[1]
-    elif score < 0.75:
-        level = INTERFACE_LEVELS[2]
-    else:
-        level = INTERFACE_LEVELS[3]
+    score = sum(scores[name] * weight for name, weight in PROFILE_WEIGHTS.items())
+    level = INTERFACE_LEVELS[sum(score >= threshold for threshold in LEVEL_THRESHOLDS)]
     return {
         "score": round(score, 3),
         "level": level[0],
@@ -122,21 +137,19 @@ def _classify(scores: dict[str, float]) -> dict[str, str]:
     }
 
 
-def build_interface_report(text: str, source: str) -> dict:
-    words = _word_count(text)
-    marker_counts = {name: _count_matches(text, patterns) for name, patterns in MARKER_PATTERNS.items()}
+def build_interface_report(text: str | AnalyzedText, source: str, engine: MarkerEngine = MARKER_ENGINE) -> dict:
+    # engine may come from a lexicon file; it must keep the MARKER_PATTERNS categories.
+    analysis = text if isinstance(text, AnalyzedText) else engine.analyze(text)
+    marker_counts, words = analysis.tally(engine)
+    words = max(1, words)
     densities = {name: round((count / words) * 1000.0, 3) for name, count in marker_counts.items()}
     scores = {
-        "self_reference": round(_normalize(marker_counts["self_reference"], words, scale=35.0), 3),
-        "meta_cognition": round(_normalize(marker_counts["meta_cognition"], words, scale=8.0), 3),
-        "boundary_awareness": round(_normalize(marker_counts["boundary_awareness"], words, scale=6.0), 3),
-        "planning": round(_normalize(marker_counts["planning"], words, scale=10.0), 3),
-        "tool_orchestration": round(_normalize(marker_counts["tool_orchestration"], words, scale=10.0), 3),
-        "value_commitment": round(_normalize(marker_counts["value_commitment"], words, scale=8.0), 3),
+        name: round(_normalize(marker_counts[name], words, scale=scale), 3) for name, scale in SCORE_SCALES.items()
     }
 
     return {
         "source": source,
+        "lexicon_version": engine.version,
         "word_count": words,
         "marker_counts": marker_counts,
         "marker_density_per_1000_words": densities,
@@ -152,11 +165,17 @@ def build_interface_report(text: str, source: str) -> dict:
 def main() -> dict:
     parser = argparse.ArgumentParser(description="Analyze higher-order interface markers in a text artifact.")
     parser.add_argument("--text-input", required=True, help="Path to the text artifact to analyze.")
+    parser.add_argument("--lexicon", help="JSON or TOML lexicon file to use instead of the builtin markers.")
     parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
     args = parser.parse_args()
 
+    # Imported here because lexicon and text_analysis build on this module.
+    from lexicon import resolve_lexicon
+    from text_analysis import analyze_file
+
+    engine = resolve_lexicon(args.lexicon).interface_engine
     source_path = str(Path(args.text_input).resolve())
-    report = build_interface_report(load_text(args.text_input), source_path)
+    report = build_interface_report(analyze_file(args.text_input, [engine]), source_path, engine)
     if args.json:
         print(json.dumps(report, indent=2))
     else:
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Change notification for followed text artifacts.
+
+On Linux the watcher uses inotify on the file's directory, so it wakes as soon
+as the file is written, replaced, or recreated. Elsewhere it falls back to
+comparing ``os.stat`` results (inode, size, mtime) at a fixed interval without
+reading the file. Both collapse a burst of writes into one wake-up.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+DEFAULT_DEBOUNCE = 0.02
+MAX_COALESCE = 0.25
+
+
+def _load_inotify():
+    if not hasattr(os, "O_NONBLOCK"):
+        return None
+    try:
+        try:
+            libc = ctypes.CDLL("libc.so.6", use_errno=True)
+        except OSError:
+            # find_library shells out to the toolchain, so it is only the fallback.
+            from ctypes.util import find_library
+
+            libc = ctypes.CDLL(find_library("c"), use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class StatWatcher:
+    """Polls file metadata and reports when it changes."""
+
+    backend = "stat"
+
+    def __init__(self, path: str, interval: float = 1.0, debounce: float = DEFAULT_DEBOUNCE) -> None:
+        self.path = path
+        self.interval = interval
+        self.debounce = debounce
+        self._last = self._stat()
+
+    def _stat(self) -> tuple[int, int, int] | None:
+        try:
+            info = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (info.st_ino, info.st_size, info.st_mtime_ns)
+
+    def check(self) -> bool:
+        current = self._stat()
+        changed = current != self._last
+        self._last = current
+        return changed
+
+    def wait(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.check():
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if remaining <= 0:
+                return False
+            time.sleep(remaining)
+
+        settle_deadline = time.monotonic() + MAX_COALESCE
+        while time.monotonic() < settle_deadline:
+            time.sleep(self.debounce)
+            if not self.check():
+                break
+        return True
+
+    def fileno(self) -> int | None:
+        return None
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> StatWatcher:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class InotifyWatcher:
+    """Wakes on inotify events for one file, watched through its directory."""
+
+    backend = "inotify"
+
+    def __init__(self, path: str, libc, debounce: float = DEFAULT_DEBOUNCE) -> None:
+        resolved = Path(path).resolve()
+        self.path = str(resolved)
+        self.debounce = debounce
+        self._name = os.fsencode(resolved.name)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(resolved.parent), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {resolved.parent}")
+
+    def _drain(self) -> bool:
+        relevant = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset < len(data):
+                _, _, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + name_length].rstrip(b"\0")
+                offset += name_length
+                relevant = relevant or name == self._name
+
+    def check(self) -> bool:
+        return self._drain()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return False
+            if self._drain():
+                break
+
+        settle_deadline = time.monotonic() + MAX_COALESCE
+        while time.monotonic() < settle_deadline:
+            ready, _, _ = select.select([self._fd], [], [], self.debounce)
+            if not ready:
+                break
+            self._drain()
+        return True
+
+    def fileno(self) -> int | None:
+        return self._fd
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> InotifyWatcher:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_watcher(path: str, interval: float = 1.0, debounce: float = DEFAULT_DEBOUNCE) -> InotifyWatcher | StatWatcher:
+    libc = _load_inotify()
+    if libc is not None:
+        try:
+            return InotifyWatcher(path, libc, debounce=debounce)
+        except OSError:
+            pass
+    return StatWatcher(path, interval=interval, debounce=debounce)
+
+
+async def wait_async(watcher: InotifyWatcher | StatWatcher) -> None:
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    fd = watcher.fileno()
+    if fd is None:
+        while not watcher.check():
+            await asyncio.sleep(watcher.interval)
+        settle_deadline = loop.time() + MAX_COALESCE
+        while loop.time() < settle_deadline:
+            await asyncio.sleep(watcher.debounce)
+            if not watcher.check():
+                break
+        return
+
+    ready = asyncio.Event()
+    loop.add_reader(fd, ready.set)
+    try:
+        while True:
+            await ready.wait()
+            ready.clear()
+            if watcher.check():
+                break
+        settle_deadline = loop.time() + MAX_COALESCE
+        while loop.time() < settle_deadline:
+            try:
+                await asyncio.wait_for(ready.wait(), watcher.debounce)
+            except asyncio.TimeoutError:
+                break
+            ready.clear()
+            watcher.check()
+    finally:
+        loop.remove_reader(fd)
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Indexed history of transition profiles and state deltas.
+
+The follow probe and the full report print or write standalone JSON, so
+comparing sessions over weeks means re-parsing every file. This store keeps
+one row per probe snapshot or full report in a local SQLite file: source,
+time, snapshot index, overall score, classification, the interface score
+vector, the state delta, and the lexicon version and digest the scores came
+from. Rows are only ever appended, and at most once: a row with the same
+source, kind, time, and snapshot index as an existing one is ignored, so
+importing the same reports again adds nothing (older stores that already
+hold repeats keep them until --dedupe is run). Indexes on
+(source, time) and (shift label, source, time) answer "every
+major_state_shift for this source last month" or "the last 50 scores for
+this source" without touching the raw reports; both can be restricted to one
+lexicon version so scores from different lexicons are not mixed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from input_paths import resolve_text_paths
+from report_records import SHIFT_LABELS, SnapshotRecord
+
+
+DEFAULT_TREND_LENGTH = 50
+
+_FIELDS = [
+    "id",
+    "source",
+    "recorded_at",
+    "kind",
+    "snapshot_index",
+    "overall_score",
+    "classification",
+    "temporal_coherence_score",
+    "shift_label",
+    "overall_delta",
+    "scores",
+    "profile",
+    "delta",
+    "lexicon_version",
+    "lexicon_digest",
+]
+_COLUMNS = ", ".join(_FIELDS)
+# One row per entry. Full reports have no snapshot index, and NULLs never
+# collide in a UNIQUE index, so the key uses -1 in their place.
+_UNIQUE_KEY = "source, kind, recorded_at, ifnull(snapshot_index, -1)"
+
+
+def parse_time(value: str | float | None) -> float | None:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _format_time(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+
+
+class HistoryStore:
+    """Append-only SQLite log of scored snapshots and reports."""
+
+    def __init__(self, path: str) -> None:
+        store_path = Path(path).resolve()
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(store_path)
+        import sqlite3
+
+        self._db = sqlite3.connect(self.path, timeout=30.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "id INTEGER PRIMARY KEY, source TEXT NOT NULL, recorded_at REAL NOT NULL, kind TEXT NOT NULL, "
+            "snapshot_index INTEGER, overall_score REAL NOT NULL, classification TEXT NOT NULL, "
+            "temporal_coherence_score REAL, shift_label TEXT, overall_delta REAL, "
+            "scores TEXT NOT NULL, profile TEXT NOT NULL, delta TEXT, lexicon_version TEXT, lexicon_digest TEXT)"
+        )
+        # Stores created before lexicon columns existed get them added; their old rows stay NULL.
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(history)")}
+        for column in ("lexicon_version", "lexicon_digest"):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE history ADD COLUMN {column} TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS history_source_time ON history (source, recorded_at)")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS history_shift_time ON history (shift_label, source, recorded_at)"
+        )
+        exists = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'history_entry'"
+        ).fetchone()
+        if exists is None:
+            # Stores written before the key existed may already hold repeated
+            # imports. Opening a store never deletes rows; those stores keep
+            # working without the key until dedupe() is run on purpose.
+            duplicates = self.duplicates()
+            if duplicates:
+                print(
+                    f"{self.path}: {duplicates} repeated entries; imports are not deduplicated until "
+                    "history_store.py --dedupe is run",
+                    file=sys.stderr,
+                    flush=True,
+                )
+            else:
+                self._db.execute(f"CREATE UNIQUE INDEX history_entry ON history ({_UNIQUE_KEY})")
+        self._db.commit()
+
+    def duplicates(self) -> int:
+        # Rows that repeat an earlier row's source, kind, time, and snapshot index.
+        return self._db.execute(
+            f"SELECT COUNT(*) - (SELECT COUNT(*) FROM (SELECT 1 FROM history GROUP BY {_UNIQUE_KEY})) FROM history"
+        ).fetchone()[0]
+
+    def dedupe(self) -> dict:
+        # Deletes repeated rows, keeping the first copy of each, and adds the
+        # key so later imports skip them.
+        with self._db:
+            cursor = self._db.execute(
+                f"DELETE FROM history WHERE id NOT IN (SELECT min(id) FROM history GROUP BY {_UNIQUE_KEY})"
+            )
+            self._db.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS history_entry ON history ({_UNIQUE_KEY})")
+        return {"removed": cursor.rowcount}
+
+    def record(
+        self,
+        source: str,
+        transition_profile: dict,
+        interface_scores: dict,
+        temporal_coherence_score: float | None = None,
+        state_delta: dict | None = None,
+        snapshot_index: int | None = None,
+        kind: str = "snapshot",
+        recorded_at: float | None = None,
+        lexicon: dict | None = None,
+    ) -> int | None:
+        # Returns the new row id, or None when the row was already stored.
+        row = (
+            source,
+            time.time() if recorded_at is None else recorded_at,
+            kind,
+            snapshot_index,
+            transition_profile["overall_score"],
+            transition_profile["classification"],
+            temporal_coherence_score,
+            state_delta["shift_label"] if state_delta else None,
+            state_delta["overall_delta"] if state_delta else None,
+            json.dumps(interface_scores, separators=(",", ":")),
+            json.dumps(transition_profile, separators=(",", ":")),
+            json.dumps(state_delta, separators=(",", ":")) if state_delta else None,
+            lexicon.get("version") if lexicon else None,
+            lexicon.get("digest") if lexicon else None,
+        )
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO history (source, recorded_at, kind, snapshot_index, overall_score, "
+                "classification, temporal_coherence_score, shift_label, overall_delta, scores, profile, delta, "
+                "lexicon_version, lexicon_digest) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def record_snapshot(
+        self, snapshot: SnapshotRecord, state_delta: dict, recorded_at: float | None = None
+    ) -> int | None:
+        return self.record(
+            source=snapshot.source,
+            transition_profile=snapshot.transition_profile(),
+            interface_scores=snapshot.interface_scores(),
+            temporal_coherence_score=snapshot.temporal_coherence_score,
+            state_delta=state_delta,
+            snapshot_index=snapshot.snapshot_index,
+            recorded_at=recorded_at,
+            lexicon=snapshot.lexicon(),
+        )
+
+    def record_report(self, report: dict) -> int | None:
+        return self.record(
+            source=report["inputs"]["text_source"],
+            transition_profile=report["transition_profile"],
+            interface_scores=report["interface_report"]["scores"],
+            temporal_coherence_score=report["temporal_report"]["temporal_coherence_score"],
+            kind="full_report",
+            recorded_at=parse_time(report.get("timestamp_utc")),
+            # Reports saved before lexicons existed have no lexicon block.
+            lexicon=report["inputs"].get("lexicon"),
+        )
+
+    def _rows(self, query: str, parameters: list) -> list[dict]:
+        rows = []
+        for values in self._db.execute(query, parameters):
+            row = dict(zip(_FIELDS, values))
+            row["recorded_at"] = _format_time(row["recorded_at"])
+            for name in ("scores", "profile", "delta"):
+                row[name] = json.loads(row[name]) if row[name] is not None else None
+            rows.append(row)
+        return rows
+
+    def events(
+        self,
+        source: str | None = None,
+        shift_label: str | None = None,
+        since: str | float | None = None,
+        until: str | float | None = None,
+        limit: int | None = None,
+        lexicon_version: str | None = None,
+    ) -> list[dict]:
+        clauses = []
+        parameters = []
+        for clause, value in (
+            ("shift_label = ?", shift_label),
+            ("source = ?", source),
+            ("lexicon_version = ?", lexicon_version),
+            ("recorded_at >= ?", parse_time(since)),
+            ("recorded_at <= ?", parse_time(until)),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                parameters.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT {_COLUMNS} FROM history{where} ORDER BY recorded_at, id"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        return self._rows(query, parameters)
+
+    def trend(self, source: str, last: int = DEFAULT_TREND_LENGTH, lexicon_version: str | None = None) -> list[dict]:
+        where = "source = ?" if lexicon_version is None else "source = ? AND lexicon_version = ?"
+        parameters = [source] if lexicon_version is None else [source, lexicon_version]
+        rows = self._rows(
+            f"SELECT {_COLUMNS} FROM history WHERE {where} ORDER BY recorded_at DESC, id DESC LIMIT ?",
+            [*parameters, last],
+        )
+        return rows[::-1]
+
+    def sources(self) -> list[dict]:
+        query = (
+            "SELECT source, COUNT(*), MIN(recorded_at), MAX(recorded_at), "
+            "SUM(shift_label = 'major_state_shift') FROM history GROUP BY source ORDER BY source"
+        )
+        return [
+            {
+                "source": source,
+                "entries": entries,
+                "first_recorded_at": _format_time(first),
+                "last_recorded_at": _format_time(last),
+                "major_state_shifts": shifts or 0,
+            }
+            for source, entries, first, last, shifts in self._db.execute(query)
+        ]
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def import_reports(store: HistoryStore, entries: list[str]) -> dict:
+    # Accepts full-report JSON files and batch-mode JSONL output. Reports
+    # already in the store count as skipped.
+    summary = {"files": 0, "reports": 0, "skipped": 0}
+    for path in resolve_text_paths(entries):
+        summary["files"] += 1
+        text = Path(path).read_text(encoding="utf-8")
+        try:
+            documents = [json.loads(text)]
+        except json.JSONDecodeError:
+            documents = [json.loads(line) for line in text.splitlines() if line.strip()]
+        for document in documents:
+            report = document.get("report", document) if isinstance(document, dict) else None
+            if not isinstance(report, dict) or "transition_profile" not in report or "inputs" not in report:
+                summary["skipped"] += 1
+                continue
+            if store.record_report(report) is None:
+                summary["skipped"] += 1
+                continue
+            summary["reports"] += 1
+    return summary
+
+
+def main() -> dict | list:
+    parser = argparse.ArgumentParser(description="Query or import the transition-profile history store.")
+    parser.add_argument("--db", required=True, help="History store path.")
+    parser.add_argument(
+        "--query",
+        choices=["events", "trend", "sources"],
+        default="sources",
+        help="events: rows matching the filters; trend: the last --last rows for --source; sources: a summary.",
+    )
+    parser.add_argument("--source", help="Restrict to one source path.")
+    parser.add_argument("--shift-label", choices=SHIFT_LABELS, help="events: restrict to one state-delta label.")
+    parser.add_argument("--since", help="events: earliest time (ISO 8601, UTC unless an offset is given).")
+    parser.add_argument("--until", help="events: latest time (ISO 8601, UTC unless an offset is given).")
+    parser.add_argument("--limit", type=int, help="events: maximum rows to return.")
+    parser.add_argument(
+        "--lexicon-version", help="events and trend: restrict to rows scored with this lexicon version."
+    )
+    parser.add_argument("--last", type=int, default=DEFAULT_TREND_LENGTH, help="trend: number of recent rows.")
+    parser.add_argument(
+        "--import",
+        dest="import_entries",
+        nargs="+",
+        help="Record saved full reports (JSON, or batch JSONL) from these files, directories, or globs.",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Delete repeated entries from a store written before imports were deduplicated.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.db)
+    if args.dedupe:
+        result = store.dedupe()
+    elif args.import_entries:
+        result = import_reports(store, args.import_entries)
+    elif args.query == "events":
+        result = store.events(
+            args.source, args.shift_label, args.since, args.until, args.limit, args.lexicon_version
+        )
+    elif args.query == "trend":
+        if not args.source:
+            parser.error("--query trend needs --source.")
+        result = store.trend(args.source, args.last, args.lexicon_version)
+    else:
+        result = store.sources()
+
+    if args.json or args.import_entries or args.dedupe:
+        print(json.dumps(result, indent=2))
+    elif args.query == "sources":
+        for entry in result:
+            print(f"{entry['source']}: {entry['entries']} entries, {entry['major_state_shifts']} major shifts, "
+                  f"{entry['first_recorded_at']} .. {entry['last_recorded_at']}")
+    else:
+        for row in result:
+            label = row["shift_label"] or row["kind"]
+            index = "" if row["snapshot_index"] is None else f" #{row['snapshot_index']}"
+            print(f"{row['recorded_at']} {row['source']}{index}: {row['overall_score']:.3f} "
+                  f"{row['classification']} ({label})")
+    return result
+
+
+if __name__ == "__main__":
+    main()
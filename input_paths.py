@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Command-line input expansion for the batch and follow entry points.
+
+Several tools take a mix of files, directories, and glob patterns. Resolving
+them lives here rather than in the scoring modules, and imports nothing but
+the standard library, so text-only entry points stay quick to start.
+"""
+
+from __future__ import annotations
+
+import glob
+from pathlib import Path
+
+
+def is_glob(entry: str) -> bool:
+    return any(char in entry for char in "*?[")
+
+
+def resolve_text_paths(entries: list[str]) -> list[str]:
+    # Directories contribute their visible files, globs their file matches;
+    # each resolved path is listed once, in first-seen order.
+    sources: dict[str, None] = {}
+    for entry in entries:
+        path = Path(entry)
+        if path.is_dir():
+            matches = [child for child in sorted(path.iterdir()) if child.is_file() and not child.name.startswith(".")]
+        elif is_glob(entry):
+            matches = [Path(match) for match in sorted(glob.glob(entry, recursive=True)) if Path(match).is_file()]
+        else:
+            matches = [path]
+        for match in matches:
+            sources.setdefault(str(match.resolve()), None)
+    return list(sources)
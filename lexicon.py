@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Versioned marker lexicons.
+
+The interface, temporal, and transition patterns ship as module constants.
+A lexicon file replaces them without editing source. It is a JSON or TOML
+document with a ``version``, an ``interface`` table of the six interface
+categories, a ``temporal`` table of past/present/future, and a
+``transition`` list. Loading compiles one matcher per report from it.
+
+Compiled regexes cannot be stored, so the on-disk cache holds the expanded
+literal tables instead. It sits next to the lexicon file and is keyed by the
+lexicon's content hash and ``COMPILED_FORMAT``, so an unchanged lexicon skips
+pattern expansion on startup. A stale or malformed cache file is rebuilt.
+``LexiconReloader`` lets long-running callers swap in an edited lexicon
+between snapshots and keep the last good one if the edit is broken.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from consciousness_interface import MARKER_ENGINE, MARKER_PATTERNS
+from marker_engine import COMPILED_FORMAT, MarkerEngine, compile_engine
+from temporal_coherence import TEMPORAL_PATTERNS, TRANSITION_KEY, TRANSITION_PATTERNS
+
+
+COMPILED_SUFFIX = ".compiled.json"
+_LEXICONS: dict[str, Lexicon] = {}
+
+
+def lexicon_digest(document: dict) -> str:
+    return hashlib.sha256(json.dumps(document, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class Lexicon:
+    """The marker patterns behind one interface and one temporal engine."""
+
+    def __init__(
+        self,
+        name: str,
+        version: str,
+        interface: dict[str, list[str]],
+        temporal: dict[str, list[str]],
+        transition: list[str],
+        compiled: dict | None = None,
+    ) -> None:
+        self.name = name
+        self.version = version
+        self.interface = {category: list(interface[category]) for category in MARKER_PATTERNS}
+        self.temporal = {bucket: list(temporal[bucket]) for bucket in TEMPORAL_PATTERNS}
+        self.transition = list(transition)
+        self.digest = lexicon_digest(self.document())
+
+        # Each engine validates its own part; a stale or malformed file only costs a rebuild.
+        if not (
+            isinstance(compiled, dict)
+            and compiled.get("format") == COMPILED_FORMAT
+            and compiled.get("digest") == self.digest
+        ):
+            compiled = {}
+        try:
+            self.interface_engine = compile_engine(self.interface, version, compiled.get("interface"))
+            self.temporal_engine = compile_engine(
+                {**self.temporal, TRANSITION_KEY: self.transition}, version, compiled.get("temporal")
+            )
+        except re.error as exc:
+            raise ValueError(f"Lexicon {name!r} has an invalid pattern: {exc}") from exc
+        for engine in self.engines:
+            if engine.max_phrase_width is None:
+                raise ValueError(f"Lexicon {name!r} has a phrase pattern without a bounded width.")
+
+    @property
+    def engines(self) -> list[MarkerEngine]:
+        return [self.interface_engine, self.temporal_engine]
+
+    def document(self) -> dict:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "interface": self.interface,
+            "temporal": self.temporal,
+            "transition": self.transition,
+        }
+
+    def compiled_state(self) -> dict:
+        return {
+            "format": COMPILED_FORMAT,
+            "digest": self.digest,
+            "interface": self.interface_engine.compiled_state,
+            "temporal": self.temporal_engine.compiled_state,
+        }
+
+    def info(self) -> dict:
+        return {"name": self.name, "version": self.version, "digest": self.digest}
+
+
+# Its engines are the MARKER_ENGINE and TEMPORAL_ENGINE the report modules compiled.
+BUILTIN_LEXICON = Lexicon("builtin", MARKER_ENGINE.version, MARKER_PATTERNS, TEMPORAL_PATTERNS, TRANSITION_PATTERNS)
+
+
+def _patterns(value, where: str) -> list[str]:
+    if not isinstance(value, list) or not all(isinstance(pattern, str) for pattern in value):
+        raise ValueError(f"{where} must be a list of pattern strings.")
+    return value
+
+
+def _table(document: dict, key: str, expected: list[str]) -> dict[str, list[str]]:
+    table = document.get(key)
+    if not isinstance(table, dict) or set(table) != set(expected):
+        raise ValueError(f"Lexicon table {key!r} must have exactly these categories: {', '.join(expected)}.")
+    return {name: _patterns(table[name], f"{key}.{name}") for name in expected}
+
+
+def parse_lexicon(text: str, path: str) -> dict:
+    if Path(path).suffix.lower() == ".toml":
+        # tomllib is only needed for TOML lexicons, and only exists from Python 3.11.
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML lexicons need Python 3.11 or newer; use JSON instead.") from None
+        try:
+            document = tomllib.loads(text)
+        except tomllib.TOMLDecodeError as exc:
+            raise ValueError(f"{path}: {exc}") from exc
+    else:
+        try:
+            document = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{path}: {exc}") from exc
+    if not isinstance(document, dict):
+        raise ValueError(f"{path}: a lexicon must be a table or object.")
+    version = document.get("version")
+    if not isinstance(version, (str, int)) or isinstance(version, bool) or str(version) == "":
+        raise ValueError(f"{path}: a lexicon needs a 'version' string.")
+    return {
+        "name": str(document.get("name", Path(path).stem)),
+        "version": str(version),
+        "interface": _table(document, "interface", list(MARKER_PATTERNS)),
+        "temporal": _table(document, "temporal", list(TEMPORAL_PATTERNS)),
+        "transition": _patterns(document.get("transition"), "transition"),
+    }
+
+
+def _read_compiled(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_compiled(path: Path, state: dict) -> None:
+    # The cache is an optimization: a read-only lexicon directory just means
+    # every start expands the patterns again.
+    staging = path.with_name(f"{path.name}.tmp")
+    try:
+        staging.write_text(json.dumps(state, separators=(",", ":")), encoding="utf-8")
+        os.replace(staging, path)
+    except OSError:
+        pass
+
+
+def load_lexicon(path: str, use_compiled: bool = True) -> Lexicon:
+    # Memoized on content, so reloading an unchanged file returns the same object.
+    lexicon_path = Path(path).resolve()
+    text = lexicon_path.read_text(encoding="utf-8")
+    fields = parse_lexicon(text, str(lexicon_path))
+    digest = lexicon_digest(fields)
+    if digest in _LEXICONS:
+        return _LEXICONS[digest]
+
+    compiled_path = lexicon_path.with_name(lexicon_path.name + COMPILED_SUFFIX)
+    compiled = _read_compiled(compiled_path) if use_compiled else None
+    lexicon = Lexicon(**fields, compiled=compiled)
+    # Rewritten whenever any part had to be rebuilt: missing, stale, or malformed.
+    if use_compiled and compiled != lexicon.compiled_state():
+        _write_compiled(compiled_path, lexicon.compiled_state())
+    _LEXICONS[digest] = lexicon
+    return lexicon
+
+
+def resolve_lexicon(path: str | None) -> Lexicon:
+    return load_lexicon(path) if path else BUILTIN_LEXICON
+
+
+class LexiconReloader:
+    """Watches a lexicon file and loads it again after every edit."""
+
+    def __init__(self, path: str, interval: float = 1.0) -> None:
+        self.path = str(Path(path).resolve())
+        self.lexicon = load_lexicon(self.path)
+        # Imported here so report modules that load lexicons never pull in ctypes.
+        from file_watch import open_watcher
+
+        self._watcher = open_watcher(self.path, interval=interval)
+
+    def check(self) -> Lexicon | None:
+        # Returns the new lexicon when the file changed to a different valid
+        # lexicon. A broken edit is reported and the current lexicon stays.
+        if not self._watcher.check():
+            return None
+        try:
+            lexicon = load_lexicon(self.path)
+        except (OSError, ValueError) as exc:
+            print(f"Keeping lexicon {self.lexicon.version}: {exc}", file=sys.stderr, flush=True)
+            return None
+        if lexicon is self.lexicon:
+            return None
+        self.lexicon = lexicon
+        print(f"Loaded lexicon {lexicon.name} {lexicon.version}", file=sys.stderr, flush=True)
+        return lexicon
+
+    def close(self) -> None:
+        self._watcher.close()
+
+
+def main() -> dict:
+    parser = argparse.ArgumentParser(description="Export, validate, or precompile a marker lexicon.")
+    parser.add_argument("--export", help="Write the builtin lexicon as JSON to this path ('-' for stdout).")
+    parser.add_argument("--check", help="Load this lexicon file, refresh its compiled cache, and summarize it.")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
+    args = parser.parse_args()
+
+    if args.export:
+        document = json.dumps(BUILTIN_LEXICON.document(), indent=2)
+        if args.export == "-":
+            print(document)
+            return BUILTIN_LEXICON.info()
+        Path(args.export).write_text(document + "\n", encoding="utf-8")
+        report = BUILTIN_LEXICON.info()
+    elif args.check:
+        started = time.perf_counter()
+        try:
+            lexicon = load_lexicon(args.check)
+        except ValueError as exc:
+            parser.error(str(exc))
+        elapsed = time.perf_counter() - started
+        patterns = [
+            expansion
+            for engine in lexicon.engines
+            for expansion in engine.compiled_state["expansions"]
+        ]
+        report = {
+            **lexicon.info(),
+            "patterns": len(patterns),
+            "literal_patterns": sum(expansion is not None for expansion in patterns),
+            "load_seconds": round(elapsed, 3),
+        }
+    else:
+        parser.error("Choose either --export or --check.")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for key, value in report.items():
+            print(f"{key}: {value}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -4,28 +4,70 @@ Real-time interaction probe.
 
 Measures an interaction artifact as it evolves and detects state shifts
 between snapshots using the repo's existing interface/temporal metrics.
+When following with ``--lexicon``, edits to the lexicon file are picked up
+without a restart: each followed file is rescanned with the new lexicon and
+its next snapshot starts a new baseline.
 """
 
 from __future__ import annotations
 
 import argparse
+import codecs
 import json
+import os
+import signal
 import sys
 import time
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from consciousness_interface import build_interface_report
+from consciousness_interface import STREAM_CHUNK_CHARS, build_interface_report
+from file_watch import open_watcher, wait_async
+from history_store import HistoryStore
+from input_paths import is_glob, resolve_text_paths
+from lexicon import BUILTIN_LEXICON, Lexicon, LexiconReloader, resolve_lexicon
+from marker_engine import AnalyzedText
+from report_records import (
+    OUTPUT_FORMATS,
+    SnapshotRecord,
+    compact_line,
+    pack_record,
+    snapshot_payload,
+    state_delta,
+)
+from stage_timing import StageTimer, stage
 from temporal_coherence import build_temporal_report
+from text_analysis import IncrementalAnalysis, analyze_chunks, analyze_text, scan_appended
 from transition_metrics import build_transition_profile
 
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
 
-def build_snapshot(text: str, source: str, index: int) -> dict:
-    interface_report = build_interface_report(text, source)
-    temporal_report = build_temporal_report(text, source)
+
+TAIL_CHECK_BYTES = 64
+
+
+def build_snapshot(text: str, source: str, index: int, lexicon: Lexicon | None = None) -> dict:
+    return build_analysis_snapshot(analyze_text(text, lexicon), len(text), source, index, lexicon)
+
+
+def build_analysis_snapshot(
+    analysis: AnalyzedText,
+    character_count: int,
+    source: str,
+    index: int,
+    lexicon: Lexicon | None = None,
+) -> dict:
+    lexicon = lexicon or BUILTIN_LEXICON
+    interface_engine, temporal_engine = lexicon.engines
+    interface_report = build_interface_report(analysis, source, interface_engine)
+    temporal_report = build_temporal_report(analysis, source, temporal_engine)
     profile = build_transition_profile(interface_report, temporal_report, spectral_report=None)
     return {
         "snapshot_index": index,
-        "character_count": len(text),
+        "character_count": character_count,
+        "lexicon": lexicon.info(),
         "interface_report": interface_report,
         "temporal_report": temporal_report,
         "transition_profile": profile,
@@ -33,116 +75,393 @@ def build_snapshot(text: str, source: str, index: int) -> dict:
 
 
 def build_state_delta(previous: dict | None, current: dict) -> dict:
-    if previous is None:
-        return {
-            "state_shift_detected": False,
-            "shift_label": "baseline",
-            "overall_delta": 0.0,
-            "signal_deltas": {},
-        }
-
-    prev_profile = previous["transition_profile"]
-    curr_profile = current["transition_profile"]
-    prev_scores = previous["interface_report"]["scores"]
-    curr_scores = current["interface_report"]["scores"]
-
-    deltas = {
-        "overall_score": round(curr_profile["overall_score"] - prev_profile["overall_score"], 3),
-        "meta_cognition": round(curr_scores["meta_cognition"] - prev_scores["meta_cognition"], 3),
-        "planning": round(curr_scores["planning"] - prev_scores["planning"], 3),
-        "boundary_awareness": round(curr_scores["boundary_awareness"] - prev_scores["boundary_awareness"], 3),
-        "tool_orchestration": round(curr_scores["tool_orchestration"] - prev_scores["tool_orchestration"], 3),
-        "value_commitment": round(curr_scores["value_commitment"] - prev_scores["value_commitment"], 3),
-        "temporal_coherence": round(
-            current["temporal_report"]["temporal_coherence_score"]
-            - previous["temporal_report"]["temporal_coherence_score"],
-            3,
-        ),
-    }
-
-    overall_delta = deltas["overall_score"]
-    state_shift = (
-        overall_delta >= 0.12
-        or deltas["meta_cognition"] >= 0.15
-        or deltas["planning"] >= 0.15
-        or deltas["value_commitment"] >= 0.15
+    # The probe itself diffs SnapshotRecords; this keeps the dict form for callers.
+    return state_delta(
+        SnapshotRecord.from_snapshot(previous) if previous is not None else None,
+        SnapshotRecord.from_snapshot(current),
     )
 
-    if not state_shift:
-        shift_label = "stable"
-    elif overall_delta >= 0.25:
-        shift_label = "major_state_shift"
-    else:
-        shift_label = "state_shift"
 
-    return {
-        "state_shift_detected": state_shift,
-        "shift_label": shift_label,
-        "overall_delta": overall_delta,
-        "signal_deltas": deltas,
-    }
-
-
-def emit_snapshot(previous: dict | None, current: dict, as_json: bool) -> None:
-    payload = {
-        "snapshot_index": current["snapshot_index"],
-        "character_count": current["character_count"],
-        "transition_profile": current["transition_profile"],
-        "state_delta": build_state_delta(previous, current),
-    }
-    if as_json:
-        print(json.dumps(payload, indent=2))
+def emit_snapshot(
+    current: SnapshotRecord,
+    delta: dict,
+    output: str,
+    stream: bool = False,
+    latency: bool = False,
+) -> None:
+    if output == "binary":
+        sys.stdout.buffer.write(pack_record(current, delta))
+        sys.stdout.buffer.flush()
+        return
+    if output == "compact":
+        print(compact_line(current, delta), flush=stream)
+        return
+    if output == "json":
+        payload = snapshot_payload(current, delta, stream, latency)
+        if stream:
+            print(json.dumps(payload), flush=True)
+        else:
+            print(json.dumps(payload, indent=2))
         return
 
     print("=" * 60)
-    print(f"Snapshot: {payload['snapshot_index']}")
-    print(f"Characters: {payload['character_count']}")
-    print(f"Overall score: {payload['transition_profile']['overall_score']:.3f}")
-    print(f"Classification: {payload['transition_profile']['classification']}")
-    print(f"Shift label: {payload['state_delta']['shift_label']}")
-    print(f"State shift detected: {payload['state_delta']['state_shift_detected']}")
-    print(f"Delta: {payload['state_delta']['overall_delta']:+.3f}")
+    if stream:
+        print(f"Source: {current.source}")
+    print(f"Snapshot: {current.snapshot_index}")
+    print(f"Characters: {current.character_count}")
+    print(f"Lexicon: {current.lexicon_version}")
+    print(f"Overall score: {current.overall_score:.3f}")
+    print(f"Classification: {current.classification}")
+    print(f"Shift label: {delta['shift_label']}")
+    print(f"State shift detected: {delta['state_shift_detected']}")
+    print(f"Delta: {delta['overall_delta']:+.3f}")
+    if current.reaction_latency_ms is not None:
+        print(f"Reaction latency: {current.reaction_latency_ms:.1f} ms")
+    if stream:
+        sys.stdout.flush()
+
 
+def record_snapshot(history: HistoryStore | None, current: SnapshotRecord, delta: dict) -> None:
+    if history is not None:
+        history.record_snapshot(current, delta)
 
-def run_stdin_mode(as_json: bool) -> int:
+
+def run_stdin_mode(output: str, history: HistoryStore | None = None, lexicon: Lexicon | None = None) -> int:
     print("Paste interaction text. End with Ctrl-D.", file=sys.stderr)
-    text = sys.stdin.read()
-    current = build_snapshot(text, "stdin", 1)
-    emit_snapshot(None, current, as_json)
+    engines = lexicon.engines if lexicon else None
+    analysis, character_count = analyze_chunks(iter(lambda: sys.stdin.read(STREAM_CHUNK_CHARS), ""), engines)
+    current = SnapshotRecord.from_snapshot(build_analysis_snapshot(analysis, character_count, "stdin", 1, lexicon))
+    delta = state_delta(None, current)
+    emit_snapshot(current, delta, output)
+    record_snapshot(history, current, delta)
     return 0
 
 
-def run_follow_mode(path: str, interval: float, as_json: bool) -> int:
+class AppendFollower:
+    """Reads only the bytes appended to a file since the previous poll.
+
+    A short run of already-read bytes is re-checked on every poll; if it no
+    longer matches, or the file shrank, the file was rewritten and the
+    analysis restarts from the beginning.
+    """
+
+    def __init__(self, source: str, lexicon: Lexicon | None = None) -> None:
+        self.source = source
+        self.modified_at = None
+        self.use_lexicon(lexicon or BUILTIN_LEXICON)
+
+    def use_lexicon(self, lexicon: Lexicon) -> None:
+        # Counts from the old lexicon cannot be converted, so the file is rescanned.
+        self.lexicon = lexicon
+        self.analysis = IncrementalAnalysis(lexicon.engines)
+        self.restart()
+
+    def restart(self) -> None:
+        self.offset = 0
+        self._tail = b""
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.analysis.reset()
+
+    def read(self) -> Iterator[str]:
+        # Yields the newly appended text for the caller to feed to self.analysis,
+        # after restarting if the file was rewritten. self.changed says whether
+        # either happened once the generator is exhausted.
+        with open(self.source, "rb") as handle:
+            self.modified_at = os.fstat(handle.fileno()).st_mtime
+            handle.seek(self.offset - len(self._tail))
+            self.changed = handle.read(len(self._tail)) != self._tail
+            if self.changed:
+                self.restart()
+                handle.seek(0)
+
+            # A large backlog is fed in fixed-size buffers rather than read whole.
+            for data in iter(lambda: handle.read(STREAM_CHUNK_CHARS), b""):
+                self.changed = True
+                self.offset += len(data)
+                self._tail = (self._tail + data)[-TAIL_CHECK_BYTES:]
+                yield self._decoder.decode(data)
+
+    def poll(self) -> bool:
+        for text in self.read():
+            self.analysis.feed(text)
+        return self.changed
+
+
+def follower_record(follower: AppendFollower, snapshot_index: int) -> SnapshotRecord:
+    # Only the compact record is kept; the full reports are dropped here.
+    return SnapshotRecord.from_snapshot(build_analysis_snapshot(
+        follower.analysis.analysis(),
+        follower.analysis.character_count,
+        follower.source,
+        snapshot_index + 1,
+        follower.lexicon,
+    ))
+
+
+def advance_follower(
+    follower: AppendFollower,
+    snapshot_index: int,
+    timer: StageTimer | None = None,
+) -> tuple[AppendFollower, SnapshotRecord | None]:
+    with stage(timer, "poll"):
+        changed = follower.poll()
+    if not changed and snapshot_index > 0:
+        return follower, None
+    with stage(timer, "snapshot"):
+        current = follower_record(follower, snapshot_index)
+    return follower, current
+
+
+def _with_latency(current: SnapshotRecord, follower: AppendFollower, baseline: bool) -> SnapshotRecord:
+    # A baseline (the first snapshot, or the rescan after a lexicon reload) answers no write.
+    if baseline:
+        return current
+    return current._replace(reaction_latency_ms=round((time.time() - follower.modified_at) * 1000.0, 3))
+
+
+def emit_stats(timer: StageTimer, sources: int = 1) -> None:
+    # Every emitted snapshot passes through the "emit" stage once.
+    snapshots = timer.calls.get("emit", 0)
+    stats = {"probe_stats": {"snapshots": snapshots, "sources": sources, **timer.counters()}}
+    print(json.dumps(stats), file=sys.stderr, flush=True)
+
+
+def run_follow_mode(
+    path: str,
+    interval: float,
+    output: str,
+    stats_interval: float | None = None,
+    history: HistoryStore | None = None,
+    reloader: LexiconReloader | None = None,
+) -> int:
     source = str(Path(path).resolve())
+    follower = AppendFollower(source, reloader.lexicon if reloader else None)
+    timer = StageTimer() if stats_interval else None
+    next_stats = time.monotonic() + stats_interval if stats_interval else None
     previous = None
     snapshot_index = 0
-    last_text = None
     try:
+        with open_watcher(source, interval=interval) as watcher:
+            while True:
+                if reloader is not None and (lexicon := reloader.check()) is not None:
+                    follower.use_lexicon(lexicon)
+                    previous = None
+                follower, current = advance_follower(follower, snapshot_index, timer)
+                if current is not None:
+                    snapshot_index = current.snapshot_index
+                    current = _with_latency(current, follower, previous is None)
+                    with stage(timer, "emit"):
+                        delta = state_delta(previous, current)
+                        emit_snapshot(current, delta, output, latency=True)
+                        record_snapshot(history, current, delta)
+                    previous = current
+                if next_stats is None and reloader is None:
+                    watcher.wait()
+                    continue
+                # Wake for the stats deadline and lexicon checks even when the file is idle.
+                timeout = interval if next_stats is None else max(0.0, next_stats - time.monotonic())
+                watcher.wait(timeout=min(timeout, interval) if reloader is not None else timeout)
+                if next_stats is not None and time.monotonic() >= next_stats:
+                    emit_stats(timer)
+                    next_stats += stats_interval
+    except KeyboardInterrupt:
+        return 0
+
+
+# asyncio and the process pool are imported inside the multi-file follow path
+# only; single-file and stdin modes never need them.
+async def follow_source(
+    source: str,
+    pool: ProcessPoolExecutor,
+    interval: float,
+    output: str,
+    timer: StageTimer | None = None,
+    history: HistoryStore | None = None,
+    lexicons: dict | None = None,
+) -> None:
+    # lexicons["current"] is swapped by follow_many when the lexicon file changes.
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    # The follower and its running tallies stay in this process. A worker only
+    # gets the appended text and the short unsettled tail, and returns the new
+    # tail and the tallies of what settled.
+    follower = AppendFollower(source, lexicons["current"] if lexicons else None)
+    analysis = follower.analysis
+    previous = None
+    snapshot_index = 0
+    with open_watcher(source, interval=interval) as watcher:
         while True:
-            text = Path(source).read_text(encoding="utf-8")
-            if text != last_text:
-                snapshot_index += 1
-                current = build_snapshot(text, source, snapshot_index)
-                emit_snapshot(previous, current, as_json)
+            if lexicons and follower.lexicon is not lexicons["current"]:
+                follower.use_lexicon(lexicons["current"])
+                analysis = follower.analysis
+                previous = None
+            current = None
+            try:
+                # Worker time is measured from here, so it includes the pool round trip.
+                with stage(timer, "advance"):
+                    for text in follower.read():
+                        scanned = await loop.run_in_executor(
+                            pool, scan_appended, analysis.engines, analysis.carry, text
+                        )
+                        analysis.absorb(len(text), *scanned)
+                if follower.changed or snapshot_index == 0:
+                    with stage(timer, "snapshot"):
+                        current = follower_record(follower, snapshot_index)
+            except (OSError, ValueError) as exc:
+                # A partly read chunk leaves the tallies behind the offset, so rescan from the start.
+                print(f"{source}: {exc}", file=sys.stderr)
+                follower.restart()
+            if current is not None:
+                snapshot_index = current.snapshot_index
+                current = _with_latency(current, follower, previous is None)
+                with stage(timer, "emit"):
+                    delta = state_delta(previous, current)
+                    emit_snapshot(current, delta, output, stream=True, latency=True)
+                    record_snapshot(history, current, delta)
                 previous = current
-                last_text = text
-            time.sleep(interval)
+            if lexicons is None:
+                await wait_async(watcher)
+                continue
+            try:
+                await asyncio.wait_for(wait_async(watcher), interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+def _ignore_interrupts() -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+async def report_stats(timer: StageTimer, followers: dict, stats_interval: float) -> None:
+    import asyncio
+
+    while True:
+        await asyncio.sleep(stats_interval)
+        emit_stats(timer, len(followers))
+
+
+async def follow_many(
+    entries: list[str],
+    interval: float,
+    output: str,
+    workers: int | None,
+    stats_interval: float | None = None,
+    history: HistoryStore | None = None,
+    reloader: LexiconReloader | None = None,
+) -> None:
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor
+
+    loop = asyncio.get_running_loop()
+    followers: dict[str, asyncio.Task] = {}
+    lexicons = {"current": reloader.lexicon} if reloader else None
+    timer = StageTimer() if stats_interval else None
+    # Kept referenced so the reporting task is not garbage-collected.
+    reporter = asyncio.create_task(report_stats(timer, followers, stats_interval)) if timer is not None else None
+    # SIGTERM stops discovery and cancels the followers, so the pool below is
+    # shut down and its workers joined instead of being left orphaned.
+    stopping = asyncio.Event()
+    loop.add_signal_handler(signal.SIGTERM, stopping.set)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_ignore_interrupts) as pool:
+            try:
+                while not stopping.is_set():
+                    if reloader is not None and (lexicon := reloader.check()) is not None:
+                        lexicons["current"] = lexicon
+                    with stage(timer, "discover"):
+                        sources = resolve_text_paths(entries)
+                    for source in sources:
+                        if source not in followers:
+                            followers[source] = asyncio.create_task(
+                                follow_source(source, pool, interval, output, timer, history, lexicons)
+                            )
+                    try:
+                        await asyncio.wait_for(stopping.wait(), interval)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                tasks = [*followers.values(), *([reporter] if reporter is not None else [])]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+
+
+def run_follow_many_mode(
+    entries: list[str],
+    interval: float,
+    output: str,
+    workers: int | None,
+    stats_interval: float | None = None,
+    history: HistoryStore | None = None,
+    reloader: LexiconReloader | None = None,
+) -> int:
+    import asyncio
+
+    try:
+        asyncio.run(follow_many(entries, interval, output, workers, stats_interval, history, reloader))
     except KeyboardInterrupt:
         return 0
+    return 0
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Measure interaction-artifact state shifts in near real time.")
     parser.add_argument("--stdin", action="store_true", help="Read one interaction artifact from stdin.")
-    parser.add_argument("--follow", help="Poll a text file and emit a new snapshot when it changes.")
-    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds for --follow.")
-    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
+    parser.add_argument(
+        "--follow",
+        nargs="+",
+        help=(
+            "Watch a text file and emit a new snapshot when it changes. Several paths, directories, "
+            "or glob patterns are followed together as one JSONL stream tagged by source."
+        ),
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Stat polling interval in seconds for --follow when inotify is unavailable.",
+    )
+    parser.add_argument("--workers", type=int, help="Scoring worker processes when following several files.")
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        help="With --follow, print per-stage timing counters as one JSON line to stderr every this many seconds.",
+    )
+    parser.add_argument("--history", help="Also append every snapshot and state delta to this history store.")
+    parser.add_argument(
+        "--lexicon",
+        help="JSON or TOML lexicon file to use instead of the builtin markers. With --follow, edits are reloaded.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON (same as --format json).")
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help=(
+            "Snapshot output: readable text, JSON payloads, compact one-line JSON records without the "
+            "constant text, or binary records (decode with report_records.py --decode)."
+        ),
+    )
     args = parser.parse_args()
+    if args.json and args.format not in ("text", "json"):
+        parser.error("--json cannot be combined with --format compact or binary.")
+    output = "json" if args.json else args.format
+
+    history = HistoryStore(args.history) if args.history else None
 
     if args.stdin:
-        return run_stdin_mode(args.json)
+        return run_stdin_mode(output, history, resolve_lexicon(args.lexicon))
     if args.follow:
-        return run_follow_mode(args.follow, args.interval, args.json)
+        reloader = LexiconReloader(args.lexicon, interval=args.interval) if args.lexicon else None
+        entry = args.follow[0]
+        if len(args.follow) == 1 and not Path(entry).is_dir() and not is_glob(entry):
+            return run_follow_mode(entry, args.interval, output, args.stats_interval, history, reloader)
+        return run_follow_many_mode(
+            args.follow, args.interval, output, args.workers, args.stats_interval, history, reloader
+        )
     parser.error("Choose either --stdin or --follow.")
     return 2
 
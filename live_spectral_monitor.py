@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Rolling spectral monitor for live signal captures.
+
+Samples are read as they are appended to a file or piped on stdin and kept in
+a ring buffer covering the last ``--window-seconds`` of signal. Every
+``--update-seconds`` of new signal the monitor emits one JSON line with the
+same fields as ``quantum_state_proof.build_spectral_report`` plus a ``stream``
+block.
+
+Between updates the spectrum is advanced with a sliding DFT: the samples that
+arrived since the last update are applied in one product with a table of
+twiddle powers, which costs one pass over the bins per new sample. When an
+update brings more new samples than that is worth (see ``sliding_max_batch``),
+the ring is transformed with a single rfft instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from file_watch import open_watcher
+from quantum_state_proof import RAW_SIGNAL_DTYPES, summarize_spectrum
+
+
+DEFAULT_WINDOW_SECONDS = 30.0
+DEFAULT_UPDATE_SECONDS = 1.0
+
+# Update costs in units of one complex multiply-add per bin, fitted to
+# benchmarks/sliding_spectrum.py timings: an rfft of the ring (with the roll
+# that orders it) against a sliding update of a given batch of new samples.
+FFT_CALL_COST = 47_000
+FFT_COST_PER_POINT = 1.0  # times N * log2(N)
+SLIDING_CALL_COST = 9_000
+SLIDING_COST_PER_BIN = 13.0  # rotating the old bins and taking magnitudes
+# The twiddle-power table holds one row of bins per batched sample.
+SLIDING_TABLE_BYTES = 16 << 20
+# Sliding updates accumulate rounding error; recompute exactly this often.
+RESYNC_UPDATES = 256
+
+FIELD_SPLIT = re.compile(r"[,\s]+")
+
+
+def sliding_max_batch(size: int) -> int:
+    # The most new samples per update for which the sliding DFT is cheaper than
+    # one rfft of a size-sample window: O(batch * bins) against O(N log N).
+    bins = size // 2 + 1
+    fft_cost = FFT_CALL_COST + FFT_COST_PER_POINT * size * np.log2(size)
+    batch = int((fft_cost - SLIDING_CALL_COST) / bins - SLIDING_COST_PER_BIN)
+    return max(0, min(batch, size, SLIDING_TABLE_BYTES // (16 * bins)))
+
+
+class SlidingSpectrum:
+    """Magnitude spectrum of the most recent window of a sample stream."""
+
+    def __init__(
+        self,
+        sample_rate: float,
+        window_seconds: float,
+        target_frequency: float = 0.67,
+        max_batch: int | None = None,
+    ) -> None:
+        self.size = int(round(window_seconds * sample_rate))
+        if self.size < 8:
+            raise ValueError("Need at least 8 samples per window for spectral analysis.")
+        self.sample_rate = sample_rate
+        self.target_frequency = target_frequency
+        self.freqs = np.fft.rfftfreq(self.size, d=1.0 / sample_rate)
+        self.max_batch = sliding_max_batch(self.size) if max_batch is None else max_batch
+        # Row j holds twiddle ** (max_batch - j), so the last k rows advance k samples.
+        twiddle = np.exp(2j * np.pi * np.arange(self.freqs.size) / self.size)
+        self._powers = twiddle[np.newaxis, :] ** np.arange(self.max_batch, 0, -1)[:, np.newaxis]
+        self.reset()
+
+    def reset(self) -> None:
+        self.buffer = np.zeros(self.size)
+        self.sample_count = 0
+        self.method = None
+        self._bins = None
+        self._deltas: list[float] = []
+        self._sliding_updates = 0
+
+    def push(self, samples: np.ndarray) -> None:
+        samples = np.asarray(samples, dtype=float).ravel()
+        if samples.size >= self.size:
+            self.buffer[:] = samples[-self.size:]
+            self.sample_count += samples.size
+            # Keep the ring ordered so its head lands back on index 0.
+            self.buffer = np.roll(self.buffer, self.sample_count % self.size)
+            self._bins = None
+            return
+
+        positions = (self.sample_count + np.arange(samples.size)) % self.size
+        if self._bins is not None and len(self._deltas) + samples.size <= self.max_batch:
+            self._deltas.extend((samples - self.buffer[positions]).tolist())
+        else:
+            self._bins = None
+        self.buffer[positions] = samples
+        self.sample_count += samples.size
+
+    def _window(self) -> np.ndarray:
+        if self.sample_count < self.size:
+            return self.buffer[:self.sample_count]
+        return np.roll(self.buffer, -(self.sample_count % self.size))
+
+    def analysis(self) -> dict:
+        if self.sample_count < 8:
+            raise ValueError("Need at least 8 samples for spectral analysis.")
+
+        if self.sample_count < self.size:
+            window = self._window()
+            freqs = np.fft.rfftfreq(window.size, d=1.0 / self.sample_rate)
+            spectrum = np.abs(np.fft.rfft(window - window.mean()))
+            self.method = "fft"
+        else:
+            if self._bins is None or self._sliding_updates >= RESYNC_UPDATES:
+                self._bins = np.fft.rfft(self._window())
+                self._sliding_updates = 0
+                self.method = "fft"
+            else:
+                # Stepping (bins + delta) * twiddle once per sample, unrolled.
+                if self._deltas:
+                    powers = self._powers[self.max_batch - len(self._deltas):]
+                    self._bins *= powers[0]
+                    self._bins += np.asarray(self._deltas) @ powers
+                self._sliding_updates += 1
+                self.method = "sliding_dft"
+            self._deltas = []
+            freqs = self.freqs
+            spectrum = np.abs(self._bins)
+
+        # The DC bin is dropped, which matches analyzing the mean-removed window.
+        spectrum[0] = 0.0
+        return summarize_spectrum(freqs, spectrum, int(min(self.sample_count, self.size)), self.target_frequency)
+
+
+def parse_samples(lines: list[str], column: int | None = None) -> np.ndarray:
+    values = []
+    for line in lines:
+        fields = [field for field in FIELD_SPLIT.split(line.strip()) if field]
+        if not fields:
+            continue
+        try:
+            values.append(float(fields[-1 if column is None else column]))
+        except (ValueError, IndexError):
+            # Header rows and malformed lines are skipped.
+            continue
+    return np.asarray(values, dtype=float)
+
+
+class SampleFollower:
+    """Reads samples appended to a text or raw binary signal file."""
+
+    def __init__(self, source: str, column: int | None = None) -> None:
+        self.source = source
+        self.column = column
+        self.dtype = RAW_SIGNAL_DTYPES.get(Path(source).suffix.lower())
+        self.offset = 0
+        self._pending = b""
+
+    def poll(self) -> tuple[np.ndarray, bool]:
+        restarted = False
+        with open(self.source, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size < self.offset:
+                self.offset = 0
+                self._pending = b""
+                restarted = True
+            handle.seek(self.offset)
+            data = handle.read()
+        self.offset += len(data)
+        data = self._pending + data
+
+        if self.dtype is not None:
+            itemsize = np.dtype(self.dtype).itemsize
+            usable = len(data) - len(data) % itemsize
+            self._pending = data[usable:]
+            return np.frombuffer(data[:usable], dtype=self.dtype).astype(float), restarted
+
+        complete, _, self._pending = data.rpartition(b"\n")
+        lines = complete.decode("utf-8", errors="replace").splitlines()
+        return parse_samples(lines, self.column), restarted
+
+
+class SpectralMonitor:
+    """Feeds samples into a sliding spectrum and builds update records."""
+
+    def __init__(
+        self,
+        source: str,
+        sample_rate: float,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        update_seconds: float = DEFAULT_UPDATE_SECONDS,
+        target_frequency: float = 0.67,
+    ) -> None:
+        self.source = source
+        self.window_seconds = window_seconds
+        self.spectrum = SlidingSpectrum(sample_rate, window_seconds, target_frequency)
+        self.update_samples = max(1, int(round(update_seconds * sample_rate)))
+        self.update_index = 0
+        self._since_update = 0
+
+    def reset(self) -> None:
+        self.spectrum.reset()
+        self._since_update = 0
+
+    def feed(self, samples: np.ndarray) -> list[dict]:
+        updates = []
+        start = 0
+        while start < samples.size:
+            step = min(self.update_samples - self._since_update, samples.size - start)
+            self.spectrum.push(samples[start:start + step])
+            self._since_update += step
+            start += step
+            if self._since_update >= self.update_samples:
+                self._since_update = 0
+                if self.spectrum.sample_count >= 8:
+                    updates.append(self.update())
+        return updates
+
+    def update(self) -> dict:
+        self.update_index += 1
+        spectrum = self.spectrum
+        report = spectrum.analysis()
+        report["signal_origin"] = {
+            "mode": "streaming_series",
+            "source_path": self.source,
+            "note": "User-supplied data. Interpretation depends on upstream capture quality.",
+        }
+        report["notes"] = [
+            "Each update covers only the most recent window of the stream.",
+            "Observed-series mode is where this module becomes useful for downstream measurement layers.",
+        ]
+        report["stream"] = {
+            "update_index": self.update_index,
+            "samples_seen": spectrum.sample_count,
+            "stream_seconds": round(spectrum.sample_count / spectrum.sample_rate, 3),
+            "window_seconds": self.window_seconds,
+            "window_samples": spectrum.size,
+            "window_fill": round(min(1.0, spectrum.sample_count / spectrum.size), 3),
+            "method": spectrum.method,
+        }
+        return report
+
+
+def emit_update(report: dict, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(report, separators=(",", ":")), flush=True)
+        return
+    stream = report["stream"]
+    print(
+        f"[{stream['stream_seconds']:.1f}s] peak {report['dominant_frequency_hz']:.4f} Hz, "
+        f"SNR {report['snr_ratio']:.3f}, alignment {report['target_alignment_score']:.3f} "
+        f"({stream['method']})",
+        flush=True,
+    )
+
+
+def run_stdin_mode(monitor: SpectralMonitor, column: int | None, as_json: bool) -> int:
+    try:
+        for line in iter(sys.stdin.readline, ""):
+            for report in monitor.feed(parse_samples([line], column)):
+                emit_update(report, as_json)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_follow_mode(monitor: SpectralMonitor, path: str, column: int | None, interval: float, as_json: bool) -> int:
+    follower = SampleFollower(monitor.source, column)
+    try:
+        with open_watcher(path, interval=interval) as watcher:
+            # Samples already in the file only fill the ring; updates start from there.
+            samples, _ = follower.poll()
+            monitor.spectrum.push(samples)
+            if monitor.spectrum.sample_count >= 8:
+                emit_update(monitor.update(), as_json)
+            while True:
+                watcher.wait()
+                samples, restarted = follower.poll()
+                if restarted:
+                    monitor.reset()
+                for report in monitor.feed(samples):
+                    emit_update(report, as_json)
+    except KeyboardInterrupt:
+        return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Track the dominant frequency and SNR of a live signal stream.")
+    parser.add_argument("--follow", help="Signal file to follow: numeric text lines or raw .f32/.f64 samples.")
+    parser.add_argument("--stdin", action="store_true", help="Read one sample per line from stdin.")
+    parser.add_argument(
+        "--column",
+        type=int,
+        help="Field index to read from each delimited text line (defaults to the last field).",
+    )
+    parser.add_argument("--sample-rate", type=float, default=50.0, help="Sample rate in Hz.")
+    parser.add_argument("--target-frequency", type=float, default=0.67, help="Reference target frequency.")
+    parser.add_argument(
+        "--window-seconds",
+        type=float,
+        default=DEFAULT_WINDOW_SECONDS,
+        help="Length of the rolling analysis window.",
+    )
+    parser.add_argument(
+        "--update-seconds",
+        type=float,
+        default=DEFAULT_UPDATE_SECONDS,
+        help="Emit an update after this much new signal.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Stat polling interval in seconds for --follow when inotify is unavailable.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per update.")
+    args = parser.parse_args()
+
+    if bool(args.follow) == args.stdin:
+        parser.error("Choose either --stdin or --follow.")
+
+    source = str(Path(args.follow).resolve()) if args.follow else "stdin"
+    monitor = SpectralMonitor(
+        source,
+        sample_rate=args.sample_rate,
+        window_seconds=args.window_seconds,
+        update_seconds=args.update_seconds,
+        target_frequency=args.target_frequency,
+    )
+    if args.stdin:
+        return run_stdin_mode(monitor, args.column, args.json)
+    return run_follow_mode(monitor, source, args.column, args.interval, args.json)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
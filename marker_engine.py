@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Single-pass marker counting engine.
+
+The report modules describe their markers as category -> list of word-bounded
+regex patterns. Scanning the text once per pattern is exact but slow on long
+session exports, so this engine scans the text once, counts each distinct
+token or phrase, and classifies the (much smaller) vocabulary instead.
+
+Counts match a per-pattern ``re.findall(pattern, text, re.IGNORECASE)`` sum
+as long as every pattern starts and ends with ``\\b`` and multi-word phrase
+patterns do not overlap each other inside the text.
+
+Patterns that match a small finite set of strings (``\\bplan(?:s|ned)?\\b``)
+are expanded once into a lowercase literal table, so classifying an ASCII
+token is a dict lookup; only the remaining patterns are tried as regexes.
+The expansion is the slow part of building an engine for a large lexicon.
+``compiled_state`` exports it so callers can store it and pass it back.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections import Counter
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    try:
+        import sre_parse as _sre_parse
+    except ImportError:
+        _sre_parse = None
+
+
+WORD_PATTERN = re.compile(r"\w+")
+_LEXICAL_BODY = re.compile(r"[\w()|?*+]+")
+_CACHE_LIMIT = 65536
+# Bump when expand_pattern, _first_letter, or the compiled state layout change,
+# so stored states from older code are rebuilt instead of trusted.
+COMPILED_FORMAT = 1
+# Patterns matching more strings than this stay regexes.
+_MAX_EXPANSIONS = 64
+_MAX_EXPANDED_REPEAT = 4
+_SCANNERS: dict[frozenset[str], re.Pattern] = {}
+_FIRST_LETTERS: dict[str, str | None] = {}
+# The only non-ASCII characters that match ASCII word characters under re.IGNORECASE.
+_ASCII_FOLDS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+_ENGINES: dict[tuple, MarkerEngine] = {}
+# The regex parser is private and its node layout changes between Python
+# versions. If it is missing or these errors come out of it, the pattern is
+# left unexpanded and matched as a regex, which counts the same, only slower.
+_PARSER_ERRORS = (AttributeError, IndexError, TypeError, ValueError)
+
+
+def _is_lexical(pattern: str) -> bool:
+    body = pattern[2:-2].replace("(?:", "(")
+    return "(?" not in body and _LEXICAL_BODY.fullmatch(body) is not None
+
+
+def _max_width(pattern: str) -> int | None:
+    if _sre_parse is None:
+        return None
+    try:
+        width = _sre_parse.parse(pattern, re.IGNORECASE).getwidth()[1]
+        return None if width >= _sre_parse.MAXREPEAT else int(width)
+    except _PARSER_ERRORS:
+        return None
+
+
+def _expand(nodes) -> set[str] | None:
+    # Every string the parsed nodes match, or None when that set is infinite,
+    # too large, or needs anything other than literals, classes, groups,
+    # alternation, and bounded repeats.
+    results = {""}
+    for op, value in nodes:
+        if op is _sre_parse.LITERAL:
+            options = {chr(value)}
+        elif op is _sre_parse.IN:
+            options = set()
+            for kind, item in value:
+                if kind is _sre_parse.LITERAL:
+                    options.add(chr(item))
+                elif kind is _sre_parse.RANGE and item[1] - item[0] < _MAX_EXPANSIONS:
+                    options.update(chr(code) for code in range(item[0], item[1] + 1))
+                else:
+                    return None
+        elif op is _sre_parse.SUBPATTERN:
+            _, added_flags, removed_flags, inner = value
+            options = None if added_flags or removed_flags else _expand(inner)
+        elif op is _sre_parse.BRANCH:
+            branches = [_expand(branch) for branch in value[1]]
+            options = None if None in branches else set().union(*branches)
+        elif op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT):
+            low, high, inner = value
+            inner_options = _expand(inner) if high <= _MAX_EXPANDED_REPEAT else None
+            if inner_options is None:
+                return None
+            options = set()
+            repeated = {""}
+            for count in range(high + 1):
+                if count >= low:
+                    options |= repeated
+                repeated = {prefix + option for prefix in repeated for option in inner_options}
+                if len(repeated) > _MAX_EXPANSIONS:
+                    return None
+        else:
+            return None
+        if options is None:
+            return None
+        results = {prefix + option for prefix in results for option in options}
+        if len(results) > _MAX_EXPANSIONS:
+            return None
+    return results
+
+
+def expand_pattern(pattern: str) -> list[str] | None:
+    # The lowercase strings a word-bounded pattern fullmatches, if they are
+    # few, ASCII, and start and end with word characters (so the outer \b hold).
+    if _sre_parse is None:
+        return None
+    try:
+        nodes = list(_sre_parse.parse(pattern, re.IGNORECASE))
+        if len(nodes) < 2 or nodes[0][0] is not _sre_parse.AT or nodes[-1][0] is not _sre_parse.AT:
+            return None
+        expanded = _expand(nodes[1:-1])
+    except _PARSER_ERRORS:
+        return None
+    if not expanded:
+        return None
+    for string in expanded:
+        if not string.isascii() or WORD_PATTERN.match(string[0]) is None or WORD_PATTERN.match(string[-1]) is None:
+            return None
+    return sorted({string.lower() for string in expanded})
+
+
+def _first_letter(pattern: str) -> str | None:
+    if pattern not in _FIRST_LETTERS:
+        letter = ""
+        if _sre_parse is not None:
+            try:
+                nodes = _sre_parse.parse(pattern, re.IGNORECASE)
+                letter = chr(nodes[1][1]).lower() if len(nodes) > 1 and nodes[1][0] is _sre_parse.LITERAL else ""
+            except _PARSER_ERRORS:
+                pass
+        _FIRST_LETTERS[pattern] = letter if letter.isascii() and letter.isalnum() else None
+    return _FIRST_LETTERS[pattern]
+
+
+def build_scanner(phrases: list[str]) -> re.Pattern:
+    # Case-insensitive alternatives cannot skip on their first character, so
+    # every phrase would be tried at every word. When each phrase starts with
+    # a literal letter, the phrases are grouped behind a one-letter lookahead.
+    # Only one group can match at a position and each group keeps its order,
+    # so the match is the same as with the flat alternation.
+    letters = [_first_letter(phrase) for phrase in phrases]
+    if phrases and None not in letters:
+        groups: dict[str, list[str]] = {}
+        for letter, phrase in zip(letters, phrases):
+            groups.setdefault(letter, []).append(f"(?:{phrase[2:]})")
+        alternatives = "|".join(f"(?={letter})(?:{'|'.join(group)})" for letter, group in groups.items())
+    else:
+        alternatives = "|".join(f"(?:{phrase[2:]})" for phrase in phrases)
+    return re.compile(f"{alternatives}|\\w+" if alternatives else r"\w+", flags=re.IGNORECASE)
+
+
+class AnalyzedText:
+    """One scan of a text, shared by every engine whose phrases it covers."""
+
+    def __init__(
+        self,
+        items: Counter,
+        phrases: frozenset[str],
+        settled: dict[MarkerEngine, tuple[dict[str, int], int]] | None = None,
+    ) -> None:
+        self.items = items
+        self.phrases = phrases
+        self.settled = settled or {}
+        self._tallies: dict[MarkerEngine, tuple[dict[str, int], int]] = {}
+
+    def tally(self, engine: MarkerEngine) -> tuple[dict[str, int], int]:
+        if engine not in self._tallies:
+            if not engine.phrases <= self.phrases:
+                raise ValueError("Analyzed text was not scanned for this engine's phrase patterns.")
+            counts, words = engine.tally(self.items)
+            if engine in self.settled:
+                settled_counts, settled_words = self.settled[engine]
+                counts = {name: count + settled_counts[name] for name, count in counts.items()}
+                words += settled_words
+            self._tallies[engine] = (counts, words)
+        counts, words = self._tallies[engine]
+        return dict(counts), words
+
+
+def shared_scanner(engines: list[MarkerEngine]) -> tuple[re.Pattern, frozenset[str]]:
+    phrases = frozenset().union(*(engine.phrases for engine in engines))
+    scanner = _SCANNERS.get(phrases)
+    if scanner is None:
+        scanner = _SCANNERS[phrases] = build_scanner(sorted(phrases))
+    return scanner, phrases
+
+
+def analyze(text: str, engines: list[MarkerEngine]) -> AnalyzedText:
+    scanner, phrases = shared_scanner(engines)
+    return AnalyzedText(Counter(scanner.findall(text)), phrases)
+
+
+class MarkerEngine:
+    """Compiled matcher for a category -> patterns lexicon."""
+
+    def __init__(
+        self,
+        categories: dict[str, list[str]],
+        version: str = "builtin",
+        compiled: dict | None = None,
+    ) -> None:
+        for patterns in categories.values():
+            for pattern in patterns:
+                if not (pattern.startswith(r"\b") and pattern.endswith(r"\b")):
+                    raise ValueError(f"Marker pattern must be word-bounded: {pattern!r}")
+
+        self.categories = {name: list(patterns) for name, patterns in categories.items()}
+        self.version = version
+        self.key = _engine_key(self.categories, version)
+        self.digest = hashlib.sha256(json.dumps(self.key).encode("utf-8")).hexdigest()
+        _ENGINES.setdefault(self.key, self)
+        all_patterns = [(name, pattern) for name, patterns in self.categories.items() for pattern in patterns]
+        self.phrases = frozenset(pattern for _, pattern in all_patterns if not _is_lexical(pattern))
+
+        if not _usable_state(compiled, self.digest, len(all_patterns)):
+            widths = [_max_width(phrase) for phrase in self.phrases]
+            compiled = {
+                "format": COMPILED_FORMAT,
+                "digest": self.digest,
+                "expansions": [expand_pattern(pattern) for _, pattern in all_patterns],
+                "max_phrase_width": None if None in widths else max(widths, default=0),
+                "first_letters": {phrase: _first_letter(phrase) for phrase in sorted(self.phrases)},
+            }
+        else:
+            _FIRST_LETTERS.update(compiled["first_letters"])
+        self.compiled_state = compiled
+        self.max_phrase_width = compiled["max_phrase_width"]
+        self._scanner = shared_scanner([self])[0]
+
+        literal_hits: dict[str, dict[str, int]] = {}
+        fallback: dict[str, list[str]] = {}
+        for (name, pattern), expansion in zip(all_patterns, compiled["expansions"]):
+            if expansion is None:
+                fallback.setdefault(name, []).append(pattern)
+                continue
+            for string in expansion:
+                hits = literal_hits.setdefault(string, {})
+                hits[name] = hits.get(name, 0) + 1
+        self._literal_hits = literal_hits
+        # Per-pattern regexes are compiled when a token first passes a union.
+        self._fallback_patterns = fallback
+        self._fallback: list[tuple[str, list[re.Pattern]]] | None = None
+        self._fallback_union = _compile_union(fallback)
+        self._item_cache: dict[str, tuple[int, dict[str, int]]] = {}
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, MarkerEngine) and other.key == self.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __reduce__(self):
+        return (compile_engine, (self.categories, self.version))
+
+    def scan(self, text: str) -> Counter:
+        return Counter(self._scanner.findall(text))
+
+    def analyze(self, text: str) -> AnalyzedText:
+        return AnalyzedText(self.scan(text), self.phrases)
+
+    def _classify_token(self, token: str) -> dict[str, int]:
+        folded = token.translate(_ASCII_FOLDS)
+        hits = dict(self._literal_hits.get(folded.lower(), {})) if folded.isascii() else {}
+        if self._fallback_union is None or self._fallback_union.fullmatch(token) is None:
+            return hits
+        if self._fallback is None:
+            self._fallback = _compile_categories(self._fallback_patterns)
+        for name, patterns in self._fallback:
+            count = sum(1 for pattern in patterns if pattern.fullmatch(token))
+            if count:
+                hits[name] = hits.get(name, 0) + count
+        return hits
+
+    def _classify(self, item: str) -> tuple[int, dict[str, int]]:
+        cached = self._item_cache.get(item)
+        if cached is not None:
+            return cached
+
+        tokens = WORD_PATTERN.findall(item)
+        hits = self._classify_token(item)
+        if len(tokens) != 1 or tokens[0] != item:
+            for token in tokens:
+                for name, count in self._classify(token)[1].items():
+                    hits[name] = hits.get(name, 0) + count
+
+        if len(self._item_cache) >= _CACHE_LIMIT:
+            self._item_cache.clear()
+        result = (len(tokens), hits)
+        self._item_cache[item] = result
+        return result
+
+    def classify(self, item: str) -> tuple[int, dict[str, int]]:
+        token_count, hits = self._classify(item)
+        return token_count, dict(hits)
+
+    def tally(self, items: Counter) -> tuple[dict[str, int], int]:
+        counts = dict.fromkeys(self.categories, 0)
+        words = 0
+        for item, occurrences in items.items():
+            token_count, hits = self._classify(item)
+            words += token_count * occurrences
+            for name, count in hits.items():
+                counts[name] += count * occurrences
+        return counts, words
+
+    def count(self, text: str) -> tuple[dict[str, int], int]:
+        return self.tally(self.scan(text))
+
+
+def _usable_state(compiled, digest: str, pattern_count: int) -> bool:
+    # A stored state is only used when it was written by this format for these
+    # exact patterns and has every field; anything else is rebuilt.
+    try:
+        expansions = compiled["expansions"]
+        width = compiled["max_phrase_width"]
+        return (
+            compiled["format"] == COMPILED_FORMAT
+            and compiled["digest"] == digest
+            and isinstance(expansions, list)
+            and len(expansions) == pattern_count
+            and all(
+                expansion is None or (isinstance(expansion, list) and all(isinstance(item, str) for item in expansion))
+                for expansion in expansions
+            )
+            and (width is None or (isinstance(width, int) and not isinstance(width, bool)))
+            and isinstance(compiled["first_letters"], dict)
+            and all(letter is None or isinstance(letter, str) for letter in compiled["first_letters"].values())
+        )
+    except (KeyError, TypeError):
+        return False
+
+
+def _engine_key(categories: dict[str, list[str]], version: str) -> tuple:
+    return (version, tuple((name, tuple(patterns)) for name, patterns in categories.items()))
+
+
+def _compile_categories(categories: dict[str, list[str]]) -> list[tuple[str, list[re.Pattern]]]:
+    return [
+        (name, [re.compile(pattern, flags=re.IGNORECASE) for pattern in patterns])
+        for name, patterns in categories.items()
+    ]
+
+
+def _compile_union(categories: dict[str, list[str]]) -> re.Pattern | None:
+    patterns = [pattern for patterns in categories.values() for pattern in patterns]
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags=re.IGNORECASE)
+
+
+def compile_engine(
+    categories: dict[str, list[str]],
+    version: str = "builtin",
+    compiled: dict | None = None,
+) -> MarkerEngine:
+    return _ENGINES.get(_engine_key(categories, version)) or MarkerEngine(categories, version, compiled)
@@ -12,17 +12,28 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
 from pathlib import Path
 
-from consciousness_interface import build_interface_report, load_text
-from quantum_state_proof import build_spectral_report
-from temporal_coherence import build_temporal_report
+from history_store import HistoryStore
+from input_paths import resolve_text_paths
+from lexicon import resolve_lexicon
+from report_cache import DEFAULT_MAX_BYTES, ReportCache, open_cache, stats_delta
+from signal_options import DEFAULT_WINDOW_OVERLAP, add_window_arguments, add_zoom_arguments
+from stage_timing import StageTimer, peak_rss_mb, stage
+from text_analysis import build_file_reports
 from transition_metrics import build_transition_profile
 
 
 REPO_ROOT = Path(__file__).resolve().parent
 DEFAULT_TEXT_PATH = REPO_ROOT / "README.md"
+DEFAULT_CHUNK_SIZE = 8
+PROFILE_TOP_FUNCTIONS = 25
 
 
 def build_full_report(
@@ -30,28 +41,45 @@ def build_full_report(
     signal_input: str | None = None,
     signal_column: str | None = None,
     sample_rate: float = 50.0,
+    cache: ReportCache | None = None,
+    window_seconds: float | None = None,
+    overlap: float = DEFAULT_WINDOW_OVERLAP,
+    zoom: bool = False,
+    band_hz: float | None = None,
+    timings: bool = False,
+    lexicon_path: str | None = None,
 ) -> dict:
-    if text_input:
-        text = load_text(text_input)
-        text_source = str(Path(text_input).resolve())
-    else:
-        text = DEFAULT_TEXT_PATH.read_text(encoding="utf-8")
-        text_source = str(DEFAULT_TEXT_PATH)
+    timer = StageTimer() if timings else None
+    # Imported on first use so the CLI and batch parent start without numpy.
+    with stage(timer, "signal_import"):
+        from quantum_state_proof import build_spectral_report
 
-    interface_report = build_interface_report(text, text_source)
-    temporal_report = build_temporal_report(text, text_source)
+    cache_before = cache.stats() if cache is not None else None
+    text_source = str(Path(text_input).resolve()) if text_input else str(DEFAULT_TEXT_PATH)
+    with stage(timer, "lexicon_load"):
+        lexicon = resolve_lexicon(lexicon_path)
+    interface_report, temporal_report = build_file_reports(
+        text_source, text_source, cache=cache, timer=timer, lexicon=lexicon
+    )
     spectral_report = build_spectral_report(
         input_path=signal_input,
         column=signal_column,
         sample_rate=sample_rate,
+        cache=cache,
+        window_seconds=window_seconds,
+        overlap=overlap,
+        zoom=zoom,
+        band_hz=band_hz,
+        timer=timer,
     )
-    transition_profile = build_transition_profile(
-        interface_report=interface_report,
-        temporal_report=temporal_report,
-        spectral_report=spectral_report,
-    )
+    with stage(timer, "transition_profile"):
+        transition_profile = build_transition_profile(
+            interface_report=interface_report,
+            temporal_report=temporal_report,
+            spectral_report=spectral_report,
+        )
 
-    return {
+    report = {
         "timestamp_utc": datetime.now(timezone.utc).isoformat(),
         "repo_role": "transition-interface assessment layer",
         "stack_position": [
@@ -79,30 +107,256 @@ def build_full_report(
             "text_source": text_source,
             "signal_source": spectral_report["signal_origin"]["source_path"],
             "sample_rate_hz": sample_rate,
+            "lexicon": lexicon.info(),
         },
         "interface_report": interface_report,
         "temporal_report": temporal_report,
         "spectral_report": spectral_report,
         "transition_profile": transition_profile,
     }
+    if cache is not None:
+        report["cache"] = stats_delta(cache_before, cache.stats())
+    if timer is not None:
+        report["timings_ms"] = timer.timings_ms()
+        report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+
+def load_manifest(path: str) -> list[str]:
+    manifest_path = Path(path).resolve()
+    entries = []
+    for line in manifest_path.read_text(encoding="utf-8").splitlines():
+        entry = line.strip()
+        if entry and not entry.startswith("#"):
+            entries.append(str(manifest_path.parent / entry))
+    return entries
+
+
+def score_artifact(
+    text_input: str,
+    report_options: dict | None = None,
+    cache_dir: str | None = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+) -> dict:
+    try:
+        report = build_full_report(
+            text_input=text_input,
+            cache=open_cache(cache_dir, cache_max_bytes) if cache_dir else None,
+            **(report_options or {}),
+        )
+    except Exception as exc:
+        return {"artifact": text_input, "status": "error", "error": f"{type(exc).__name__}: {exc}"}
+    return {"artifact": text_input, "status": "ok", "report": report}
+
+
+def _score_chunk(paths: list[str], *options) -> list[dict]:
+    return [score_artifact(path, *options) for path in paths]
+
+
+def run_batch(
+    text_inputs: list[str],
+    report_options: dict | None = None,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ordered: bool = False,
+    cache_dir: str | None = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+):
+    options = (report_options, cache_dir, cache_max_bytes)
+    chunks = [text_inputs[start:start + chunk_size] for start in range(0, len(text_inputs), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers)
+    generation = 0
+    try:
+        # future -> (chunk index, paths, pool generation, isolated)
+        pending = {}
+        finished = {}
+        # Artifacts of a chunk whose worker failed are scored again one at a
+        # time with nothing else in flight, so only the culprit gets an error
+        # record even when it takes the whole pool down with it.
+        suspects = []
+        isolated = {}
+        next_chunk = 0
+        next_emit = 0
+        while pending or suspects or next_chunk < len(chunks):
+            if suspects:
+                if not pending:
+                    index, path = suspects.pop(0)
+                    pending[pool.submit(_score_chunk, [path], *options)] = (index, [path], generation, True)
+            else:
+                while next_chunk < len(chunks) and len(pending) < workers * 2:
+                    future = pool.submit(_score_chunk, chunks[next_chunk], *options)
+                    pending[future] = (next_chunk, chunks[next_chunk], generation, False)
+                    next_chunk += 1
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, paths, submitted_in, single = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as exc:
+                    # Every future of a broken pool fails, but it is replaced once.
+                    if isinstance(exc, BrokenProcessPool) and submitted_in == generation:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = ProcessPoolExecutor(max_workers=workers)
+                        generation += 1
+                    if not single:
+                        suspects.extend((index, path) for path in paths)
+                        isolated[index] = []
+                        continue
+                    results = [{"artifact": paths[0], "status": "error", "error": f"{type(exc).__name__}: {exc}"}]
+                if single:
+                    isolated[index].extend(results)
+                    if len(isolated[index]) < len(chunks[index]):
+                        continue
+                    results = isolated.pop(index)
+                if ordered:
+                    finished[index] = results
+                else:
+                    yield from results
+            while next_emit in finished:
+                yield from finished.pop(next_emit)
+                next_emit += 1
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _cache_max_bytes(args: argparse.Namespace) -> int:
+    return int(args.cache_max_mb * 1024 * 1024)
+
+
+def _report_options(args: argparse.Namespace) -> dict:
+    return {
+        "signal_input": args.signal_input,
+        "signal_column": args.signal_column,
+        "sample_rate": args.sample_rate,
+        "window_seconds": args.window_seconds,
+        "overlap": args.overlap,
+        "zoom": args.zoom,
+        "band_hz": args.band_hz,
+        "timings": args.timings,
+        "lexicon_path": args.lexicon,
+    }
+
+
+def run_batch_mode(args: argparse.Namespace, history: HistoryStore | None = None) -> dict:
+    entries = list(args.batch or [])
+    if args.manifest:
+        entries.extend(load_manifest(args.manifest))
+    text_inputs = resolve_text_paths(entries)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    summary = {"artifacts": len(text_inputs), "ok": 0, "error": 0}
+    if args.cache_dir:
+        summary["cache"] = {"hits": 0, "misses": 0, "evictions": 0}
+    started = time.perf_counter()
+    try:
+        for record in run_batch(
+            text_inputs,
+            report_options=_report_options(args),
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            ordered=args.ordered,
+            cache_dir=args.cache_dir,
+            cache_max_bytes=_cache_max_bytes(args),
+        ):
+            summary[record["status"]] += 1
+            if history is not None and record["status"] == "ok":
+                history.record_report(record["report"])
+            if "cache" in record.get("report", {}):
+                for name, count in record["report"]["cache"].items():
+                    summary["cache"][name] += count
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(summary), file=sys.stderr)
+    return summary
+
+
+def write_profile(profiler, path: str) -> None:
+    import pstats
+
+    profile_path = Path(path).resolve()
+    profile_path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(profile_path))
+    print(f"Profile written to {profile_path}", file=sys.stderr)
+    pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
 
 
 def main() -> dict:
     parser = argparse.ArgumentParser(description="Run the transition-interface assessment suite.")
     parser.add_argument("--text-input", help="Path to a text artifact to analyze.")
-    parser.add_argument("--signal-input", help="Path to a numeric signal file (txt/csv/json).")
+    parser.add_argument("--signal-input", help="Path to a numeric signal file (txt/csv/json/npy or raw .f32/.f64).")
     parser.add_argument("--signal-column", help="Named CSV column for signal values.")
     parser.add_argument("--sample-rate", type=float, default=50.0, help="Sample rate in Hz for signal analysis.")
+    add_window_arguments(parser)
+    add_zoom_arguments(parser)
+    parser.add_argument("--lexicon", help="JSON or TOML lexicon file to use instead of the builtin markers.")
     parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
-    parser.add_argument("--output", help="Optional output path for the report JSON.")
+    parser.add_argument("--output", help="Optional output path for the report JSON (JSONL in batch mode).")
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Add per-stage wall times (timings_ms) and peak memory (peak_rss_mb) to each report.",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Run the report under cProfile, write the stats to this path, and print the top functions to stderr.",
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        help="Score every text artifact in these files, directories, or glob patterns and stream JSONL.",
+    )
+    parser.add_argument("--manifest", help="Batch mode: file listing one text artifact path per line.")
+    parser.add_argument("--workers", type=int, help="Batch mode: number of worker processes.")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Batch mode: artifacts submitted to a worker at a time.",
+    )
+    parser.add_argument("--ordered", action="store_true", help="Batch mode: emit results in input order.")
+    parser.add_argument("--cache-dir", help="Reuse cached component reports for unchanged inputs from this directory.")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Size bound for the report cache before least-recently-used entries are evicted.",
+    )
+    parser.add_argument("--history", help="Also append each report's profile and scores to this history store.")
     args = parser.parse_args()
 
+    history = HistoryStore(args.history) if args.history else None
+
+    if args.batch or args.manifest:
+        if args.text_input:
+            parser.error("--text-input cannot be combined with --batch or --manifest.")
+        if args.chunk_size < 1:
+            parser.error("--chunk-size must be at least 1.")
+        if args.profile:
+            parser.error("--profile profiles a single report and cannot be combined with batch mode.")
+        return run_batch_mode(args, history)
+
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
     report = build_full_report(
         text_input=args.text_input,
-        signal_input=args.signal_input,
-        signal_column=args.signal_column,
-        sample_rate=args.sample_rate,
+        **_report_options(args),
+        cache=open_cache(args.cache_dir, _cache_max_bytes(args)) if args.cache_dir else None,
     )
+    if profiler is not None:
+        profiler.disable()
+        write_profile(profiler, args.profile)
+    if history is not None:
+        history.record_report(report)
 
     if args.output:
         output_path = Path(args.output).resolve()
@@ -140,6 +394,13 @@ def main() -> dict:
         print(f"Signal origin: {report['spectral_report']['signal_origin']['mode']}")
         print(f"Peak frequency (Hz): {report['spectral_report']['dominant_frequency_hz']:.4f}")
         print(f"SNR ratio: {report['spectral_report']['snr_ratio']:.3f}")
+        if "timings_ms" in report:
+            print()
+            print("Stage timings (ms)")
+            print("-" * 60)
+            for name, elapsed in report["timings_ms"].items():
+                print(f"{name}: {elapsed:.3f}")
+            print(f"Peak RSS (MB): {report['peak_rss_mb']}")
 
     return report
 
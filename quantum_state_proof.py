@@ -13,17 +13,61 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
+import itertools
 import json
+import warnings
 from pathlib import Path
 
 import numpy as np
 
+from report_cache import ReportCache, cache_key, file_digest
+from signal_options import DEFAULT_WINDOW_OVERLAP, add_window_arguments, add_zoom_arguments
+from stage_timing import StageTimer, stage
+
+
+# Bump when the spectral metrics change so cached reports are rebuilt.
+SCORING_VERSION = 2
+
+REFERENCE_DURATION_SECONDS = 60.0
+REFERENCE_NOISE_LEVEL = 0.15
+
+WINDOW_BLOCK = 64
+# Windowed reports list at most this many windows inline, evenly strided; the
+# summary statistics and an optional spectrogram file still cover every window.
+MAX_INLINE_WINDOWS = 256
+
+# Target-band zoom: samples are split into ZOOM_BLOCK-long blocks so DFTs at
+# arbitrary frequencies reduce to small matrix products. The search narrows by
+# ZOOM_STEP per stage and ends on a grid ZOOM_FACTOR times finer than FFT bins.
+DEFAULT_BAND_FRACTION = 0.25
+ZOOM_BLOCK = 4096
+ZOOM_STEP = 8
+ZOOM_FACTOR = 8
+ZOOM_COARSE_POINTS = 64
+ZOOM_MAX_GROUPS = 16
+NOISE_SAMPLE_BLOCKS = 32
+
+CSV_CHUNK_ROWS = 1 << 18
+# Time-axis columns are not channels when every numeric column is selected.
+TIME_COLUMNS = {"t", "time", "timestamp", "seconds", "elapsed"}
+
+# Raw binary signals are headerless little-endian samples, typed by suffix.
+RAW_SIGNAL_DTYPES = {
+    ".f32": "<f4",
+    ".float32": "<f4",
+    ".f64": "<f8",
+    ".float64": "<f8",
+    ".bin": "<f8",
+    ".raw": "<f8",
+}
+
 
 def generate_reference_series(
     sample_rate: float,
-    duration_seconds: float = 60.0,
+    duration_seconds: float = REFERENCE_DURATION_SECONDS,
     base_frequency: float = 0.67,
-    noise_level: float = 0.15,
+    noise_level: float = REFERENCE_NOISE_LEVEL,
 ) -> np.ndarray:
     time = np.arange(0, duration_seconds, 1.0 / sample_rate)
     rng = np.random.default_rng(67)
@@ -37,6 +81,22 @@ def load_numeric_series(input_path: str, column: str | None = None) -> np.ndarra
     path = Path(input_path).resolve()
     suffix = path.suffix.lower()
 
+    # Binary inputs stay memory-mapped; slicing them reads only the pages touched.
+    if suffix == ".npy":
+        values = np.load(path, mmap_mode="r", allow_pickle=False)
+        if values.dtype.names:
+            if column is None:
+                column = values.dtype.names[-1]
+            if column not in values.dtype.names:
+                raise ValueError(f"NPY input has no field named {column!r}.")
+            return values[column]
+        if values.ndim > 1:
+            return values[:, _column_index(column, values.shape[1], "NPY")] if column is not None else values[:, -1]
+        return values
+
+    if suffix in RAW_SIGNAL_DTYPES:
+        return np.memmap(path, dtype=RAW_SIGNAL_DTYPES[suffix], mode="r")
+
     if suffix == ".json":
         payload = json.loads(path.read_text(encoding="utf-8"))
         if isinstance(payload, dict):
@@ -53,15 +113,7 @@ def load_numeric_series(input_path: str, column: str | None = None) -> np.ndarra
         return np.asarray(values, dtype=float)
 
     if suffix == ".csv":
-        with path.open("r", encoding="utf-8", newline="") as handle:
-            reader = csv.DictReader(handle)
-            if reader.fieldnames is None:
-                raise ValueError("CSV input must include a header row.")
-            if column is None:
-                numeric_candidates = [field for field in reader.fieldnames if field]
-                column = numeric_candidates[-1]
-            values = [float(row[column]) for row in reader if row.get(column)]
-        return np.asarray(values, dtype=float)
+        return load_csv_column(path, column)
 
     values = np.loadtxt(path, dtype=float)
     if values.ndim > 1:
@@ -69,10 +121,147 @@ def load_numeric_series(input_path: str, column: str | None = None) -> np.ndarra
     return np.asarray(values, dtype=float)
 
 
+def load_csv_column(path: Path, column: str | None = None, chunk_rows: int = CSV_CHUNK_ROWS) -> np.ndarray:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        header = _read_csv_header(handle)
+        if column is None:
+            column = [field for field in header if field][-1]
+        return _read_csv_rows(handle, [_csv_index(header, column)], chunk_rows)[:, 0]
+
+
+def load_csv_columns(
+    path: Path,
+    columns: list[str] | None = None,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> tuple[list[str], np.ndarray]:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        header = _read_csv_header(handle)
+        if columns:
+            indexes = [_csv_index(header, column) for column in columns]
+        else:
+            # Without an explicit selection, every numeric non-time column is a channel.
+            start = handle.tell()
+            first = next((row for row in csv.reader(iter(handle.readline, "")) if row), [])
+            handle.seek(start)
+            indexes = [
+                index for index, field in enumerate(header)
+                if field and field.strip().lower() not in TIME_COLUMNS
+                and index < len(first) and _is_number(first[index])
+            ]
+            if not indexes:
+                raise ValueError("CSV input has no numeric columns.")
+        return [header[index] for index in indexes], _read_csv_rows(handle, indexes, chunk_rows)
+
+
+def _read_csv_header(handle) -> list[str]:
+    header = next((row for row in csv.reader(iter(handle.readline, "")) if row), None)
+    if header is None:
+        raise ValueError("CSV input must include a header row.")
+    return header
+
+
+def _csv_index(header: list[str], column: str) -> int:
+    if column not in header:
+        raise ValueError(f"CSV input has no column named {column!r}.")
+    return len(header) - 1 - header[::-1].index(column)
+
+
+def _column_index(column: str, count: int, kind: str) -> int:
+    # Headerless inputs name columns by position.
+    try:
+        index = int(column)
+    except (TypeError, ValueError):
+        index = -1
+    if not 0 <= index < count:
+        raise ValueError(f"{kind} input has no column named {column!r}; columns are numbered 0 to {count - 1}.")
+    return index
+
+
+def _is_number(field: str) -> bool:
+    try:
+        float(field)
+    except ValueError:
+        return False
+    return True
+
+
+def _read_csv_rows(handle, indexes: list[int], chunk_rows: int) -> np.ndarray:
+    chunks = []
+    while True:
+        lines = list(itertools.islice(handle, chunk_rows))
+        if not lines:
+            break
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)
+                chunk = np.loadtxt(
+                    lines,
+                    delimiter=",",
+                    usecols=indexes,
+                    quotechar='"',
+                    comments=None,
+                    dtype=float,
+                    ndmin=2,
+                )
+        except ValueError:
+            # Empty cells or short rows: parse this chunk row by row and skip them.
+            chunk = np.asarray(
+                [
+                    [float(row[index]) for index in indexes]
+                    for row in csv.reader(lines)
+                    if len(row) > max(indexes) and all(row[index] for index in indexes)
+                ],
+                dtype=float,
+            )
+        chunks.append(chunk.reshape(-1, len(indexes)))
+    return np.concatenate(chunks) if chunks else np.empty((0, len(indexes)), dtype=float)
+
+
+def load_signal_channels(input_path: str, columns: list[str] | None = None) -> tuple[list[str], np.ndarray]:
+    path = Path(input_path).resolve()
+    suffix = path.suffix.lower()
+
+    if suffix == ".csv":
+        return load_csv_columns(path, columns)
+
+    if suffix == ".npy":
+        values = np.load(path, mmap_mode="r", allow_pickle=False)
+        if values.dtype.names:
+            names = columns or [name for name in values.dtype.names if np.issubdtype(values.dtype[name], np.number)]
+            missing = [name for name in names if name not in values.dtype.names]
+            if missing:
+                raise ValueError(f"NPY input has no field named {missing[0]!r}.")
+            return list(names), np.column_stack([values[name] for name in names])
+        matrix = values.reshape(values.shape[0], -1) if values.ndim > 1 else values[:, np.newaxis]
+    elif suffix == ".json":
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(payload, dict):
+            names = columns or [name for name, values in payload.items() if isinstance(values, list)]
+            missing = [name for name in names if name not in payload]
+            if missing:
+                raise ValueError(f"JSON input has no field named {missing[0]!r}.")
+            return list(names), np.column_stack([np.asarray(payload[name], dtype=float) for name in names])
+        if not isinstance(payload, list):
+            raise ValueError("Unsupported JSON signal shape.")
+        matrix = np.asarray(payload, dtype=float)
+        matrix = matrix if matrix.ndim > 1 else matrix[:, np.newaxis]
+    elif suffix in RAW_SIGNAL_DTYPES:
+        matrix = np.memmap(path, dtype=RAW_SIGNAL_DTYPES[suffix], mode="r")[:, np.newaxis]
+    else:
+        matrix = np.loadtxt(path, dtype=float, ndmin=2)
+
+    # Headerless formats name their channels by column index.
+    kind = suffix.lstrip(".").upper() or "Text"
+    count = matrix.shape[1]
+    indexes = [_column_index(column, count, kind) for column in columns] if columns else list(range(count))
+    return [str(index) for index in indexes], matrix[:, indexes]
+
+
 def analyze_spectrum(values: np.ndarray, sample_rate: float, target_frequency: float = 0.67) -> dict:
     if values.size < 8:
         raise ValueError("Need at least 8 samples for spectral analysis.")
 
+    values = np.asarray(values, dtype=float)
     centered = values - np.mean(values)
     freqs = np.fft.rfftfreq(centered.size, d=1.0 / sample_rate)
     spectrum = np.abs(np.fft.rfft(centered))
@@ -81,16 +270,34 @@ def analyze_spectrum(values: np.ndarray, sample_rate: float, target_frequency: f
         raise ValueError("Spectrum is too small to analyze.")
 
     spectrum[0] = 0.0
+    return summarize_spectrum(freqs, spectrum, int(values.size), target_frequency)
+
+
+def summarize_spectrum(freqs: np.ndarray, spectrum: np.ndarray, sample_count: int, target_frequency: float) -> dict:
     dominant_index = int(np.argmax(spectrum))
-    dominant_frequency = float(freqs[dominant_index])
-    dominant_amplitude = float(spectrum[dominant_index])
     noise_floor = float(np.median(spectrum[1:])) if spectrum.size > 1 else 0.0
+    return _spectral_summary(
+        sample_count,
+        float(freqs[dominant_index]),
+        float(spectrum[dominant_index]),
+        noise_floor,
+        target_frequency,
+    )
+
+
+def _spectral_summary(
+    sample_count: int,
+    dominant_frequency: float,
+    dominant_amplitude: float,
+    noise_floor: float,
+    target_frequency: float,
+) -> dict:
     snr_ratio = dominant_amplitude / max(noise_floor, 1e-9)
     frequency_error = abs(dominant_frequency - target_frequency)
     target_alignment = max(0.0, 1.0 - (frequency_error / max(target_frequency, 1e-9)))
 
     return {
-        "sample_count": int(values.size),
+        "sample_count": sample_count,
         "dominant_frequency_hz": dominant_frequency,
         "dominant_amplitude": dominant_amplitude,
         "noise_floor": noise_floor,
@@ -101,50 +308,444 @@ def analyze_spectrum(values: np.ndarray, sample_rate: float, target_frequency: f
     }
 
 
+def _block_dft(blocks: np.ndarray, sample_rate: float, freqs: np.ndarray) -> np.ndarray:
+    # Per-block DFT terms at each frequency, phased to the start of the series,
+    # so summing any run of consecutive blocks gives that run's coherent DFT.
+    block_size = blocks.shape[1]
+    phasors = np.empty((block_size, freqs.size), dtype=complex)
+    phasors[0] = 1.0
+    phasors[1:] = np.exp(-2j * np.pi * freqs / sample_rate)
+    np.cumprod(phasors, axis=0, out=phasors)
+    inner = blocks @ phasors.real + 1j * (blocks @ phasors.imag)
+    offsets = np.arange(blocks.shape[0]) * block_size
+    return inner * np.exp(-2j * np.pi * np.outer(offsets, freqs) / sample_rate)
+
+
+def analyze_target_band(
+    values: np.ndarray,
+    sample_rate: float,
+    target_frequency: float = 0.67,
+    band_hz: float | None = None,
+) -> dict:
+    if values.size < 8:
+        raise ValueError("Need at least 8 samples for spectral analysis.")
+
+    centered = np.asarray(values, dtype=float)
+    centered = centered - centered.mean()
+    sample_count = int(centered.size)
+    block_size = min(ZOOM_BLOCK, sample_count)
+    block_count = -(-sample_count // block_size)
+    blocks = np.zeros(block_count * block_size)
+    blocks[:sample_count] = centered
+    blocks = blocks.reshape(block_count, block_size)
+
+    bin_width = sample_rate / sample_count
+    band_hz = band_hz if band_hz else DEFAULT_BAND_FRACTION * target_frequency
+    low = max(0.0, target_frequency - band_hz)
+    high = min(sample_rate / 2.0, target_frequency + band_hz)
+    if low >= high:
+        raise ValueError("Target band lies outside the analyzable frequency range.")
+    band = [round(low, 6), round(high, 6)]
+
+    # Coarse stages average power over groups of blocks (a Welch estimate), so
+    # their wide main lobes cannot fall between grid points. Each stage keeps
+    # one resolution cell either side of its peak and lengthens the groups.
+    group = max(1, int(sample_rate * ZOOM_COARSE_POINTS / (2.0 * (high - low) * block_size)))
+    stages = 0
+    while group < block_count:
+        resolution = sample_rate / (group * block_size)
+        freqs = np.arange(low, high + resolution / 4.0, resolution / 2.0)
+        group_count = block_count // group
+        picks = np.linspace(0, group_count - 1, min(group_count, ZOOM_MAX_GROUPS)).astype(int)
+        rows = (picks[:, np.newaxis] * group + np.arange(group)).ravel()
+        terms = _block_dft(blocks[rows], sample_rate, freqs).reshape(picks.size, group, freqs.size)
+        power = np.mean(np.abs(terms.sum(axis=1)) ** 2, axis=0)
+        peak = float(freqs[np.argmax(power)])
+        low, high = max(0.0, peak - resolution), min(sample_rate / 2.0, peak + resolution)
+        group *= ZOOM_STEP
+        stages += 1
+
+    # The final stage is coherent over the whole series on a sub-bin grid.
+    resolution = bin_width / ZOOM_FACTOR
+    freqs = np.arange(low, high + resolution / 2.0, resolution)
+    spectrum = np.abs(_block_dft(blocks, sample_rate, freqs).sum(axis=0))
+    dominant_index = int(np.argmax(spectrum))
+
+    # Noise floor: median bin magnitude over a sample of whole blocks, scaled
+    # to the full-length transform (noise magnitude grows with sqrt(length)).
+    full_blocks = sample_count // block_size
+    sampled = np.linspace(0, full_blocks - 1, min(full_blocks, NOISE_SAMPLE_BLOCKS)).astype(int)
+    block_spectra = np.abs(np.fft.rfft(blocks[sampled] - blocks[sampled].mean(axis=1, keepdims=True), axis=1))
+    noise_floor = float(np.median(block_spectra[:, 1:])) * np.sqrt(sample_count / block_size)
+
+    analysis = _spectral_summary(
+        sample_count,
+        float(freqs[dominant_index]),
+        float(spectrum[dominant_index]),
+        noise_floor,
+        target_frequency,
+    )
+    analysis["zoom"] = {
+        "method": "block_dft_zoom",
+        "band_hz": band,
+        "frequency_resolution_hz": float(resolution),
+        "refinement_stages": stages + 1,
+        "noise_floor_method": "sampled_blocks",
+        "noise_blocks_sampled": int(sampled.size),
+    }
+    return analysis
+
+
+def analyze_channels(
+    matrix: np.ndarray,
+    sample_rate: float,
+    target_frequency: float = 0.67,
+    names: list[str] | None = None,
+) -> dict:
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim != 2:
+        raise ValueError("Multi-channel input must be a (samples, channels) array.")
+    if matrix.shape[0] < 8:
+        raise ValueError("Need at least 8 samples for spectral analysis.")
+    names = names or [str(index) for index in range(matrix.shape[1])]
+
+    # One batched transform along the time axis covers every channel.
+    centered = matrix - matrix.mean(axis=0)
+    freqs = np.fft.rfftfreq(matrix.shape[0], d=1.0 / sample_rate)
+    spectra = np.abs(np.fft.rfft(centered, axis=0))
+    spectra[0] = 0.0
+
+    dominant = np.argmax(spectra, axis=0)
+    amplitudes = spectra[dominant, np.arange(matrix.shape[1])]
+    noise_floors = np.median(spectra[1:], axis=0)
+    snr = amplitudes / np.maximum(noise_floors, 1e-9)
+    errors = np.abs(freqs[dominant] - target_frequency)
+    alignment = np.maximum(0.0, 1.0 - errors / max(target_frequency, 1e-9))
+
+    channels = [
+        {
+            "channel": name,
+            "sample_count": int(matrix.shape[0]),
+            "dominant_frequency_hz": float(freqs[index]),
+            "dominant_amplitude": float(amplitude),
+            "noise_floor": float(noise_floor),
+            "snr_ratio": round(float(channel_snr), 3),
+            "target_frequency_hz": target_frequency,
+            "frequency_error_hz": round(float(error), 6),
+            "target_alignment_score": round(float(channel_alignment), 3),
+        }
+        for name, index, amplitude, noise_floor, channel_snr, error, channel_alignment in zip(
+            names, dominant, amplitudes, noise_floors, snr, errors, alignment
+        )
+    ]
+    strongest = int(np.argmax(snr))
+    return {
+        "channels": channels,
+        "aggregate": {
+            "channel_count": len(channels),
+            "sample_count": int(matrix.shape[0]),
+            "target_frequency_hz": target_frequency,
+            "mean_target_alignment_score": round(float(np.mean(alignment)), 3),
+            "median_snr_ratio": round(float(np.median(snr)), 3),
+            "dominant_frequency_std_hz": round(float(np.std(freqs[dominant])), 6),
+            "strongest_channel": names[strongest],
+            "strongest_snr_ratio": round(float(snr[strongest]), 3),
+        },
+    }
+
+
+def analyze_windowed_spectrum(
+    values: np.ndarray,
+    sample_rate: float,
+    target_frequency: float = 0.67,
+    window_seconds: float = 30.0,
+    overlap: float = DEFAULT_WINDOW_OVERLAP,
+    spectrogram_path: str | None = None,
+) -> dict:
+    window_size = int(round(window_seconds * sample_rate))
+    if window_size < 8:
+        raise ValueError("Need at least 8 samples per window for spectral analysis.")
+    if not 0.0 <= overlap < 1.0:
+        raise ValueError("Window overlap must be in [0, 1).")
+    if values.size < window_size:
+        raise ValueError("Series is shorter than one analysis window.")
+
+    step = max(1, int(round(window_size * (1.0 - overlap))))
+    starts = np.arange(0, values.size - window_size + 1, step)
+    taper = np.hanning(window_size)
+    freqs = np.fft.rfftfreq(window_size, d=1.0 / sample_rate)
+    power_sum = np.zeros(freqs.size)
+    window_frequencies = np.empty(starts.size)
+    window_snr = np.empty(starts.size)
+    window_alignment = np.empty(starts.size)
+    # The spectrogram is a windows x frequencies power matrix written to .npy a
+    # block at a time, so it can be far larger than memory.
+    spectrogram = None
+    if spectrogram_path:
+        spectrogram = np.lib.format.open_memmap(
+            spectrogram_path, mode="w+", dtype=np.float32, shape=(starts.size, freqs.size)
+        )
+
+    # Windows are transformed a block at a time so memory stays bounded by
+    # WINDOW_BLOCK * window_size regardless of the series length.
+    for block_start in range(0, starts.size, WINDOW_BLOCK):
+        block = starts[block_start:block_start + WINDOW_BLOCK]
+        rows = slice(block_start, block_start + block.size)
+        segments = np.stack([np.asarray(values[start:start + window_size], dtype=float) for start in block])
+        segments -= segments.mean(axis=1, keepdims=True)
+        spectra = np.abs(np.fft.rfft(segments * taper, axis=1))
+        spectra[:, 0] = 0.0
+        power = np.square(spectra)
+        power_sum += power.sum(axis=0)
+        if spectrogram is not None:
+            spectrogram[rows] = power
+
+        dominant = np.argmax(spectra, axis=1)
+        amplitudes = spectra[np.arange(block.size), dominant]
+        noise_floors = np.median(spectra[:, 1:], axis=1)
+        window_frequencies[rows] = freqs[dominant]
+        window_snr[rows] = amplitudes / np.maximum(noise_floors, 1e-9)
+        window_alignment[rows] = np.maximum(
+            0.0, 1.0 - np.abs(freqs[dominant] - target_frequency) / max(target_frequency, 1e-9)
+        )
+    if spectrogram is not None:
+        spectrogram.flush()
+        del spectrogram
+
+    stride = -(-starts.size // MAX_INLINE_WINDOWS)
+    windows = [
+        {
+            "start_seconds": round(float(starts[index] / sample_rate), 3),
+            "dominant_frequency_hz": float(window_frequencies[index]),
+            "snr_ratio": round(float(window_snr[index]), 3),
+            "target_alignment_score": round(float(window_alignment[index]), 3),
+        }
+        for index in range(0, starts.size, stride)
+    ]
+    # Summaries are taken over the rounded per-window values, rounded the way
+    # the window entries are; imported here so unwindowed reports don't load the text scorers.
+    from cohort_scoring import round_like_python
+
+    psd_amplitude = np.sqrt(power_sum / starts.size)
+    analysis = summarize_spectrum(freqs, psd_amplitude, int(values.size), target_frequency)
+    analysis["windowed"] = {
+        "method": "welch",
+        "window_seconds": window_seconds,
+        "window_samples": window_size,
+        "overlap": overlap,
+        "window_count": int(starts.size),
+        "frequency_resolution_hz": float(sample_rate / window_size),
+        "mean_target_alignment_score": round(float(np.mean(round_like_python(window_alignment))), 3),
+        "median_snr_ratio": round(float(np.median(round_like_python(window_snr))), 3),
+        "dominant_frequency_std_hz": round(float(np.std(window_frequencies)), 6),
+        # Every stride-th window; 1 means all of them are listed.
+        "window_stride": stride,
+        "windows": windows,
+    }
+    if spectrogram_path:
+        analysis["windowed"]["spectrogram"] = {
+            "path": str(Path(spectrogram_path).resolve()),
+            "shape": [int(starts.size), int(freqs.size)],
+            "dtype": "float32",
+            "step_seconds": step / sample_rate,
+            "frequency_resolution_hz": float(sample_rate / window_size),
+        }
+    return analysis
+
+
+@functools.lru_cache(maxsize=32)
+def _reference_analysis(
+    sample_rate: float,
+    duration_seconds: float,
+    base_frequency: float,
+    noise_level: float,
+    target_frequency: float,
+) -> dict:
+    values = generate_reference_series(sample_rate, duration_seconds, base_frequency, noise_level)
+    return analyze_spectrum(values, sample_rate=sample_rate, target_frequency=target_frequency)
+
+
+def reference_spectrum(
+    sample_rate: float,
+    target_frequency: float = 0.67,
+    duration_seconds: float = REFERENCE_DURATION_SECONDS,
+    noise_level: float = REFERENCE_NOISE_LEVEL,
+) -> dict:
+    # The reference waveform is seeded, so its spectrum only depends on these parameters.
+    return dict(_reference_analysis(sample_rate, duration_seconds, target_frequency, noise_level, target_frequency))
+
+
 def build_spectral_report(
     input_path: str | None = None,
     column: str | None = None,
     sample_rate: float = 50.0,
     target_frequency: float = 0.67,
+    cache: ReportCache | None = None,
+    window_seconds: float | None = None,
+    overlap: float = DEFAULT_WINDOW_OVERLAP,
+    zoom: bool = False,
+    band_hz: float | None = None,
+    timer: StageTimer | None = None,
+    spectrogram_path: str | None = None,
 ) -> dict:
+    if zoom and window_seconds:
+        raise ValueError("Target-band zoom cannot be combined with windowed analysis.")
+    if spectrogram_path and not window_seconds:
+        raise ValueError("A spectrogram needs windowed analysis.")
+
+    key = None
+    # A cached report would leave the spectrogram file unwritten.
+    if cache is not None and not spectrogram_path:
+        if input_path:
+            content = file_digest(input_path)
+        else:
+            content = ("reference", REFERENCE_DURATION_SECONDS, REFERENCE_NOISE_LEVEL)
+        windowing = (window_seconds, overlap) if window_seconds else None
+        zooming = ("zoom", band_hz) if zoom else None
+        key = cache_key(
+            "spectral", SCORING_VERSION, content, column, sample_rate, target_frequency, windowing, zooming
+        )
+        with stage(timer, "cache_lookup"):
+            cached = cache.get(key)
+        if cached is not None:
+            if input_path:
+                cached["signal_origin"]["source_path"] = str(Path(input_path).resolve())
+            return cached
+
+    values = None
+    if input_path:
+        with stage(timer, "signal_load"):
+            values = load_numeric_series(input_path, column=column)
+    elif window_seconds or zoom:
+        with stage(timer, "signal_load"):
+            values = generate_reference_series(sample_rate=sample_rate, base_frequency=target_frequency)
+
+    with stage(timer, "spectral_analysis"):
+        if window_seconds:
+            analysis = analyze_windowed_spectrum(
+                values,
+                sample_rate=sample_rate,
+                target_frequency=target_frequency,
+                window_seconds=window_seconds,
+                overlap=overlap,
+                spectrogram_path=spectrogram_path,
+            )
+        elif zoom:
+            analysis = analyze_target_band(
+                values,
+                sample_rate=sample_rate,
+                target_frequency=target_frequency,
+                band_hz=band_hz,
+            )
+        elif values is not None:
+            analysis = analyze_spectrum(values, sample_rate=sample_rate, target_frequency=target_frequency)
+        else:
+            analysis = reference_spectrum(sample_rate, target_frequency)
+
     if input_path:
-        values = load_numeric_series(input_path, column=column)
         signal_origin = {
             "mode": "observed_series",
             "source_path": str(Path(input_path).resolve()),
             "note": "User-supplied data. Interpretation depends on upstream capture quality.",
         }
     else:
-        values = generate_reference_series(sample_rate=sample_rate, base_frequency=target_frequency)
         signal_origin = {
             "mode": "reference_model",
             "source_path": "generated_in_memory",
             "note": "Reference waveform used to validate the analysis pipeline, not to prove external phenomena.",
         }
 
-    analysis = analyze_spectrum(values, sample_rate=sample_rate, target_frequency=target_frequency)
     analysis["signal_origin"] = signal_origin
     analysis["notes"] = [
         "A detected frequency in reference mode validates the pipeline only.",
         "Observed-series mode is where this module becomes useful for downstream measurement layers.",
     ]
+    if key is not None:
+        cache.put(key, analysis)
     return analysis
 
 
+def build_multichannel_report(
+    input_path: str,
+    columns: list[str] | None = None,
+    sample_rate: float = 50.0,
+    target_frequency: float = 0.67,
+) -> dict:
+    names, matrix = load_signal_channels(input_path, columns)
+    report = analyze_channels(matrix, sample_rate=sample_rate, target_frequency=target_frequency, names=names)
+    report["signal_origin"] = {
+        "mode": "observed_channels",
+        "source_path": str(Path(input_path).resolve()),
+        "note": "User-supplied data. Interpretation depends on upstream capture quality.",
+    }
+    return report
+
+
 def main() -> dict:
     parser = argparse.ArgumentParser(description="Run spectral analysis on a reference or observed signal.")
-    parser.add_argument("--input", help="Optional path to a txt/csv/json numeric series.")
-    parser.add_argument("--column", help="Named CSV or JSON column.")
+    parser.add_argument(
+        "--input",
+        help="Optional path to a txt/csv/json/npy numeric series, or raw little-endian .f32/.f64/.bin/.raw samples.",
+    )
+    parser.add_argument("--column", help="Named CSV/JSON/NPY field, or column index for 2-D NPY arrays.")
     parser.add_argument("--sample-rate", type=float, default=50.0, help="Sample rate in Hz.")
     parser.add_argument("--target-frequency", type=float, default=0.67, help="Reference target frequency.")
+    add_window_arguments(parser)
+    parser.add_argument(
+        "--channels",
+        nargs="*",
+        help="Analyze several columns in one batched FFT. With no names, every numeric column is a channel.",
+    )
+    add_zoom_arguments(parser)
+    parser.add_argument(
+        "--spectrogram",
+        help="With --window-seconds, also write the windows x frequencies power matrix to this .npy file.",
+    )
     parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
     args = parser.parse_args()
 
+    if args.channels is not None:
+        if not args.input:
+            parser.error("--channels requires --input.")
+        if args.window_seconds or args.zoom:
+            parser.error("--channels cannot be combined with --window-seconds or --zoom.")
+        report = build_multichannel_report(
+            input_path=args.input,
+            columns=args.channels,
+            sample_rate=args.sample_rate,
+            target_frequency=args.target_frequency,
+        )
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            aggregate = report["aggregate"]
+            print("Quantum State Proof")
+            print("=" * 60)
+            print(f"Channels: {aggregate['channel_count']}")
+            for channel in report["channels"]:
+                print(
+                    f"  {channel['channel']}: peak {channel['dominant_frequency_hz']:.4f} Hz, "
+                    f"SNR {channel['snr_ratio']:.3f}, alignment {channel['target_alignment_score']:.3f}"
+                )
+            print(f"Mean target alignment: {aggregate['mean_target_alignment_score']:.3f}")
+            print(f"Median SNR: {aggregate['median_snr_ratio']:.3f}")
+            print(f"Strongest channel: {aggregate['strongest_channel']}")
+        return report
+
+    if args.zoom and args.window_seconds:
+        parser.error("--zoom cannot be combined with --window-seconds.")
+    if args.spectrogram and not args.window_seconds:
+        parser.error("--spectrogram requires --window-seconds.")
     report = build_spectral_report(
         input_path=args.input,
         column=args.column,
         sample_rate=args.sample_rate,
         target_frequency=args.target_frequency,
+        window_seconds=args.window_seconds,
+        overlap=args.overlap,
+        zoom=args.zoom,
+        band_hz=args.band_hz,
+        spectrogram_path=args.spectrogram,
     )
 
     if args.json:
@@ -156,6 +757,17 @@ def main() -> dict:
         print(f"Peak frequency: {report['dominant_frequency_hz']:.4f} Hz")
         print(f"SNR ratio: {report['snr_ratio']:.3f}")
         print(f"Target alignment: {report['target_alignment_score']:.3f}")
+        if "windowed" in report:
+            windowed = report["windowed"]
+            print(f"Windows: {windowed['window_count']} x {windowed['window_seconds']} s")
+            print(f"Mean window alignment: {windowed['mean_target_alignment_score']:.3f}")
+            print(f"Median window SNR: {windowed['median_snr_ratio']:.3f}")
+            if "spectrogram" in windowed:
+                print(f"Spectrogram: {windowed['spectrogram']['path']}")
+        if "zoom" in report:
+            band = report["zoom"]["band_hz"]
+            print(f"Zoom band: {band[0]:.4f}-{band[1]:.4f} Hz")
+            print(f"Frequency resolution: {report['zoom']['frequency_resolution_hz']:.6g} Hz")
     return report
 
 
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+On-disk cache for component reports.
+
+Reports are stored in a small SQLite file keyed by a hash of the input
+content plus everything that changes the result: the report kind, the
+module's scoring version, the marker lexicon, and (for spectral reports) the
+sample rate, target frequency, and column. The file is bounded in size and
+evicts least-recently-used entries first. SQLite keeps concurrent writers
+from batch worker processes safe.
+
+The total payload size lives in a one-row table kept current by triggers, so
+eviction checks never scan the reports. Hits only refresh ``last_used`` in
+batches of ``TOUCH_BATCH``, on the next ``put``, or on ``close``, so a run of
+cache hits does not commit once per report.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+
+CACHE_FILENAME = "report_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+TOUCH_BATCH = 64
+_OPEN_CACHES: dict[tuple[str, int], ReportCache] = {}
+
+
+def cache_key(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, default=str).encode("utf-8")).hexdigest()
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def text_chunks_digest(chunks: Iterable[str]) -> str:
+    # Equal to text_digest of the joined chunks.
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """Size-bounded LRU store of report dicts."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        root = Path(directory).resolve()
+        root.mkdir(parents=True, exist_ok=True)
+        self.path = str(root / CACHE_FILENAME)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        import sqlite3
+
+        # Last-used times of hits not yet written, by key.
+        self._touched: dict[str, float] = {}
+
+        self._db = sqlite3.connect(self.path, timeout=30.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            # Immediate, so two processes opening a cache from before cache_size existed seed it once.
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS reports ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS reports_last_used ON reports (last_used)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY, total INTEGER NOT NULL)")
+            self._db.execute(
+                "INSERT OR IGNORE INTO cache_size (id, total) SELECT 0, COALESCE(SUM(size), 0) FROM reports"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS reports_added AFTER INSERT ON reports BEGIN "
+                "UPDATE cache_size SET total = total + NEW.size; END"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS reports_resized AFTER UPDATE OF size ON reports BEGIN "
+                "UPDATE cache_size SET total = total + NEW.size - OLD.size; END"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS reports_removed AFTER DELETE ON reports BEGIN "
+                "UPDATE cache_size SET total = total - OLD.size; END"
+            )
+
+    def get(self, key: str) -> dict | None:
+        row = self._db.execute("SELECT payload FROM reports WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_BATCH:
+            with self._db:
+                self._write_touched()
+        return json.loads(row[0])
+
+    def put(self, key: str, report: dict) -> None:
+        payload = json.dumps(report, separators=(",", ":"))
+        with self._db:
+            # An upsert rather than INSERT OR REPLACE: a replace deletes without
+            # firing the delete trigger, which would leave cache_size too large.
+            self._db.execute(
+                "INSERT INTO reports (key, payload, size, last_used) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET payload = excluded.payload, size = excluded.size, "
+                "last_used = excluded.last_used",
+                (key, payload, len(payload), time.time()),
+            )
+            self._write_touched()
+            self._evict()
+
+    def _write_touched(self) -> None:
+        # Called inside a transaction.
+        if self._touched:
+            self._db.executemany(
+                "UPDATE reports SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT total FROM cache_size").fetchone()[0]
+        while total > self.max_bytes:
+            rows = self._db.execute("SELECT key, size FROM reports ORDER BY last_used LIMIT 64").fetchall()
+            if not rows:
+                return
+            for key, size in rows:
+                self._db.execute("DELETE FROM reports WHERE key = ?", (key,))
+                self.evictions += 1
+                total -= size
+                if total <= self.max_bytes:
+                    return
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def flush(self) -> None:
+        with self._db:
+            self._write_touched()
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+
+def _flush_open_caches() -> None:
+    for cache in _OPEN_CACHES.values():
+        cache.flush()
+
+
+def open_cache(directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> ReportCache:
+    # Caches opened here stay open for the process; pending last-used times
+    # are written at exit. Pool workers exit without atexit handlers, so they
+    # can lose at most TOUCH_BATCH - 1 recency updates.
+    key = (str(Path(directory).resolve()), max_bytes)
+    if key not in _OPEN_CACHES:
+        if not _OPEN_CACHES:
+            atexit.register(_flush_open_caches)
+        _OPEN_CACHES[key] = ReportCache(directory, max_bytes)
+    return _OPEN_CACHES[key]
+
+
+def stats_delta(before: dict, after: dict) -> dict:
+    return {name: after[name] - before[name] for name in after}
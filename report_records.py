@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Compact probe snapshot records and their serialization.
+
+A snapshot from ``build_analysis_snapshot`` carries the full interface and
+temporal reports, notes included. The probe diffs only a dozen numbers
+between snapshots. ``SnapshotRecord`` keeps just those numbers in a named
+tuple and rebuilds the transition profile and the emitted JSON payload on
+demand. Records serialize three ways:
+
+- the usual JSON payload;
+- one minified JSONL line without the constant text (interpretations and
+  notes);
+- a fixed-layout binary record of 112 bytes plus the source path and the
+  lexicon version, led by the layout version.
+
+Every form carries the lexicon version and digest, so snapshots scored with
+different lexicons (after a hot reload) can be told apart, and
+``state_delta`` never diffs across lexicons.
+
+``--decode`` turns a binary stream back into JSONL.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import sys
+from collections.abc import Iterator
+from typing import BinaryIO, NamedTuple
+
+from consciousness_interface import SCORE_SCALES
+from transition_metrics import PROFILE_CLASSES, PROFILE_NOTES
+
+
+SCORE_NAMES = list(SCORE_SCALES)
+SHIFT_LABELS = ["baseline", "stable", "state_shift", "major_state_shift"]
+# build_state_delta's fields, thresholds, and labels.
+DELTA_CATEGORIES = ["meta_cognition", "planning", "boundary_awareness", "tool_orchestration", "value_commitment"]
+SHIFT_CATEGORIES = ["meta_cognition", "planning", "value_commitment"]
+SHIFT_OVERALL_DELTA = 0.12
+SHIFT_CATEGORY_DELTA = 0.15
+MAJOR_SHIFT_OVERALL_DELTA = 0.25
+
+OUTPUT_FORMATS = ("text", "json", "compact", "binary")
+# Record layout version, source length, snapshot index, characters, words,
+# category scores, interface, recursive, temporal, and overall scores,
+# classification and shift label indexes, overall delta, reaction latency (NaN
+# when not measured), lexicon version length, and the raw lexicon digest (zeros
+# when unknown). Scores hold three decimals, so float32 round-trips them
+# exactly after rounding. Bump BINARY_VERSION whenever the layout changes.
+BINARY_VERSION = 2
+BINARY_RECORD = struct.Struct(f"<HHIQQ{len(SCORE_NAMES)}f4fBBfdH32s")
+_CLASS_INDEX = {label: index for index, (_, label, _) in enumerate(PROFILE_CLASSES)}
+_SHIFT_INDEX = {label: index for index, label in enumerate(SHIFT_LABELS)}
+
+
+class SnapshotRecord(NamedTuple):
+    """The scores of one probe snapshot, without the report text."""
+
+    source: str
+    snapshot_index: int
+    character_count: int
+    word_count: int
+    scores: tuple[float, ...]
+    interface_score: float
+    recursive_marker_score: float
+    temporal_coherence_score: float
+    overall_score: float
+    classification: str
+    reaction_latency_ms: float | None = None
+    lexicon_version: str | None = None
+    lexicon_digest: str | None = None
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> SnapshotRecord:
+        interface_report = snapshot["interface_report"]
+        profile = snapshot["transition_profile"]
+        lexicon = snapshot.get("lexicon") or {}
+        return cls(
+            source=interface_report["source"],
+            # Full reports and other snapshot-like dicts have no index or character count.
+            snapshot_index=snapshot.get("snapshot_index", 0),
+            character_count=snapshot.get("character_count", 0),
+            word_count=interface_report["word_count"],
+            scores=tuple(interface_report["scores"][name] for name in SCORE_NAMES),
+            interface_score=profile["interface_score"],
+            recursive_marker_score=profile["recursive_marker_score"],
+            temporal_coherence_score=snapshot["temporal_report"]["temporal_coherence_score"],
+            overall_score=profile["overall_score"],
+            classification=profile["classification"],
+            reaction_latency_ms=snapshot.get("reaction_latency_ms"),
+            lexicon_version=lexicon.get("version", interface_report.get("lexicon_version")),
+            lexicon_digest=lexicon.get("digest"),
+        )
+
+    def lexicon(self) -> dict:
+        return {"version": self.lexicon_version, "digest": self.lexicon_digest}
+
+    def interface_scores(self) -> dict:
+        return dict(zip(SCORE_NAMES, self.scores))
+
+    def transition_profile(self) -> dict:
+        # Same dict as build_transition_profile without a spectral report.
+        interpretation = next(meaning for _, label, meaning in PROFILE_CLASSES if label == self.classification)
+        return {
+            "interface_score": self.interface_score,
+            "recursive_marker_score": self.recursive_marker_score,
+            "temporal_integration_score": self.temporal_coherence_score,
+            "spectral_signal_score": None,
+            "overall_score": self.overall_score,
+            "classification": self.classification,
+            "interpretation": interpretation,
+            "notes": list(PROFILE_NOTES),
+        }
+
+
+def state_delta(previous: SnapshotRecord | None, current: SnapshotRecord) -> dict:
+    # Scores from different lexicons are not comparable, so a lexicon change starts a new baseline.
+    if previous is None or previous.lexicon_digest != current.lexicon_digest:
+        return {
+            "state_shift_detected": False,
+            "shift_label": "baseline",
+            "overall_delta": 0.0,
+            "signal_deltas": {},
+        }
+
+    previous_scores = previous.interface_scores()
+    current_scores = current.interface_scores()
+    deltas = {"overall_score": round(current.overall_score - previous.overall_score, 3)}
+    for name in DELTA_CATEGORIES:
+        deltas[name] = round(current_scores[name] - previous_scores[name], 3)
+    deltas["temporal_coherence"] = round(current.temporal_coherence_score - previous.temporal_coherence_score, 3)
+
+    overall_delta = deltas["overall_score"]
+    state_shift = overall_delta >= SHIFT_OVERALL_DELTA or any(
+        deltas[name] >= SHIFT_CATEGORY_DELTA for name in SHIFT_CATEGORIES
+    )
+
+    if not state_shift:
+        shift_label = "stable"
+    elif overall_delta >= MAJOR_SHIFT_OVERALL_DELTA:
+        shift_label = "major_state_shift"
+    else:
+        shift_label = "state_shift"
+
+    return {
+        "state_shift_detected": state_shift,
+        "shift_label": shift_label,
+        "overall_delta": overall_delta,
+        "signal_deltas": deltas,
+    }
+
+
+def snapshot_payload(current: SnapshotRecord, delta: dict, stream: bool = False, latency: bool = False) -> dict:
+    payload = {"source": current.source} if stream else {}
+    payload.update({
+        "snapshot_index": current.snapshot_index,
+        "character_count": current.character_count,
+        "lexicon": current.lexicon(),
+        "transition_profile": current.transition_profile(),
+        "state_delta": delta,
+    })
+    if latency:
+        payload["reaction_latency_ms"] = current.reaction_latency_ms
+    return payload
+
+
+def compact_payload(current: SnapshotRecord, delta: dict) -> dict:
+    return {
+        "source": current.source,
+        "snapshot_index": current.snapshot_index,
+        "character_count": current.character_count,
+        "word_count": current.word_count,
+        "scores": list(current.scores),
+        "interface_score": current.interface_score,
+        "recursive_marker_score": current.recursive_marker_score,
+        "temporal_coherence_score": current.temporal_coherence_score,
+        "overall_score": current.overall_score,
+        "classification": current.classification,
+        "shift_label": delta["shift_label"],
+        "overall_delta": delta["overall_delta"],
+        "reaction_latency_ms": current.reaction_latency_ms,
+        "lexicon_version": current.lexicon_version,
+        "lexicon_digest": current.lexicon_digest,
+    }
+
+
+def compact_line(current: SnapshotRecord, delta: dict) -> str:
+    return json.dumps(compact_payload(current, delta), separators=(",", ":"))
+
+
+def pack_record(current: SnapshotRecord, delta: dict) -> bytes:
+    source = current.source.encode("utf-8")
+    version = (current.lexicon_version or "").encode("utf-8")
+    latency = current.reaction_latency_ms
+    return BINARY_RECORD.pack(
+        BINARY_VERSION,
+        len(source),
+        current.snapshot_index,
+        current.character_count,
+        current.word_count,
+        *current.scores,
+        current.interface_score,
+        current.recursive_marker_score,
+        current.temporal_coherence_score,
+        current.overall_score,
+        _CLASS_INDEX[current.classification],
+        _SHIFT_INDEX[delta["shift_label"]],
+        delta["overall_delta"],
+        float("nan") if latency is None else latency,
+        len(version),
+        bytes.fromhex(current.lexicon_digest) if current.lexicon_digest else bytes(32),
+    ) + source + version
+
+
+def iter_binary_records(handle: BinaryIO) -> Iterator[dict]:
+    # Yields compact_payload dicts back from a stream of pack_record output.
+    score_count = len(SCORE_NAMES)
+    while header := handle.read(BINARY_RECORD.size):
+        if len(header) < BINARY_RECORD.size:
+            raise ValueError("Binary record stream ends inside a record header.")
+        fields = BINARY_RECORD.unpack(header)
+        layout, source_length, snapshot_index, character_count, word_count = fields[:5]
+        if layout != BINARY_VERSION:
+            raise ValueError(f"Binary record layout {layout} is not supported; expected {BINARY_VERSION}.")
+        scores = [round(value, 3) for value in fields[5:5 + score_count]]
+        interface, recursive, temporal, overall = (round(value, 3) for value in fields[5 + score_count:9 + score_count])
+        class_index, shift_index, overall_delta, latency, version_length, digest = fields[9 + score_count:]
+        source = handle.read(source_length)
+        version = handle.read(version_length)
+        if len(source) < source_length or len(version) < version_length:
+            raise ValueError("Binary record stream ends inside a source path or lexicon version.")
+        yield {
+            "source": source.decode("utf-8"),
+            "snapshot_index": snapshot_index,
+            "character_count": character_count,
+            "word_count": word_count,
+            "scores": scores,
+            "interface_score": interface,
+            "recursive_marker_score": recursive,
+            "temporal_coherence_score": temporal,
+            "overall_score": overall,
+            "classification": PROFILE_CLASSES[class_index][1],
+            "shift_label": SHIFT_LABELS[shift_index],
+            "overall_delta": round(overall_delta, 3),
+            "reaction_latency_ms": None if latency != latency else latency,
+            "lexicon_version": version.decode("utf-8") or None,
+            "lexicon_digest": digest.hex() if any(digest) else None,
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Decode binary probe records to compact JSONL.")
+    parser.add_argument("--decode", required=True, help="Binary record file written by --format binary ('-' for stdin).")
+    args = parser.parse_args()
+
+    handle = sys.stdin.buffer if args.decode == "-" else open(args.decode, "rb")
+    with handle:
+        for record in iter_binary_records(handle):
+            print(json.dumps(record, separators=(",", ":")))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
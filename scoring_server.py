@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Resident scoring server.
+
+Every CLI invocation pays interpreter start-up, numpy import, and marker
+compilation before it scores anything. This server pays those once and then
+answers report requests over HTTP/1.1 on a Unix socket or a localhost port:
+
+    POST /interface   {"text": "...", "source": "..."} or {"text_input": "path"}
+    POST /temporal    same body as /interface
+    POST /spectral    build_spectral_report keyword arguments (see REQUEST_FIELDS)
+    POST /full        build_full_report keyword arguments (see REQUEST_FIELDS)
+    GET  /health
+
+Each endpoint accepts only the keys in ``REQUEST_FIELDS``, with their types;
+anything else is a 400. Output paths, the cache, and the lexicon are server
+settings, never request fields. File inputs are refused unless the server was
+started with ``--data-root``, and are then resolved under that directory.
+
+Scoring runs in a pool of worker processes that keep their compiled engines
+and report cache warm. ``--lexicon`` sets the lexicon file; workers re-read it
+per request, so edits apply without a restart. Once ``--max-pending`` requests
+are in flight, new ones are refused with 503 as soon as their headers arrive,
+before the body is read. Bodies larger than ``--max-request-bytes`` are
+refused with 413, and a connection that sends nothing for ``--read-timeout``
+seconds while headers or a body are expected is closed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from pathlib import Path
+
+from lexicon import resolve_lexicon
+from proof_layer_activation import build_full_report
+from quantum_state_proof import build_spectral_report
+from report_cache import DEFAULT_MAX_BYTES, open_cache
+from text_analysis import build_file_reports, build_text_reports
+
+
+DEFAULT_PORT = 8767
+DEFAULT_MAX_REQUEST_BYTES = 8 * 1024 * 1024
+DEFAULT_READ_TIMEOUT = 10.0
+MAX_HEADER_BYTES = 16 * 1024
+ENDPOINTS = {"/interface": "interface", "/temporal": "temporal", "/spectral": "spectral", "/full": "full"}
+
+# Accepted request keys and their JSON types per endpoint. "path" values name
+# input files and are resolved under --data-root.
+_NUMBER = (int, float)
+_TEXT_FIELDS = {"text": str, "source": str, "text_input": "path"}
+REQUEST_FIELDS = {
+    "interface": _TEXT_FIELDS,
+    "temporal": _TEXT_FIELDS,
+    "spectral": {
+        "input_path": "path",
+        "column": (str, int),
+        "sample_rate": _NUMBER,
+        "target_frequency": _NUMBER,
+        "window_seconds": _NUMBER,
+        "overlap": _NUMBER,
+        "zoom": bool,
+        "band_hz": _NUMBER,
+    },
+    "full": {
+        "text_input": "path",
+        "signal_input": "path",
+        "signal_column": str,
+        "sample_rate": _NUMBER,
+        "window_seconds": _NUMBER,
+        "overlap": _NUMBER,
+        "zoom": bool,
+        "band_hz": _NUMBER,
+        "timings": bool,
+    },
+}
+
+_WORKER_CACHE = None
+_WORKER_LEXICON_PATH = None
+
+
+def _init_worker(cache_dir: str | None, cache_max_bytes: int, lexicon_path: str | None = None) -> None:
+    global _WORKER_CACHE, _WORKER_LEXICON_PATH
+    # Workers leave shutdown to the server, which drains the pool on SIGINT/SIGTERM.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.set_wakeup_fd(-1)
+    _WORKER_CACHE = open_cache(cache_dir, cache_max_bytes) if cache_dir else None
+    _WORKER_LEXICON_PATH = lexicon_path
+
+
+def check_request(kind: str, params: dict, data_root: Path | None) -> dict:
+    # Returns the request with input paths resolved, or raises ValueError.
+    fields = REQUEST_FIELDS[kind]
+    unknown = sorted(set(params) - set(fields))
+    if unknown:
+        raise ValueError(f"Unsupported request fields: {', '.join(unknown)}.")
+    checked = {}
+    for key, value in params.items():
+        expected = fields[key]
+        if expected == "path":
+            if not isinstance(value, str):
+                raise ValueError(f"'{key}' must be a string.")
+            if data_root is None:
+                raise ValueError(f"'{key}' is not accepted: file inputs are disabled (start with --data-root).")
+            resolved = (data_root / value).resolve()
+            if not resolved.is_relative_to(data_root):
+                raise ValueError(f"'{key}' must name a file under the data root.")
+            value = str(resolved)
+        elif value is not None:
+            # JSON true/false are Python bools, which are also ints.
+            if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+                raise ValueError(f"'{key}' has the wrong type.")
+        checked[key] = value
+    return checked
+
+
+def _text_reports(params: dict) -> tuple[dict, dict]:
+    # load_lexicon is memoized on content, so an unchanged file is not recompiled.
+    lexicon = resolve_lexicon(_WORKER_LEXICON_PATH)
+    if "text" in params:
+        source = params.get("source") or "request"
+        return build_text_reports(params["text"], source, cache=_WORKER_CACHE, lexicon=lexicon)
+    if "text_input" in params:
+        source = params["text_input"]
+        return build_file_reports(source, source, cache=_WORKER_CACHE, lexicon=lexicon)
+    raise ValueError("Request must include 'text' or 'text_input'.")
+
+
+def score_request(kind: str, params: dict) -> dict:
+    # params has already passed check_request.
+    if kind in ("interface", "temporal"):
+        interface_report, temporal_report = _text_reports(params)
+        return interface_report if kind == "interface" else temporal_report
+    if kind == "spectral":
+        return build_spectral_report(**params, cache=_WORKER_CACHE)
+    return build_full_report(**params, lexicon_path=_WORKER_LEXICON_PATH, cache=_WORKER_CACHE)
+
+
+class ScoringServer:
+    """Parses HTTP requests and hands scoring work to the process pool."""
+
+    def __init__(
+        self,
+        pool: ProcessPoolExecutor,
+        workers: int,
+        max_pending: int,
+        max_request_bytes: int,
+        data_root: str | None = None,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ) -> None:
+        self.pool = pool
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_request_bytes = max_request_bytes
+        self.data_root = Path(data_root).resolve() if data_root else None
+        self.read_timeout = read_timeout
+        self.pending = 0
+        self.served = 0
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[HTTPStatus, dict]:
+        if path == "/health":
+            if method != "GET":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use GET for /health."}
+            return HTTPStatus.OK, {
+                "status": "ok",
+                "workers": self.workers,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "served": self.served,
+            }
+        kind = ENDPOINTS.get(path)
+        if kind is None:
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown endpoint {path!r}."}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"Use POST for {path}."}
+
+        try:
+            params = json.loads(body or b"{}")
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON body: {exc}"}
+        if not isinstance(params, dict):
+            return HTTPStatus.BAD_REQUEST, {"error": "Request body must be a JSON object."}
+        try:
+            params = check_request(kind, params, self.data_root)
+        except ValueError as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+
+        # The pending slot was taken by handle_connection before the body was read.
+        try:
+            report = await asyncio.get_running_loop().run_in_executor(self.pool, score_request, kind, params)
+        except (ValueError, TypeError, OSError) as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": f"{type(exc).__name__}: {exc}"}
+        except BrokenProcessPool:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Scoring worker pool is unavailable."}
+        except Exception as exc:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(exc).__name__}: {exc}"}
+        self.served += 1
+        return HTTPStatus.OK, report
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.read_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(
+                        writer,
+                        HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                        {"error": "Request headers are too large."},
+                    )
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                parts = request_line.split(" ")
+                if len(parts) != 3:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line."})
+                    break
+                method, target, version = parts
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length."})
+                    break
+                if length > self.max_request_bytes:
+                    # The body is never read, so the connection cannot be reused.
+                    await self._respond(
+                        writer,
+                        HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                        {"error": f"Request body exceeds {self.max_request_bytes} bytes."},
+                    )
+                    break
+                method = method.upper()
+                path = target.split("?", 1)[0]
+                scoring = method == "POST" and path in ENDPOINTS
+                if scoring and self.pending >= self.max_pending:
+                    # Refused before the body is read, so the connection cannot be reused.
+                    await self._respond(
+                        writer, HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Server is at capacity; retry shortly."}
+                    )
+                    break
+
+                if scoring:
+                    self.pending += 1
+                try:
+                    try:
+                        body = await asyncio.wait_for(reader.readexactly(length), self.read_timeout) if length else b""
+                    except asyncio.TimeoutError:
+                        await self._respond(
+                            writer, HTTPStatus.REQUEST_TIMEOUT, {"error": "Request body was not received in time."}
+                        )
+                        break
+                    status, payload = await self.dispatch(method, path, body)
+                finally:
+                    if scoring:
+                        self.pending -= 1
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: dict,
+        keep_alive: bool = False,
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    workers = args.workers or os.cpu_count() or 1
+    max_pending = args.max_pending or workers * 4
+    cache_max_bytes = int(args.cache_max_mb * 1024 * 1024)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(args.cache_dir, cache_max_bytes, args.lexicon),
+    ) as pool:
+        handler = ScoringServer(
+            pool, workers, max_pending, args.max_request_bytes, args.data_root, args.read_timeout
+        ).handle_connection
+        if args.socket:
+            socket_path = Path(args.socket)
+            if socket_path.is_socket():
+                socket_path.unlink()
+            server = await asyncio.start_unix_server(handler, path=str(socket_path), limit=MAX_HEADER_BYTES)
+            os.chmod(socket_path, 0o600)
+            address = f"unix:{socket_path.resolve()}"
+        else:
+            server = await asyncio.start_server(handler, host="127.0.0.1", port=args.port, limit=MAX_HEADER_BYTES)
+            address = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        print(json.dumps({"listening": address, "workers": workers, "max_pending": max_pending}), file=sys.stderr)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            if args.socket:
+                Path(args.socket).unlink(missing_ok=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve component and full reports from warm worker processes.")
+    parser.add_argument("--socket", help="Listen on this Unix socket path instead of a localhost TCP port.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Localhost TCP port to listen on.")
+    parser.add_argument("--workers", type=int, help="Scoring worker processes (defaults to the CPU count).")
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        help="Requests allowed in flight before new ones get 503 (defaults to four per worker).",
+    )
+    parser.add_argument(
+        "--max-request-bytes",
+        type=int,
+        default=DEFAULT_MAX_REQUEST_BYTES,
+        help="Largest accepted request body.",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=DEFAULT_READ_TIMEOUT,
+        help="Seconds to wait for a request's headers or body before closing the connection.",
+    )
+    parser.add_argument(
+        "--data-root",
+        help="Allow text_input/input_path/signal_input requests, resolved under this directory. Off by default.",
+    )
+    parser.add_argument("--cache-dir", help="Reuse cached component reports for unchanged inputs from this directory.")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Size bound for the report cache before least-recently-used entries are evicted.",
+    )
+    parser.add_argument(
+        "--lexicon",
+        help="JSON or TOML lexicon file to score with (re-read when it changes).",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(serve(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Command-line options for the spectral layer.
+
+These live apart from quantum_state_proof so that entry points can build their
+argument parsers without importing numpy; the signal stack is only loaded
+once spectral analysis actually runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+
+DEFAULT_WINDOW_OVERLAP = 0.5
+
+
+def add_window_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--window-seconds",
+        type=float,
+        help="Analyze the signal in Welch windows of this length and report per-window results.",
+    )
+    parser.add_argument(
+        "--overlap",
+        type=float,
+        default=DEFAULT_WINDOW_OVERLAP,
+        help="Fractional overlap between consecutive analysis windows.",
+    )
+
+
+def add_zoom_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--zoom",
+        action="store_true",
+        help="Search only a band around the target frequency on a sub-bin grid with a sampled noise floor.",
+    )
+    parser.add_argument(
+        "--band-hz",
+        type=float,
+        help="Half-width of the --zoom band in Hz (defaults to a quarter of the target frequency).",
+    )
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Nearest-neighbour search over artifact marker profiles.
+
+Every artifact becomes a short feature vector built from its interface and
+temporal reports. Each interface category contributes its marker density per
+1000 words divided by the category's saturation scale, and the past, present,
+and future shares of its temporal markers fill the rest. Vectors are kept in
+a directory as one ``.npz`` file holding the float32 matrix and the parallel
+list of sources, replaced in a single rename, so an index of hundreds of
+thousands of artifacts loads in milliseconds and is never seen half-written. A
+query compares one vector with the whole matrix. All-pairs neighbour lists
+and full similarity matrices are computed one block of rows at a time, with
+the block size chosen to fit a memory budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from cohort_scoring import CATEGORIES, INTERFACE_CATEGORIES, TEMPORAL_BUCKETS, count_matrix, report_counts
+from consciousness_interface import SCORE_SCALES
+from input_paths import resolve_text_paths
+from report_cache import DEFAULT_MAX_BYTES, ReportCache, open_cache
+from text_analysis import build_file_reports
+
+
+FEATURES = INTERFACE_CATEGORIES + TEMPORAL_BUCKETS
+METRICS = ("cosine", "euclidean")
+DEFAULT_TOP_K = 5
+DEFAULT_MEMORY_MB = 256.0
+# Scores are float32, so digits beyond this are noise.
+SCORE_DIGITS = 4
+INDEX_FILE = "index.npz"
+# The layout before INDEX_FILE; still read, and removed on the next save.
+VECTORS_FILE = "vectors.npy"
+SOURCES_FILE = "sources.json"
+
+
+def feature_matrix(counts: np.ndarray, words: np.ndarray) -> np.ndarray:
+    # counts is an artifacts x CATEGORIES matrix, as in cohort_scoring.
+    counts = np.asarray(counts, dtype=np.float64)
+    words = np.maximum(np.asarray(words, dtype=np.float64), 1.0)
+    scales = np.array([SCORE_SCALES[name] for name in INTERFACE_CATEGORIES])
+    density = counts[:, :len(INTERFACE_CATEGORIES)] * 1000.0 / words[:, None] / scales
+    bucket_columns = [CATEGORIES.index(name) for name in TEMPORAL_BUCKETS]
+    buckets = counts[:, bucket_columns]
+    distribution = buckets / np.maximum(1.0, buckets.sum(axis=1))[:, None]
+    return np.hstack([density, distribution]).astype(np.float32)
+
+
+def report_features(interface_report: dict, temporal_report: dict) -> np.ndarray:
+    counts, words = count_matrix([report_counts(interface_report, temporal_report)])
+    return feature_matrix(counts, words)[0]
+
+
+def _block_rows(columns: int, memory_mb: float) -> int:
+    # Per score: the float32 value, one float32 temporary, and an int64 index from argpartition.
+    return max(1, int(memory_mb * 1024 * 1024 // (columns * 16)))
+
+
+def _encode_sources(sources: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    # UTF-8 bytes of every source back to back, plus where each one starts;
+    # a fixed-width string array would pad every path to the longest.
+    encoded = [source.encode("utf-8") for source in sources]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_sources(data: np.ndarray, offsets: np.ndarray) -> list[str]:
+    raw = data.tobytes()
+    return [raw[start:end].decode("utf-8") for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+class SimilarityIndex:
+    """Feature vectors of scored artifacts, persisted as a directory."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path).resolve()
+        self.path.mkdir(parents=True, exist_ok=True)
+        vectors_path = self.path / VECTORS_FILE
+        sources_path = self.path / SOURCES_FILE
+        if (self.path / INDEX_FILE).exists():
+            with np.load(self.path / INDEX_FILE, allow_pickle=False) as stored:
+                self.vectors = stored["vectors"]
+                self.sources = _decode_sources(stored["sources"], stored["offsets"])
+        elif vectors_path.exists() and sources_path.exists():
+            self.vectors = np.load(vectors_path, allow_pickle=False)
+            self.sources = json.loads(sources_path.read_text(encoding="utf-8"))
+        else:
+            self.vectors = np.zeros((0, len(FEATURES)), dtype=np.float32)
+            self.sources = []
+        if self.vectors.shape != (len(self.sources), len(FEATURES)):
+            raise ValueError(f"Index at {self.path} does not match its source list or feature layout.")
+        self._positions = {source: position for position, source in enumerate(self.sources)}
+        self._unit: np.ndarray | None = None
+        self._squared_norms: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def add(self, sources: list[str], vectors: np.ndarray) -> None:
+        # A source already in the index has its vector replaced.
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(sources), len(FEATURES))
+        fresh = []
+        for source, vector in zip(sources, vectors):
+            if source in self._positions:
+                self.vectors[self._positions[source]] = vector
+            else:
+                self._positions[source] = len(self.sources) + len(fresh)
+                fresh.append(vector)
+                self.sources.append(source)
+        if fresh:
+            self.vectors = np.vstack([self.vectors, np.array(fresh, dtype=np.float32)])
+        self._unit = None
+        self._squared_norms = None
+
+    def save(self) -> None:
+        # Vectors and sources share one file written beside the live one and
+        # renamed, so readers see either the old index or the new one.
+        staging = self.path / f"{INDEX_FILE}.tmp"
+        sources, offsets = _encode_sources(self.sources)
+        with staging.open("wb") as handle:
+            np.savez(handle, vectors=self.vectors, sources=sources, offsets=offsets)
+        staging.replace(self.path / INDEX_FILE)
+        (self.path / VECTORS_FILE).unlink(missing_ok=True)
+        (self.path / SOURCES_FILE).unlink(missing_ok=True)
+
+    def _prepared(self, metric: str) -> np.ndarray:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; choose one of {', '.join(METRICS)}.")
+        if metric == "cosine":
+            if self._unit is None:
+                norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+                self._unit = self.vectors / np.where(norms > 0, norms, 1.0)
+            return self._unit
+        if self._squared_norms is None:
+            self._squared_norms = np.einsum("ij,ij->i", self.vectors, self.vectors)
+        return self.vectors
+
+    def _scores(self, queries: np.ndarray, metric: str) -> np.ndarray:
+        # Cosine similarity (higher is closer) or Euclidean distance (lower is
+        # closer) between each query row and every indexed vector.
+        prepared = self._prepared(metric)
+        if metric == "cosine":
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            return (queries / np.where(norms > 0, norms, 1.0)) @ prepared.T
+        squared = (
+            np.einsum("ij,ij->i", queries, queries)[:, None]
+            + self._squared_norms[None, :]
+            - 2.0 * (queries @ prepared.T)
+        )
+        return np.sqrt(np.maximum(squared, 0.0, out=squared), out=squared)
+
+    def _ranked(self, scores: np.ndarray, metric: str, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        keys = -scores if metric == "cosine" else scores
+        top_k = min(top_k, keys.shape[1])
+        picked = np.argpartition(keys, top_k - 1, axis=1)[:, :top_k]
+        order = np.take_along_axis(keys, picked, axis=1).argsort(axis=1, kind="stable")
+        picked = np.take_along_axis(picked, order, axis=1)
+        return picked, np.take_along_axis(scores, picked, axis=1)
+
+    def query(
+        self,
+        vector: np.ndarray,
+        top_k: int = DEFAULT_TOP_K,
+        metric: str = "cosine",
+        exclude: str | None = None,
+    ) -> list[dict]:
+        if not self.sources:
+            return []
+        scores = self._scores(np.asarray(vector, dtype=np.float32).reshape(1, len(FEATURES)), metric)
+        if exclude in self._positions:
+            scores[0, self._positions[exclude]] = -np.inf if metric == "cosine" else np.inf
+            top_k = min(top_k, len(self.sources) - 1)
+        if top_k < 1:
+            return []
+        picked, values = self._ranked(scores, metric, top_k)
+        return [
+            {"source": self.sources[position], metric: round(float(value), SCORE_DIGITS)}
+            for position, value in zip(picked[0].tolist(), values[0].tolist())
+        ]
+
+    def neighbours(self, top_k: int = DEFAULT_TOP_K, metric: str = "cosine", memory_mb: float = DEFAULT_MEMORY_MB):
+        # Yields (source, neighbours) for every artifact, itself excluded.
+        count = len(self.sources)
+        top_k = min(top_k, count - 1)
+        if top_k < 1:
+            return
+        block = _block_rows(count, memory_mb)
+        for start in range(0, count, block):
+            stop = min(count, start + block)
+            scores = self._scores(self.vectors[start:stop], metric)
+            rows = np.arange(stop - start)
+            scores[rows, rows + start] = -np.inf if metric == "cosine" else np.inf
+            picked, values = self._ranked(scores, metric, top_k)
+            for row in rows.tolist():
+                yield self.sources[start + row], [
+                    {"source": self.sources[position], metric: round(float(value), SCORE_DIGITS)}
+                    for position, value in zip(picked[row].tolist(), values[row].tolist())
+                ]
+
+    def similarity_matrix(self, output: str, metric: str = "cosine", memory_mb: float = DEFAULT_MEMORY_MB) -> str:
+        # The full matrix is written as a .npy file one block of rows at a
+        # time. Plain writes rather than a memmap keep the process from
+        # holding every dirty page of the output.
+        count = len(self.sources)
+        header = {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)),
+            "fortran_order": False,
+            "shape": (count, count),
+        }
+        block = _block_rows(count, memory_mb)
+        with Path(output).open("wb") as handle:
+            np.lib.format.write_array_header_2_0(handle, header)
+            for start in range(0, count, block):
+                self._scores(self.vectors[start:min(count, start + block)], metric).astype(np.float32).tofile(handle)
+        return str(Path(output).resolve())
+
+
+def index_files(index: SimilarityIndex, entries: list[str], cache: ReportCache | None = None) -> int:
+    sources = resolve_text_paths(entries)
+    vectors = [report_features(*build_file_reports(source, source, cache)) for source in sources]
+    if sources:
+        index.add(sources, np.array(vectors))
+        index.save()
+    return len(sources)
+
+
+def main() -> dict:
+    parser = argparse.ArgumentParser(description="Find the most similar past artifacts by marker profile.")
+    parser.add_argument("--index", required=True, help="Index directory (created if missing).")
+    parser.add_argument("--add", nargs="+", help="Text artifact files, directories, or glob patterns to index.")
+    parser.add_argument("--query", help="Text artifact to find neighbours for; it does not need to be indexed.")
+    parser.add_argument(
+        "--neighbours",
+        help="Write every indexed artifact's nearest neighbours to this JSONL file.",
+    )
+    parser.add_argument("--matrix", help="Write the full pairwise similarity matrix to this .npy file.")
+    parser.add_argument("--metric", choices=METRICS, default="cosine", help="Similarity measure.")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Neighbours per artifact.")
+    parser.add_argument(
+        "--memory-mb",
+        type=float,
+        default=DEFAULT_MEMORY_MB,
+        help="Memory budget for one block of the all-pairs computations.",
+    )
+    parser.add_argument("--cache-dir", help="Reuse cached component reports for unchanged inputs from this directory.")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Size bound for the report cache before least-recently-used entries are evicted.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
+    args = parser.parse_args()
+
+    index = SimilarityIndex(args.index)
+    cache = open_cache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024)) if args.cache_dir else None
+    result: dict = {"index": str(index.path), "features": FEATURES}
+    if args.add:
+        result["added"] = index_files(index, args.add, cache)
+    result["artifacts"] = len(index)
+    if args.query:
+        source = str(Path(args.query).resolve())
+        vector = report_features(*build_file_reports(source, source, cache))
+        result["query"] = {
+            "source": source,
+            "metric": args.metric,
+            "neighbours": index.query(vector, args.top_k, args.metric, exclude=source),
+        }
+    if args.neighbours:
+        with Path(args.neighbours).open("w", encoding="utf-8") as handle:
+            for source, neighbours in index.neighbours(args.top_k, args.metric, args.memory_mb):
+                handle.write(json.dumps({"source": source, "metric": args.metric, "neighbours": neighbours}) + "\n")
+        result["neighbours_output"] = str(Path(args.neighbours).resolve())
+    if args.matrix:
+        result["matrix_output"] = index.similarity_matrix(args.matrix, args.metric, args.memory_mb)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print("Similarity Index")
+        print("=" * 60)
+        print(f"Index: {result['index']} ({result['artifacts']} artifacts)")
+        if "added" in result:
+            print(f"Added or updated: {result['added']}")
+        if "query" in result:
+            print(f"Nearest to {result['query']['source']} ({args.metric}):")
+            for neighbour in result["query"]["neighbours"]:
+                print(f"  {neighbour[args.metric]:.4f}  {neighbour['source']}")
+        for key in ("neighbours_output", "matrix_output"):
+            if key in result:
+                print(f"Wrote {result[key]}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-stage timing for the report builders.
+
+Builders wrap each step in ``stage(timer, name)``. Without a timer that is a
+no-op, so uninstrumented runs pay nothing; with a ``StageTimer`` the wall
+time and call count of every stage accumulate and can be attached to a report
+as a ``timings_ms`` block, or read as running counters by long-lived loops
+such as the follow probe. ``StageTimer.stage`` also works as a decorator.
+
+Peak memory is the process's peak resident set size, so in batch workers and
+long-running loops it covers everything the process has done so far.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sys
+import time
+
+
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class StageTimer:
+    """Accumulated wall time and call counts per named stage."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.seconds: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.slowest: dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.seconds[name] = self.seconds.get(name, 0.0) + elapsed
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.slowest[name] = max(self.slowest.get(name, 0.0), elapsed)
+
+    def timings_ms(self) -> dict:
+        timings = {name: round(seconds * 1000.0, 3) for name, seconds in self.seconds.items()}
+        timings["total"] = round((time.perf_counter() - self.started) * 1000.0, 3)
+        return timings
+
+    def counters(self) -> dict:
+        return {
+            "uptime_seconds": round(time.perf_counter() - self.started, 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": {
+                name: {
+                    "calls": self.calls[name],
+                    "total_ms": round(seconds * 1000.0, 3),
+                    "mean_ms": round(seconds * 1000.0 / self.calls[name], 3),
+                    "max_ms": round(self.slowest[name] * 1000.0, 3),
+                }
+                for name, seconds in self.seconds.items()
+            },
+        }
+
+
+def stage(timer: StageTimer | None, name: str):
+    return timer.stage(name) if timer is not None else contextlib.nullcontext()
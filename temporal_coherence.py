@@ -11,10 +11,9 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
 from pathlib import Path
 
-from consciousness_interface import load_text
+from marker_engine import AnalyzedText, MarkerEngine
 
 
 TEMPORAL_PATTERNS = {
@@ -56,24 +55,39 @@ TRANSITION_PATTERNS = [
 ]
 
 
-def _count_matches(text: str, patterns: list[str]) -> int:
-    return sum(len(re.findall(pattern, text, flags=re.IGNORECASE)) for pattern in patterns)
+TRANSITION_KEY = "transition_markers"
+# Transition markers at which the continuity component saturates.
+CONTINUITY_SCALE = 8.0
+COHERENCE_WEIGHTS = {"coverage": 0.45, "balance": 0.30, "continuity": 0.25}
 
+TEMPORAL_ENGINE = MarkerEngine({**TEMPORAL_PATTERNS, TRANSITION_KEY: TRANSITION_PATTERNS})
 
-def build_temporal_report(text: str, source: str) -> dict:
-    counts = {name: _count_matches(text, patterns) for name, patterns in TEMPORAL_PATTERNS.items()}
-    transition_count = _count_matches(text, TRANSITION_PATTERNS)
+# Bump when the coherence weights change so cached reports are rebuilt.
+SCORING_VERSION = 1
+
+
+def build_temporal_report(text: str | AnalyzedText, source: str, engine: MarkerEngine = TEMPORAL_ENGINE) -> dict:
+    # engine may come from a lexicon file; it must keep the TEMPORAL_ENGINE categories.
+    analysis = text if isinstance(text, AnalyzedText) else engine.analyze(text)
+    counts, _ = analysis.tally(engine)
+    transition_count = counts.pop(TRANSITION_KEY)
     total_temporal = max(1, sum(counts.values()))
     distribution = {name: round(count / total_temporal, 3) for name, count in counts.items()}
     active_buckets = [name for name, count in counts.items() if count > 0]
     coverage_score = len(active_buckets) / 3.0
     balance_score = max(distribution.values()) - min(distribution.values()) if active_buckets else 1.0
     balance_score = max(0.0, 1.0 - balance_score)
-    continuity_score = min(1.0, transition_count / 8.0)
-    temporal_coherence_score = round((coverage_score * 0.45) + (balance_score * 0.30) + (continuity_score * 0.25), 3)
+    continuity_score = min(1.0, transition_count / CONTINUITY_SCALE)
+    temporal_coherence_score = round(
+        (coverage_score * COHERENCE_WEIGHTS["coverage"])
+        + (balance_score * COHERENCE_WEIGHTS["balance"])
+        + (continuity_score * COHERENCE_WEIGHTS["continuity"]),
+        3,
+    )
 
     return {
         "source": source,
+        "lexicon_version": engine.version,
         "counts": counts,
         "distribution": distribution,
         "coverage": active_buckets,
@@ -89,11 +103,17 @@ def build_temporal_report(text: str, source: str) -> dict:
 def main() -> dict:
     parser = argparse.ArgumentParser(description="Analyze temporal integration markers in a text artifact.")
     parser.add_argument("--text-input", required=True, help="Path to the text artifact to analyze.")
+    parser.add_argument("--lexicon", help="JSON or TOML lexicon file to use instead of the builtin markers.")
     parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
     args = parser.parse_args()
 
+    # Imported here because lexicon and text_analysis build on this module.
+    from lexicon import resolve_lexicon
+    from text_analysis import analyze_file
+
+    engine = resolve_lexicon(args.lexicon).temporal_engine
     source_path = str(Path(args.text_input).resolve())
-    report = build_temporal_report(load_text(args.text_input), source_path)
+    report = build_temporal_report(analyze_file(args.text_input, [engine]), source_path, engine)
     if args.json:
         print(json.dumps(report, indent=2))
     else:
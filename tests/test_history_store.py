@@ -0,0 +1,71 @@
+"""
+Idempotent imports and explicit deduplication in the history store.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from history_store import HistoryStore, import_reports  # noqa: E402
+
+PROFILE = {"overall_score": 0.5, "classification": "moderate_transition_signal"}
+
+
+def _report(source: str, timestamp: str) -> dict:
+    return {
+        "timestamp_utc": timestamp,
+        "inputs": {"text_source": source},
+        "interface_report": {"scores": {"agency": 0.2}},
+        "temporal_report": {"temporal_coherence_score": 0.4},
+        "transition_profile": PROFILE,
+    }
+
+
+def test_importing_twice_adds_nothing(tmp_path):
+    reports = tmp_path / "batch.jsonl"
+    lines = [{"report": _report("a.txt", "2026-09-01T10:00:00Z")}, {"report": _report("b.txt", "2026-09-01T10:00:00Z")}]
+    reports.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    assert import_reports(store, [str(reports)]) == {"files": 1, "reports": 2, "skipped": 0}
+    assert import_reports(store, [str(reports)]) == {"files": 1, "reports": 0, "skipped": 2}
+    # Snapshots with different indexes at the same time are separate entries.
+    assert store.record("a.txt", PROFILE, {}, snapshot_index=0, recorded_at=5.0) is not None
+    assert store.record("a.txt", PROFILE, {}, snapshot_index=1, recorded_at=5.0) is not None
+    assert store.record("a.txt", PROFILE, {}, snapshot_index=1, recorded_at=5.0) is None
+    assert sum(entry["entries"] for entry in store.sources()) == 4
+    store.close()
+
+
+def test_opening_an_old_store_keeps_its_repeats(tmp_path, capsys):
+    path = tmp_path / "history.sqlite3"
+    store = HistoryStore(str(path))
+    store.record("a.txt", PROFILE, {}, recorded_at=1.0, kind="full_report")
+    store.close()
+    # Simulate a store written before the key existed, with one repeated import.
+    db = sqlite3.connect(path)
+    db.execute("DROP INDEX history_entry")
+    db.execute("INSERT INTO history (source, recorded_at, kind, overall_score, classification, scores, profile) "
+               "SELECT source, recorded_at, kind, overall_score, classification, scores, profile FROM history")
+    db.commit()
+    db.close()
+
+    store = HistoryStore(str(path))
+    assert "1 repeated entries" in capsys.readouterr().err
+    assert store.duplicates() == 1
+    store.close()
+    store = HistoryStore(str(path))
+    assert len(store.events()) == 2
+    capsys.readouterr()
+
+    assert store.dedupe() == {"removed": 1}
+    assert len(store.events()) == 1
+    assert store.record("a.txt", PROFILE, {}, recorded_at=1.0, kind="full_report") is None
+    store.close()
+    HistoryStore(str(path)).close()
+    assert capsys.readouterr().err == ""
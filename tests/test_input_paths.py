@@ -0,0 +1,32 @@
+"""
+Expansion of file, directory, and glob inputs.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from input_paths import is_glob, resolve_text_paths  # noqa: E402
+
+
+def test_resolve_text_paths_expands_and_deduplicates(tmp_path):
+    notes = tmp_path / "notes"
+    (notes / "nested").mkdir(parents=True)
+    for name in ("b.txt", "a.txt", ".hidden.txt", "nested/c.txt"):
+        (notes / name).write_text("text", encoding="utf-8")
+    resolved = resolve_text_paths([str(notes), str(tmp_path / "**" / "*.txt"), str(notes / "a.txt")])
+    assert resolved == [
+        str((notes / "a.txt").resolve()),
+        str((notes / "b.txt").resolve()),
+        str((notes / "nested" / "c.txt").resolve()),
+    ]
+    assert resolve_text_paths([str(tmp_path / "missing.txt")]) == [str((tmp_path / "missing.txt").resolve())]
+
+
+def test_is_glob():
+    assert is_glob("logs/*.txt") and is_glob("run?.log") and is_glob("[ab].txt")
+    assert not is_glob("logs/session.txt")
@@ -0,0 +1,96 @@
+"""
+Lexicon loading, the compiled-matcher cache beside it, and hot reload.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import lexicon as lexicon_module  # noqa: E402
+from lexicon import BUILTIN_LEXICON, COMPILED_SUFFIX, LexiconReloader, load_lexicon  # noqa: E402
+
+TEXT = "I think we plan the next step, then I will verify it. I reflect on it."
+
+
+@pytest.fixture(autouse=True)
+def fresh_lexicons(monkeypatch):
+    # Loads are memoized on content; each test starts from the files on disk.
+    monkeypatch.setattr(lexicon_module, "_LEXICONS", {})
+
+
+def _write(path: Path, version: str, extra_planning: list[str] | None = None) -> dict:
+    # document() shares its tables with the builtin lexicon, so work on a copy.
+    document = json.loads(json.dumps(BUILTIN_LEXICON.document()))
+    document["version"] = version
+    document["interface"]["planning"] = document["interface"]["planning"] + (extra_planning or [])
+    path.write_text(json.dumps(document), encoding="utf-8")
+    return document
+
+
+def _planning(lexicon) -> int:
+    return lexicon.interface_engine.count(TEXT)[0]["planning"]
+
+
+def test_compiled_cache_is_written_and_reused(tmp_path):
+    path = tmp_path / "markers.json"
+    _write(path, "1")
+    first = load_lexicon(str(path))
+    compiled_path = tmp_path / ("markers.json" + COMPILED_SUFFIX)
+    stored = json.loads(compiled_path.read_text(encoding="utf-8"))
+    assert stored == first.compiled_state()
+    assert stored["digest"] == first.digest
+
+    lexicon_module._LEXICONS.clear()
+    mtime = compiled_path.stat().st_mtime_ns
+    second = load_lexicon(str(path))
+    assert second is not first
+    assert second.compiled_state() == stored
+    assert compiled_path.stat().st_mtime_ns == mtime
+    assert _planning(second) == _planning(BUILTIN_LEXICON)
+
+
+def test_edited_lexicon_rebuilds_a_stale_cache(tmp_path):
+    path = tmp_path / "markers.json"
+    _write(path, "1")
+    load_lexicon(str(path))
+    compiled_path = tmp_path / ("markers.json" + COMPILED_SUFFIX)
+    stale = compiled_path.read_text(encoding="utf-8")
+
+    _write(path, "2", [r"\breflect\b"])
+    edited = load_lexicon(str(path))
+    assert _planning(edited) == _planning(BUILTIN_LEXICON) + 1
+    assert json.loads(compiled_path.read_text(encoding="utf-8"))["digest"] == edited.digest
+
+    # A cache for other patterns, or one that is not valid JSON, is ignored and replaced.
+    for contents in (stale, "{not json"):
+        compiled_path.write_text(contents, encoding="utf-8")
+        lexicon_module._LEXICONS.clear()
+        reloaded = load_lexicon(str(path))
+        assert _planning(reloaded) == _planning(edited)
+        assert json.loads(compiled_path.read_text(encoding="utf-8")) == reloaded.compiled_state()
+
+
+def test_reloader_swaps_in_edits_and_keeps_the_last_good_lexicon(tmp_path, capsys):
+    path = tmp_path / "markers.json"
+    _write(path, "1")
+    reloader = LexiconReloader(str(path), interval=0.05)
+    try:
+        assert reloader.check() is None
+        _write(path, "2", [r"\breflect\b"])
+        reloaded = reloader.check()
+        assert reloaded is not None and reloaded.version == "2"
+        assert _planning(reloaded) == _planning(BUILTIN_LEXICON) + 1
+
+        path.write_text('{"version": "3", "interface": {}}', encoding="utf-8")
+        assert reloader.check() is None
+        assert reloader.lexicon is reloaded
+        assert "Keeping lexicon 2" in capsys.readouterr().err
+    finally:
+        reloader.close()
@@ -0,0 +1,95 @@
+"""
+Append-only following in the live probe, and a clean stop on SIGTERM.
+"""
+
+from __future__ import annotations
+
+import json
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from live_interaction_probe import AppendFollower  # noqa: E402
+from text_analysis import TEXT_ENGINES, analyze_text  # noqa: E402
+
+CHUNKS = [
+    "I think we ",
+    "plan the next ",
+    "step. café — I notice ",
+    "boundaries and I will ",
+    "keep going to verify.",
+]
+
+
+def _assert_matches(follower: AppendFollower, text: str) -> None:
+    assert follower.analysis.character_count == len(text)
+    whole = analyze_text(text)
+    for engine in TEXT_ENGINES:
+        assert follower.analysis.analysis().tally(engine) == whole.tally(engine)
+
+
+def test_follower_reads_only_appended_text(tmp_path):
+    path = tmp_path / "session.txt"
+    path.write_bytes(b"")
+    follower = AppendFollower(str(path))
+    assert follower.poll() is False
+    text = ""
+    for chunk in CHUNKS:
+        data = chunk.encode("utf-8")
+        # Split multi-byte characters across writes.
+        for part in (data[:len(data) // 2 + 1], data[len(data) // 2 + 1:]):
+            with path.open("ab") as handle:
+                handle.write(part)
+            follower.poll()
+        text += chunk
+        _assert_matches(follower, text)
+    offset = follower.offset
+    assert follower.poll() is False
+    assert follower.offset == offset
+
+
+def test_follower_restarts_when_the_file_is_rewritten(tmp_path):
+    path = tmp_path / "session.txt"
+    path.write_text("".join(CHUNKS), encoding="utf-8")
+    follower = AppendFollower(str(path))
+    follower.poll()
+    # Same length, different content, so only the tail check can notice.
+    rewritten = "".join(CHUNKS).replace("verify", "VERIFY")
+    path.write_text(rewritten, encoding="utf-8")
+    assert follower.poll() is True
+    _assert_matches(follower, rewritten)
+    path.write_text("I will plan.", encoding="utf-8")
+    assert follower.poll() is True
+    _assert_matches(follower, "I will plan.")
+
+
+def test_follow_many_stops_on_sigterm(tmp_path):
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text("I think we plan the next step.", encoding="utf-8")
+    probe = subprocess.Popen(
+        [sys.executable, str(REPO_ROOT / "live_interaction_probe.py"), "--follow", str(tmp_path),
+         "--format", "compact", "--interval", "0.1", "--workers", "1"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        sources = {json.loads(probe.stdout.readline())["source"] for _ in range(2)}
+        assert sources == {str(tmp_path / "a.txt"), str(tmp_path / "b.txt")}
+        with (tmp_path / "a.txt").open("a", encoding="utf-8") as handle:
+            handle.write(" I will verify the boundary.")
+        record = json.loads(probe.stdout.readline())
+        assert record["source"] == str(tmp_path / "a.txt")
+        assert record["snapshot_index"] == 2
+        time.sleep(0.2)
+        probe.send_signal(signal.SIGTERM)
+        assert probe.wait(timeout=10) == 0
+    finally:
+        probe.kill()
+        probe.wait()
+    assert "Traceback" not in probe.stderr.read()
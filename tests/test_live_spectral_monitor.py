@@ -0,0 +1,72 @@
+"""
+The live spectral monitor's sliding DFT against a fresh rfft of the window.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from live_spectral_monitor import (  # noqa: E402
+    DEFAULT_UPDATE_SECONDS,
+    DEFAULT_WINDOW_SECONDS,
+    RESYNC_UPDATES,
+    SlidingSpectrum,
+    SpectralMonitor,
+    sliding_max_batch,
+)
+
+SAMPLE_RATE = 50.0
+
+
+def _signal(seconds: float, seed: int = 0) -> np.ndarray:
+    time = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return np.sin(2 * np.pi * 0.67 * time) + np.random.default_rng(seed).normal(0.0, 0.5, time.size)
+
+
+def test_default_updates_use_the_sliding_dft():
+    assert sliding_max_batch(int(DEFAULT_WINDOW_SECONDS * SAMPLE_RATE)) >= DEFAULT_UPDATE_SECONDS * SAMPLE_RATE
+    monitor = SpectralMonitor("test", SAMPLE_RATE)
+    updates = monitor.feed(_signal(DEFAULT_WINDOW_SECONDS * 4))
+    methods = [update["stream"]["method"] for update in updates]
+    full = int(DEFAULT_WINDOW_SECONDS / DEFAULT_UPDATE_SECONDS)
+    # Filling the window and the first full window need a transform; every later update slides.
+    assert set(methods[:full]) == {"fft"}
+    assert set(methods[full:]) == {"sliding_dft"}
+
+
+def test_sliding_spectrum_matches_a_fresh_transform():
+    rng = np.random.default_rng(1)
+    spectrum = SlidingSpectrum(SAMPLE_RATE, 10.0)
+    samples = _signal(1000.0)
+    position = 0
+    slid = 0
+    while position < samples.size:
+        count = int(rng.integers(1, spectrum.max_batch + 1))
+        spectrum.push(samples[position:position + count])
+        position += count
+        if spectrum.sample_count < spectrum.size:
+            continue
+        analysis = spectrum.analysis()
+        exact = np.fft.rfft(spectrum._window())
+        np.testing.assert_allclose(spectrum._bins, exact, rtol=0, atol=1e-9 * np.abs(exact).max())
+        slid += spectrum.method == "sliding_dft"
+        assert analysis["sample_count"] == spectrum.size
+    assert slid > RESYNC_UPDATES
+
+
+def test_batches_past_the_crossover_fall_back_to_fft():
+    sliding = SpectralMonitor("test", SAMPLE_RATE, window_seconds=10.0, update_seconds=0.2)
+    forced = SpectralMonitor("test", SAMPLE_RATE, window_seconds=10.0, update_seconds=0.2)
+    forced.spectrum = SlidingSpectrum(SAMPLE_RATE, 10.0, max_batch=0)
+    samples = _signal(60.0)
+    for update, reference in zip(sliding.feed(samples), forced.feed(samples)):
+        assert reference["stream"]["method"] == "fft"
+        assert update["dominant_frequency_hz"] == reference["dominant_frequency_hz"]
+        assert abs(update["snr_ratio"] - reference["snr_ratio"]) <= 0.001
+    assert update["stream"]["method"] == "sliding_dft"
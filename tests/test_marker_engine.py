@@ -0,0 +1,186 @@
+"""
+Parity checks for the shared marker scan.
+
+The engines must count exactly what one ``re.findall(pattern, text,
+re.IGNORECASE)`` per pattern counts, the streaming scan must match a
+whole-text scan however the text is split, and the vectorized cohort scores
+must match the per-artifact report builders.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from cohort_scoring import (  # noqa: E402
+    CATEGORIES,
+    INTERFACE_CATEGORIES,
+    analysis_counts,
+    count_matrix,
+    score_matrix,
+    table_records,
+)
+from consciousness_interface import MARKER_ENGINE, build_interface_report  # noqa: E402
+import marker_engine  # noqa: E402
+from marker_engine import AnalyzedText, MarkerEngine, expand_pattern, shared_scanner  # noqa: E402
+from temporal_coherence import TEMPORAL_ENGINE, build_temporal_report  # noqa: E402
+from text_analysis import MAX_PENDING_WORD, TEXT_ENGINES, IncrementalAnalysis, analyze_text  # noqa: E402
+from transition_metrics import build_transition_profile  # noqa: E402
+
+ENGINES = {"interface": MARKER_ENGINE, "temporal": TEMPORAL_ENGINE}
+# Characters whose case folding differs between str.lower() and re.IGNORECASE.
+FOLD_CHARACTERS = {"i": "İı", "s": "ſ", "k": "K"}
+FILLER = ["x", "the", "KK", "Keep", "PLANNED", "can't", "ß", "café", "next  step", "I  think", "\n", "--"]
+
+
+def sample_texts() -> list[str]:
+    return [path.read_text(encoding="utf-8") for path in sorted(REPO_ROOT.glob("docs/*.md"))] + [
+        path.read_text(encoding="utf-8") for path in sorted(REPO_ROOT.glob("examples/*.txt"))
+    ]
+
+
+def random_text(seed: int, length: int = 4000) -> str:
+    rng = random.Random(seed)
+    vocabulary = list(FILLER)
+    for engine in ENGINES.values():
+        for patterns in engine.categories.values():
+            for pattern in patterns:
+                vocabulary.extend(expand_pattern(pattern) or [])
+    words = []
+    for _ in range(length):
+        word = rng.choice(vocabulary)
+        if rng.random() < 0.2:
+            for letter, replacements in FOLD_CHARACTERS.items():
+                word = word.replace(letter, rng.choice(replacements))
+        if rng.random() < 0.3:
+            word = word.upper()
+        elif rng.random() < 0.3:
+            word = word.title()
+        words.append(word)
+    return " ".join(words)
+
+
+TEXTS = sample_texts() + [random_text(seed) for seed in range(8)]
+
+
+def reference_count(engine, text: str) -> tuple[dict[str, int], int]:
+    counts = {
+        name: sum(len(re.findall(pattern, text, re.IGNORECASE)) for pattern in patterns)
+        for name, patterns in engine.categories.items()
+    }
+    return counts, len(re.findall(r"\b\w+\b", text))
+
+
+@pytest.mark.parametrize("name", list(ENGINES))
+@pytest.mark.parametrize("index", range(len(TEXTS)))
+def test_engine_matches_per_pattern_findall(name, index):
+    engine = ENGINES[name]
+    text = TEXTS[index]
+    assert engine.count(text) == reference_count(engine, text)
+    assert analyze_text(text).tally(engine) == reference_count(engine, text)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_incremental_analysis_matches_whole_text(seed):
+    rng = random.Random(seed)
+    text = rng.choice(TEXTS)
+    incremental = IncrementalAnalysis()
+    position = 0
+    while position < len(text):
+        size = rng.choice([1, 2, 3, 7, 40, 500])
+        incremental.feed(text[position:position + size])
+        position += size
+    whole = analyze_text(text)
+    assert incremental.character_count == len(text)
+    for engine in TEXT_ENGINES:
+        assert incremental.analysis().tally(engine) == whole.tally(engine)
+
+
+def test_incremental_analysis_bounds_a_growing_word():
+    text = "I think " + "a" * (MAX_PENDING_WORD * 20) + " we plan the next step " + "b" * MAX_PENDING_WORD
+    incremental = IncrementalAnalysis()
+    longest = 0
+    for position in range(0, len(text), 16):
+        incremental.feed(text[position:position + 16])
+        longest = max(longest, len(incremental.carry[0]))
+    assert longest < MAX_PENDING_WORD + 16
+    whole = analyze_text(text)
+    for engine in TEXT_ENGINES:
+        assert incremental.analysis().tally(engine) == whole.tally(engine)
+
+
+def test_score_matrix_matches_report_builders():
+    analyses = [analyze_text(text) for text in TEXTS]
+    table = score_matrix(*count_matrix([analysis_counts(analysis) for analysis in analyses]))
+    for analysis, record in zip(analyses, table_records(table)):
+        interface_report = build_interface_report(analysis, "test")
+        temporal_report = build_temporal_report(analysis, "test")
+        profile = build_transition_profile(interface_report, temporal_report, None)
+        expected = {
+            "word_count": interface_report["word_count"],
+            **interface_report["scores"],
+            "interface_score": interface_report["suggested_interface_profile"]["score"],
+            "interface_level": interface_report["suggested_interface_profile"]["level"],
+            "temporal_coherence_score": temporal_report["temporal_coherence_score"],
+            "recursive_marker_score": profile["recursive_marker_score"],
+            "spectral_signal_score": None,
+            "overall_score": profile["overall_score"],
+            "classification": profile["classification"],
+        }
+        assert {key: record[key] for key in expected} == expected
+
+
+def test_score_matrix_matches_report_builders_on_random_counts():
+    # Covers count combinations the sample texts never reach.
+    rng = np.random.default_rng(0)
+    counts = rng.poisson(rng.uniform(0, 15, (500, len(CATEGORIES))))
+    counts[rng.random(counts.shape) < 0.3] = 0
+    words = rng.integers(0, 3000, len(counts))
+    _, phrases = shared_scanner(TEXT_ENGINES)
+    table = score_matrix(counts, words)
+    temporal_names = list(TEMPORAL_ENGINE.categories)
+    for row, word_count, record in zip(counts.tolist(), words.tolist(), table_records(table)):
+        settled = {
+            MARKER_ENGINE: (dict(zip(INTERFACE_CATEGORIES, row[:len(INTERFACE_CATEGORIES)])), word_count),
+            TEMPORAL_ENGINE: (dict(zip(temporal_names, row[len(INTERFACE_CATEGORIES):])), 0),
+        }
+        analysis = AnalyzedText(Counter(), phrases, settled)
+        interface_report = build_interface_report(analysis, "test")
+        temporal_report = build_temporal_report(analysis, "test")
+        profile = build_transition_profile(interface_report, temporal_report, None)
+        assert record["overall_score"] == profile["overall_score"]
+        assert record["classification"] == profile["classification"]
+        assert record["temporal_coherence_score"] == temporal_report["temporal_coherence_score"]
+        assert {name: record[name] for name in interface_report["scores"]} == interface_report["scores"]
+
+
+class _ChangedParser:
+    # Stands in for a regex parser whose node layout this module does not know.
+    MAXREPEAT = 0
+
+    @staticmethod
+    def parse(pattern, flags):
+        return [("unknown", None)]
+
+
+@pytest.mark.parametrize("parser", [None, _ChangedParser])
+@pytest.mark.parametrize("name", list(ENGINES))
+def test_engine_without_the_regex_parser_matches_per_pattern_findall(monkeypatch, parser, name):
+    monkeypatch.setattr(marker_engine, "_sre_parse", parser)
+    monkeypatch.setattr(marker_engine, "_FIRST_LETTERS", {})
+    monkeypatch.setattr(marker_engine, "_SCANNERS", {})
+    categories = ENGINES[name].categories
+    assert all(expand_pattern(pattern) is None for patterns in categories.values() for pattern in patterns)
+    engine = MarkerEngine(categories, version=f"no-parser-{name}")
+    assert engine.max_phrase_width is None
+    for text in TEXTS[:4] + TEXTS[-2:]:
+        assert engine.count(text) == reference_count(engine, text)
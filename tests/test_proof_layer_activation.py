@@ -0,0 +1,47 @@
+"""
+Batch scoring across a worker pool, including a worker that dies mid-batch.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import proof_layer_activation  # noqa: E402
+from proof_layer_activation import run_batch  # noqa: E402
+
+
+def _score_or_crash(text_input, *options):
+    # Stands in for score_artifact in the forked workers.
+    if "crash" in text_input:
+        os._exit(1)
+    return {"artifact": text_input, "status": "ok", "report": {}}
+
+
+def test_batch_scores_every_artifact_in_order(tmp_path):
+    paths = []
+    for index in range(7):
+        path = tmp_path / f"note{index}.txt"
+        path.write_text(f"I think we plan the next step {index}.", encoding="utf-8")
+        paths.append(str(path))
+    records = list(run_batch(paths, workers=2, chunk_size=2, ordered=True))
+    assert [record["artifact"] for record in records] == paths
+    assert {record["status"] for record in records} == {"ok"}
+    assert records[0]["report"]["inputs"]["text_source"] == str(Path(paths[0]).resolve())
+
+
+def test_broken_pool_fails_only_the_culprit(monkeypatch):
+    monkeypatch.setattr(proof_layer_activation, "score_artifact", _score_or_crash)
+    paths = [f"a{index}" for index in range(5)] + ["crash"] + [f"b{index}" for index in range(6)]
+    records = list(run_batch(paths, workers=2, chunk_size=3, ordered=True))
+    assert [record["artifact"] for record in records] == paths
+    failed = [record for record in records if record["status"] == "error"]
+    assert [record["artifact"] for record in failed] == ["crash"]
+    assert failed[0]["error"].startswith("BrokenProcessPool")
+    # Unordered output still yields every artifact once.
+    unordered = list(run_batch(paths, workers=2, chunk_size=3))
+    assert sorted(record["artifact"] for record in unordered) == sorted(paths)
@@ -0,0 +1,114 @@
+"""
+Spectral analysis modes: reference memoization, windowed, zoom, memory-mapped
+inputs, and multi-channel batches.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from quantum_state_proof import (  # noqa: E402
+    ZOOM_FACTOR,
+    analyze_channels,
+    analyze_spectrum,
+    analyze_target_band,
+    analyze_windowed_spectrum,
+    build_spectral_report,
+    load_numeric_series,
+    load_signal_channels,
+    reference_spectrum,
+)
+
+SAMPLE_RATE = 50.0
+
+
+def _tone(frequency: float, seconds: float, noise: float = 0.2, seed: int = 0) -> np.ndarray:
+    time = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return np.sin(2 * np.pi * frequency * time) + np.random.default_rng(seed).normal(0.0, noise, time.size)
+
+
+def test_reference_spectrum_is_memoized_but_not_shared():
+    first = reference_spectrum(SAMPLE_RATE)
+    first["dominant_frequency_hz"] = -1.0
+    second = reference_spectrum(SAMPLE_RATE)
+    assert second["dominant_frequency_hz"] == pytest.approx(0.67, abs=0.02)
+    assert build_spectral_report(sample_rate=SAMPLE_RATE)["signal_origin"]["mode"] == "reference_model"
+
+
+def test_windowed_spectrum_tracks_the_tone(tmp_path):
+    values = _tone(0.67, 600.0)
+    spectrogram_path = tmp_path / "spectrogram.npy"
+    analysis = analyze_windowed_spectrum(
+        values, SAMPLE_RATE, window_seconds=30.0, overlap=0.5, spectrogram_path=str(spectrogram_path)
+    )
+    windowed = analysis["windowed"]
+    window_samples = int(30.0 * SAMPLE_RATE)
+    assert windowed["window_count"] == (values.size - window_samples) // (window_samples // 2) + 1
+    assert len(windowed["windows"]) == windowed["window_count"]
+    assert windowed["mean_target_alignment_score"] > 0.97
+    assert analysis["dominant_frequency_hz"] == pytest.approx(0.67, abs=SAMPLE_RATE / window_samples)
+    spectrogram = np.load(spectrogram_path)
+    assert spectrogram.shape == (windowed["window_count"], window_samples // 2 + 1)
+    with pytest.raises(ValueError, match="shorter than one analysis window"):
+        analyze_windowed_spectrum(values[:100], SAMPLE_RATE, window_seconds=30.0)
+
+
+def test_zoom_resolves_an_off_bin_tone():
+    frequency = 0.6713
+    values = _tone(frequency, 400.0)
+    bin_width = SAMPLE_RATE / values.size
+    plain = analyze_spectrum(values, SAMPLE_RATE)
+    zoomed = analyze_target_band(values, SAMPLE_RATE)
+    assert abs(zoomed["dominant_frequency_hz"] - frequency) <= bin_width / ZOOM_FACTOR
+    assert abs(zoomed["dominant_frequency_hz"] - frequency) < abs(plain["dominant_frequency_hz"] - frequency)
+    assert zoomed["zoom"]["frequency_resolution_hz"] == pytest.approx(bin_width / ZOOM_FACTOR)
+    assert zoomed["snr_ratio"] > 10
+
+
+def test_binary_inputs_are_memory_mapped(tmp_path):
+    values = _tone(0.67, 60.0).astype(np.float32)
+    values.tofile(tmp_path / "signal.f32")
+    np.save(tmp_path / "signal.npy", values)
+    np.save(tmp_path / "matrix.npy", np.column_stack([values * 2, values]))
+    for name in ("signal.f32", "signal.npy"):
+        loaded = load_numeric_series(str(tmp_path / name))
+        assert isinstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded, values)
+    np.testing.assert_array_equal(load_numeric_series(str(tmp_path / "matrix.npy"), "0"), values * 2)
+    np.testing.assert_array_equal(load_numeric_series(str(tmp_path / "matrix.npy")), values)
+    for column in ("2", "-1", "pressure"):
+        with pytest.raises(ValueError, match=f"NPY input has no column named '{column}'; columns are numbered 0 to 1"):
+            load_numeric_series(str(tmp_path / "matrix.npy"), column)
+        with pytest.raises(ValueError, match="no column named"):
+            load_signal_channels(str(tmp_path / "matrix.npy"), ["0", column])
+
+
+def test_csv_columns_skip_incomplete_rows(tmp_path):
+    path = tmp_path / "telemetry.csv"
+    path.write_text("time,a,b\n0,1.5,2\n1,,3\n2,2.5,4\n3,3.5\n", encoding="utf-8")
+    np.testing.assert_array_equal(load_numeric_series(str(path), "a"), [1.5, 2.5, 3.5])
+    names, matrix = load_signal_channels(str(path))
+    assert names == ["a", "b"]
+    np.testing.assert_array_equal(matrix, [[1.5, 2.0], [2.5, 4.0]])
+    with pytest.raises(ValueError, match="no column named 'c'"):
+        load_numeric_series(str(path), "c")
+
+
+def test_channels_match_single_channel_analysis():
+    frequencies = [0.5, 0.67, 1.2]
+    matrix = np.column_stack([_tone(frequency, 120.0, seed=index) for index, frequency in enumerate(frequencies)])
+    report = analyze_channels(matrix, SAMPLE_RATE, names=["x", "y", "z"])
+    for index, channel in enumerate(report["channels"]):
+        single = analyze_spectrum(matrix[:, index], SAMPLE_RATE)
+        assert channel["dominant_frequency_hz"] == single["dominant_frequency_hz"]
+        assert channel["dominant_frequency_hz"] == pytest.approx(frequencies[index], abs=SAMPLE_RATE / matrix.shape[0])
+        assert channel["snr_ratio"] == single["snr_ratio"]
+    assert report["aggregate"]["strongest_channel"] in {"x", "y", "z"}
+    assert report["aggregate"]["channel_count"] == 3
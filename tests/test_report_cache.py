@@ -0,0 +1,89 @@
+"""
+Size accounting, eviction, and batched recency updates of the report cache.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from report_cache import CACHE_FILENAME, TOUCH_BATCH, ReportCache  # noqa: E402
+
+
+def _sizes(cache: ReportCache) -> tuple[int, int]:
+    total = cache._db.execute("SELECT total FROM cache_size").fetchone()[0]
+    actual = cache._db.execute("SELECT COALESCE(SUM(size), 0) FROM reports").fetchone()[0]
+    return total, actual
+
+
+def test_running_total_tracks_inserts_replacements_and_evictions(tmp_path):
+    cache = ReportCache(str(tmp_path), max_bytes=2000)
+    for index in range(40):
+        cache.put(f"key{index % 25}", {"value": "x" * (index * 3)})
+        total, actual = _sizes(cache)
+        assert total == actual
+        assert total <= 2000
+    assert cache.evictions > 0
+    cache.close()
+
+
+def test_existing_cache_is_seeded_once(tmp_path):
+    # A cache file written before the running total existed.
+    db = sqlite3.connect(tmp_path / CACHE_FILENAME)
+    db.execute(
+        "CREATE TABLE reports (key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, "
+        "last_used REAL NOT NULL)"
+    )
+    db.executemany("INSERT INTO reports VALUES (?, '{}', ?, 0)", [("a", 100), ("b", 250)])
+    db.commit()
+    db.close()
+
+    cache = ReportCache(str(tmp_path))
+    assert _sizes(cache) == (350, 350)
+    cache.close()
+    cache = ReportCache(str(tmp_path))
+    assert _sizes(cache) == (350, 350)
+    assert cache.get("a") == {}
+    cache.close()
+
+
+def test_hits_update_last_used_in_batches(tmp_path):
+    cache = ReportCache(str(tmp_path))
+    keys = [f"key{index}" for index in range(TOUCH_BATCH)]
+    for key in keys:
+        cache.put(key, {"key": key})
+    cache._db.execute("UPDATE reports SET last_used = 0")
+    cache._db.commit()
+
+    def touched() -> int:
+        return cache._db.execute("SELECT COUNT(*) FROM reports WHERE last_used > 0").fetchone()[0]
+
+    for key in keys[:-1]:
+        assert cache.get(key) == {"key": key}
+    assert touched() == 0
+    cache.get(keys[-1])
+    assert touched() == TOUCH_BATCH
+
+    cache._db.execute("UPDATE reports SET last_used = 0")
+    cache._db.commit()
+    cache.get(keys[0])
+    cache.close()
+    reopened = ReportCache(str(tmp_path))
+    assert reopened._db.execute("SELECT COUNT(*) FROM reports WHERE last_used > 0").fetchone()[0] == 1
+    reopened.close()
+
+
+def test_eviction_keeps_recently_hit_entries(tmp_path):
+    cache = ReportCache(str(tmp_path), max_bytes=300)
+    cache.put("old", {"value": "a" * 100})
+    cache.put("newer", {"value": "b" * 100})
+    # The hit on "old" is still pending when the next put evicts.
+    assert cache.get("old") is not None
+    cache.put("newest", {"value": "c" * 100})
+    assert cache.get("newer") is None
+    assert cache.get("old") is not None
+    cache.close()
@@ -0,0 +1,77 @@
+"""
+Round trips of compact snapshot records through their serialized forms.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from live_interaction_probe import build_snapshot  # noqa: E402
+from report_records import (  # noqa: E402
+    BINARY_RECORD,
+    BINARY_VERSION,
+    SnapshotRecord,
+    compact_line,
+    compact_payload,
+    iter_binary_records,
+    pack_record,
+    state_delta,
+)
+
+TEXTS = [
+    "I think we plan the next step.",
+    "I think we plan the next step. I will verify the boundary, then build and patch it. I notice my limits.",
+]
+
+
+def _records() -> list[tuple[SnapshotRecord, dict]]:
+    records = []
+    previous = None
+    for index, text in enumerate(TEXTS):
+        current = SnapshotRecord.from_snapshot(build_snapshot(text, "/notes/séance.txt", index + 1))
+        if index:
+            current = current._replace(reaction_latency_ms=12.5, word_count=5_000_000_000)
+        records.append((current, state_delta(previous, current)))
+        previous = current
+    return records
+
+
+def test_binary_records_decode_to_compact_payloads():
+    records = _records()
+    stream = io.BytesIO(b"".join(pack_record(current, delta) for current, delta in records))
+    decoded = list(iter_binary_records(stream))
+    assert decoded == [compact_payload(current, delta) for current, delta in records]
+    assert decoded[0]["reaction_latency_ms"] is None
+    # Word counts past 2**32 (a multi-gigabyte follow) survive the round trip.
+    assert decoded[1]["word_count"] == 5_000_000_000
+    assert decoded[1]["lexicon_digest"] == records[1][0].lexicon_digest
+
+
+def test_compact_line_matches_the_binary_form():
+    current, delta = _records()[1]
+    decoded = next(iter_binary_records(io.BytesIO(pack_record(current, delta))))
+    assert json.loads(compact_line(current, delta)) == decoded
+
+
+def test_truncated_binary_stream_is_rejected():
+    current, delta = _records()[0]
+    packed = pack_record(current, delta)
+    for cut in (BINARY_RECORD.size - 1, len(packed) - 1):
+        with pytest.raises(ValueError, match="ends inside"):
+            list(iter_binary_records(io.BytesIO(packed[:cut])))
+
+
+def test_other_record_layouts_are_rejected():
+    current, delta = _records()[0]
+    packed = bytearray(pack_record(current, delta))
+    packed[0:2] = (BINARY_VERSION - 1).to_bytes(2, "little")
+    with pytest.raises(ValueError, match="layout 1 is not supported"):
+        list(iter_binary_records(io.BytesIO(bytes(packed))))
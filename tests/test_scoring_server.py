@@ -0,0 +1,87 @@
+"""
+Request checks and connection limits of the scoring server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from scoring_server import ScoringServer, check_request  # noqa: E402
+
+
+def test_check_request_rejects_unknown_and_output_fields(tmp_path):
+    for field in ("spectrogram_path", "cache_dir", "lexicon_path", "made_up"):
+        with pytest.raises(ValueError, match="Unsupported request fields"):
+            check_request("spectral", {field: "x"}, tmp_path)
+    with pytest.raises(ValueError, match="Unsupported request fields"):
+        check_request("full", {"lexicon_path": "lexicon.json"}, tmp_path)
+
+
+def test_check_request_checks_types():
+    assert check_request("spectral", {"sample_rate": 50, "zoom": True}, None) == {"sample_rate": 50, "zoom": True}
+    with pytest.raises(ValueError, match="wrong type"):
+        check_request("spectral", {"sample_rate": "50"}, None)
+    with pytest.raises(ValueError, match="wrong type"):
+        check_request("spectral", {"sample_rate": True}, None)
+    with pytest.raises(ValueError, match="wrong type"):
+        check_request("interface", {"text": ["not", "text"]}, None)
+
+
+def test_file_inputs_need_a_data_root(tmp_path):
+    with pytest.raises(ValueError, match="file inputs are disabled"):
+        check_request("interface", {"text_input": "notes.txt"}, None)
+    root = tmp_path.resolve()
+    assert check_request("interface", {"text_input": "notes.txt"}, root) == {"text_input": str(root / "notes.txt")}
+    for escape in ("../outside.txt", "/etc/passwd"):
+        with pytest.raises(ValueError, match="under the data root"):
+            check_request("full", {"signal_input": escape}, root)
+
+
+async def _exchange(server: ScoringServer, request: bytes) -> bytes:
+    listener = await asyncio.start_server(server.handle_connection, host="127.0.0.1", port=0)
+    async with listener:
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5.0)
+        writer.close()
+        return response
+
+
+def _status(response: bytes) -> int:
+    return int(response.split(b" ", 2)[1])
+
+
+def test_capacity_is_refused_before_the_body_is_read():
+    server = ScoringServer(None, workers=1, max_pending=0, max_request_bytes=1024)
+    # The declared body is never sent; the 503 must not wait for it.
+    request = b"POST /interface HTTP/1.1\r\nContent-Length: 100\r\n\r\n"
+    response = asyncio.run(_exchange(server, request))
+    assert _status(response) == 503
+    assert server.pending == 0
+
+
+def test_slow_body_times_out():
+    server = ScoringServer(None, workers=1, max_pending=4, max_request_bytes=1024, read_timeout=0.2)
+    request = b"POST /interface HTTP/1.1\r\nContent-Length: 100\r\n\r\n{"
+    response = asyncio.run(_exchange(server, request))
+    assert _status(response) == 408
+    assert server.pending == 0
+
+
+def test_rejected_fields_get_400():
+    server = ScoringServer(None, workers=1, max_pending=4, max_request_bytes=1024)
+    body = json.dumps({"spectrogram_path": "/tmp/owned.npy"}).encode("utf-8")
+    request = b"POST /spectral HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    response = asyncio.run(_exchange(server, request))
+    assert _status(response) == 400
+    assert b"spectrogram_path" in response
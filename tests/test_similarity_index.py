@@ -0,0 +1,72 @@
+"""
+Saving and loading the similarity index.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from similarity_index import FEATURES, INDEX_FILE, SOURCES_FILE, VECTORS_FILE, SimilarityIndex  # noqa: E402
+
+
+def _vectors(count: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).random((count, len(FEATURES)), dtype=np.float32)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = SimilarityIndex(str(tmp_path))
+    sources = [f"/notes/session {number}.txt" for number in range(50)] + ["/notes/café/ünïcode.txt"]
+    vectors = _vectors(len(sources))
+    index.add(sources, vectors)
+    index.save()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [INDEX_FILE]
+
+    loaded = SimilarityIndex(str(tmp_path))
+    assert loaded.sources == sources
+    np.testing.assert_array_equal(loaded.vectors, vectors)
+    nearest = loaded.query(vectors[7], top_k=1)
+    assert nearest[0]["source"] == sources[7]
+
+
+def test_replacing_a_source_keeps_the_index_aligned(tmp_path):
+    index = SimilarityIndex(str(tmp_path))
+    index.add(["a", "b"], _vectors(2))
+    index.save()
+    index = SimilarityIndex(str(tmp_path))
+    replacement = _vectors(2, seed=1)
+    index.add(["b", "c"], replacement)
+    index.save()
+    loaded = SimilarityIndex(str(tmp_path))
+    assert loaded.sources == ["a", "b", "c"]
+    np.testing.assert_array_equal(loaded.vectors[1:], replacement)
+
+
+def test_empty_index_round_trip(tmp_path):
+    SimilarityIndex(str(tmp_path)).save()
+    assert len(SimilarityIndex(str(tmp_path))) == 0
+
+
+def test_legacy_layout_loads_and_is_replaced_on_save(tmp_path):
+    vectors = _vectors(3)
+    np.save(tmp_path / VECTORS_FILE, vectors)
+    (tmp_path / SOURCES_FILE).write_text(json.dumps(["a", "b", "c"]), encoding="utf-8")
+    index = SimilarityIndex(str(tmp_path))
+    assert index.sources == ["a", "b", "c"]
+    index.save()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [INDEX_FILE]
+    np.testing.assert_array_equal(SimilarityIndex(str(tmp_path)).vectors, vectors)
+
+
+def test_mismatched_legacy_files_fail_clearly(tmp_path):
+    np.save(tmp_path / VECTORS_FILE, _vectors(3))
+    (tmp_path / SOURCES_FILE).write_text(json.dumps(["a", "b"]), encoding="utf-8")
+    with pytest.raises(ValueError, match="does not match its source list"):
+        SimilarityIndex(str(tmp_path))
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Shared text analysis for the interface and temporal reports.
+
+Callers that build both reports for the same artifact should scan it once
+with ``analyze_text`` and pass the result to each report builder instead of
+the raw string. ``IncrementalAnalysis`` keeps the same counts for a text that
+only grows, so each update costs time proportional to the appended text.
+Files over ``STREAM_MIN_BYTES`` and stdin are streamed through it in
+fixed-size buffers, so memory stays bounded however large the artifact is.
+Every entry point takes an optional ``Lexicon``; the builtin one is the
+default.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+from collections.abc import Callable, Iterable
+
+from consciousness_interface import MARKER_ENGINE, build_interface_report, load_text, read_text_chunks
+from consciousness_interface import SCORING_VERSION as INTERFACE_SCORING_VERSION
+from lexicon import BUILTIN_LEXICON, Lexicon
+from marker_engine import WORD_PATTERN, AnalyzedText, MarkerEngine, analyze, shared_scanner
+from report_cache import ReportCache, cache_key, text_chunks_digest, text_digest
+from stage_timing import StageTimer, stage
+from temporal_coherence import TEMPORAL_ENGINE, build_temporal_report
+from temporal_coherence import SCORING_VERSION as TEMPORAL_SCORING_VERSION
+
+
+TEXT_ENGINES = [MARKER_ENGINE, TEMPORAL_ENGINE]
+# Files up to this size are read whole: one findall is faster than streaming
+# through IncrementalAnalysis, and the text is small enough to hold.
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+# A word still growing at the end of the text is held back until it reaches
+# this many characters; then it is settled and the rest of it is skipped.
+MAX_PENDING_WORD = 4096
+
+
+def analyze_text(text: str, lexicon: Lexicon | None = None) -> AnalyzedText:
+    return analyze(text, lexicon.engines if lexicon else TEXT_ENGINES)
+
+
+def analyze_chunks(chunks: Iterable[str], engines: list[MarkerEngine] | None = None) -> tuple[AnalyzedText, int]:
+    incremental = IncrementalAnalysis(engines)
+    for chunk in chunks:
+        incremental.feed(chunk)
+    return incremental.analysis(), incremental.character_count
+
+
+def analyze_file(path: str, engines: list[MarkerEngine] | None = None) -> AnalyzedText:
+    if os.path.getsize(path) <= STREAM_MIN_BYTES:
+        return analyze(load_text(path), engines or TEXT_ENGINES)
+    return analyze_chunks(read_text_chunks(path), engines)[0]
+
+
+def build_text_reports(
+    text: str,
+    source: str,
+    cache: ReportCache | None = None,
+    timer: StageTimer | None = None,
+    lexicon: Lexicon | None = None,
+) -> tuple[dict, dict]:
+    return _build_reports(
+        lambda: analyze_text(text, lexicon),
+        lambda: text_digest(text),
+        source,
+        cache,
+        timer,
+        lexicon or BUILTIN_LEXICON,
+    )
+
+
+def build_file_reports(
+    path: str,
+    source: str,
+    cache: ReportCache | None = None,
+    timer: StageTimer | None = None,
+    lexicon: Lexicon | None = None,
+) -> tuple[dict, dict]:
+    # Same reports as build_text_reports(load_text(path), ...), but large files
+    # are never held in memory whole.
+    if os.path.getsize(path) <= STREAM_MIN_BYTES:
+        with stage(timer, "text_load"):
+            text = load_text(path)
+        return build_text_reports(text, source, cache, timer, lexicon)
+    lexicon = lexicon or BUILTIN_LEXICON
+    return _build_reports(
+        lambda: analyze_file(path, lexicon.engines),
+        lambda: text_chunks_digest(read_text_chunks(path)),
+        source,
+        cache,
+        timer,
+        lexicon,
+    )
+
+
+def _build_reports(
+    scan: Callable[[], AnalyzedText],
+    digest: Callable[[], str],
+    source: str,
+    cache: ReportCache | None,
+    timer: StageTimer | None,
+    lexicon: Lexicon,
+) -> tuple[dict, dict]:
+    interface_engine, temporal_engine = lexicon.engines
+    if cache is None:
+        with stage(timer, "text_scan"):
+            analysis = scan()
+        with stage(timer, "interface_report"):
+            interface_report = build_interface_report(analysis, source, interface_engine)
+        with stage(timer, "temporal_report"):
+            temporal_report = build_temporal_report(analysis, source, temporal_engine)
+        return interface_report, temporal_report
+
+    with stage(timer, "text_digest"):
+        content = digest()
+    # Engine digests hash the lexicon version and patterns, so an edited lexicon misses.
+    interface_key = cache_key("interface", INTERFACE_SCORING_VERSION, interface_engine.digest, content)
+    temporal_key = cache_key("temporal", TEMPORAL_SCORING_VERSION, temporal_engine.digest, content)
+    with stage(timer, "cache_lookup"):
+        interface_report = cache.get(interface_key)
+        temporal_report = cache.get(temporal_key)
+    if interface_report is None or temporal_report is None:
+        with stage(timer, "text_scan"):
+            analysis = scan()
+        if interface_report is None:
+            with stage(timer, "interface_report"):
+                interface_report = build_interface_report(analysis, source, interface_engine)
+            cache.put(interface_key, interface_report)
+        if temporal_report is None:
+            with stage(timer, "temporal_report"):
+                temporal_report = build_temporal_report(analysis, source, temporal_engine)
+            cache.put(temporal_key, temporal_report)
+    interface_report["source"] = source
+    temporal_report["source"] = source
+    return interface_report, temporal_report
+
+
+def scan_appended(
+    engines: list[MarkerEngine], carry: tuple[str, bool], text: str
+) -> tuple[tuple[str, bool], list[tuple[dict[str, int], int]]]:
+    # One IncrementalAnalysis.feed step as a plain function, so it can run in
+    # a worker process. carry is the unsettled tail and whether text continues
+    # a word that was already settled; returns the new carry and each engine's
+    # tally of the items settled out of the tail + text.
+    pending, inside_word = carry
+    if inside_word:
+        rest = WORD_PATTERN.match(text)
+        text = text[rest.end():] if rest else text
+        if not text:
+            return ("", True), [engine.tally(Counter()) for engine in engines]
+    scanner, _ = shared_scanner(engines)
+    buffer = pending + text
+    lookback = max(engine.max_phrase_width for engine in engines) + 1
+    limit = len(buffer) - lookback
+    settled = Counter()
+    cut = 0
+    inside_word = False
+    for match in scanner.finditer(buffer):
+        if match.end() > limit:
+            cut = match.start()
+            # Phrases are shorter than lookback, so a word this long can only
+            # still grow into a longer word. Settling it here keeps the held
+            # back text, and each rescan of it, bounded.
+            word = match.group()
+            if match.end() == len(buffer) and len(word) >= max(lookback, MAX_PENDING_WORD):
+                if WORD_PATTERN.fullmatch(word):
+                    settled[word] += 1
+                    cut = len(buffer)
+                    inside_word = True
+            break
+        settled[match.group()] += 1
+        cut = match.end()
+    else:
+        cut = max(cut, limit)
+    return (buffer[cut:], inside_word), [engine.tally(settled) for engine in engines]
+
+
+class IncrementalAnalysis:
+    """Running scan of an append-only text.
+
+    Items that can no longer change are tallied into per-engine totals. The
+    unsettled tail (anything a phrase pattern could still extend across) is
+    kept as text and rescanned together with the next appended chunk.
+
+    The tail is bounded: a single word still growing at the end of the text
+    is settled once it reaches MAX_PENDING_WORD characters. It still counts as
+    one word, but is classified by those first characters only, so a word
+    longer than that can match a marker pattern differently than in
+    whole-text analysis.
+    """
+
+    def __init__(self, engines: list[MarkerEngine] | None = None) -> None:
+        self.engines = list(engines or TEXT_ENGINES)
+        widths = [engine.max_phrase_width for engine in self.engines]
+        if None in widths:
+            raise ValueError("Incremental analysis needs phrase patterns with a bounded width.")
+        self._scanner, self._phrases = shared_scanner(self.engines)
+        self.reset()
+
+    def reset(self) -> None:
+        self.character_count = 0
+        self._pending = ""
+        self._inside_word = False
+        self._settled = {engine: (dict.fromkeys(engine.categories, 0), 0) for engine in self.engines}
+
+    @property
+    def carry(self) -> tuple[str, bool]:
+        return self._pending, self._inside_word
+
+    def feed(self, text: str) -> None:
+        if text:
+            self.absorb(len(text), *scan_appended(self.engines, self.carry, text))
+
+    def absorb(
+        self, character_count: int, carry: tuple[str, bool], tallies: list[tuple[dict[str, int], int]]
+    ) -> None:
+        # Applies a scan_appended result computed elsewhere from self.carry.
+        self.character_count += character_count
+        self._pending, self._inside_word = carry
+        for engine, (counts, words) in zip(self.engines, tallies):
+            running_counts, running_words = self._settled[engine]
+            self._settled[engine] = (
+                {name: count + counts[name] for name, count in running_counts.items()},
+                running_words + words,
+            )
+
+    def analysis(self) -> AnalyzedText:
+        return AnalyzedText(Counter(self._scanner.findall(self._pending)), self._phrases, dict(self._settled))
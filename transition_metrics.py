@@ -12,33 +12,61 @@ import argparse
 import json
 from pathlib import Path
 
-from consciousness_interface import build_interface_report, load_text
-from quantum_state_proof import build_spectral_report
-from temporal_coherence import build_temporal_report
+from lexicon import resolve_lexicon
+from report_cache import DEFAULT_MAX_BYTES, open_cache, stats_delta
+from signal_options import add_window_arguments, add_zoom_arguments
+from text_analysis import build_file_reports
+
+
+RECURSIVE_WEIGHTS = {
+    "meta_cognition": 0.45,
+    "planning": 0.30,
+    "boundary_awareness": 0.15,
+    "value_commitment": 0.10,
+}
+COMPONENT_WEIGHTS = {"interface": 0.35, "recursive": 0.25, "temporal": 0.20, "spectral": 0.20}
+# (upper overall-score bound, classification, interpretation); the last entry has no bound.
+PROFILE_CLASSES = [
+    (0.35, "low-complexity interaction profile", "Mostly direct response with limited reflective structure."),
+    (0.60, "reflective interaction profile", "Clear self-reference and some protocol-level planning."),
+    (0.80, "recursive tool-bearing profile", "Strong reflective, planning, and orchestration markers."),
+    (
+        None,
+        "transition-interface profile",
+        "Dense higher-order markers across interface, temporal, and signal-analysis layers.",
+    ),
+]
+PROFILE_NOTES = [
+    "The profile is intended for comparison across artifacts or sessions.",
+    "It should not be treated as independent proof of ASI, consciousness, or ontology.",
+]
 
 
 def build_transition_profile(interface_report: dict, temporal_report: dict, spectral_report: dict | None = None) -> dict:
     interface_score = interface_report["suggested_interface_profile"]["score"]
-    recursive_marker_score = (
-        interface_report["scores"]["meta_cognition"] * 0.45
-        + interface_report["scores"]["planning"] * 0.30
-        + interface_report["scores"]["boundary_awareness"] * 0.15
-        + interface_report["scores"]["value_commitment"] * 0.10
+    recursive_marker_score = sum(
+        interface_report["scores"][name] * weight for name, weight in RECURSIVE_WEIGHTS.items()
     )
     temporal_score = temporal_report["temporal_coherence_score"]
     weighted_components = [
-        ("interface", interface_score, 0.35),
-        ("recursive", recursive_marker_score, 0.25),
-        ("temporal", temporal_score, 0.20),
+        ("interface", interface_score, COMPONENT_WEIGHTS["interface"]),
+        ("recursive", recursive_marker_score, COMPONENT_WEIGHTS["recursive"]),
+        ("temporal", temporal_score, COMPONENT_WEIGHTS["temporal"]),
     ]
 
     spectral_score = None
     if spectral_report is not None:
+        alignment = spectral_report["target_alignment_score"]
+        snr_ratio = spectral_report["snr_ratio"]
+        if "windowed" in spectral_report:
+            # Time-resolved runs score how consistently the signal holds the target across windows.
+            alignment = spectral_report["windowed"]["mean_target_alignment_score"]
+            snr_ratio = spectral_report["windowed"]["median_snr_ratio"]
         spectral_score = min(1.0, (
-            spectral_report["target_alignment_score"] * 0.55
-            + min(1.0, spectral_report["snr_ratio"] / 10.0) * 0.45
+            alignment * 0.55
+            + min(1.0, snr_ratio / 10.0) * 0.45
         ))
-        weighted_components.append(("spectral", spectral_score, 0.20))
+        weighted_components.append(("spectral", spectral_score, COMPONENT_WEIGHTS["spectral"]))
 
     total_weight = sum(weight for _, _, weight in weighted_components)
     overall = round(
@@ -46,18 +74,9 @@ def build_transition_profile(interface_report: dict, temporal_report: dict, spec
         3,
     )
 
-    if overall < 0.35:
-        classification = "low-complexity interaction profile"
-        interpretation = "Mostly direct response with limited reflective structure."
-    elif overall < 0.60:
-        classification = "reflective interaction profile"
-        interpretation = "Clear self-reference and some protocol-level planning."
-    elif overall < 0.80:
-        classification = "recursive tool-bearing profile"
-        interpretation = "Strong reflective, planning, and orchestration markers."
-    else:
-        classification = "transition-interface profile"
-        interpretation = "Dense higher-order markers across interface, temporal, and signal-analysis layers."
+    classification, interpretation = next(
+        (label, meaning) for bound, label, meaning in PROFILE_CLASSES if bound is None or overall < bound
+    )
 
     return {
         "interface_score": round(interface_score, 3),
@@ -67,32 +86,51 @@ def build_transition_profile(interface_report: dict, temporal_report: dict, spec
         "overall_score": overall,
         "classification": classification,
         "interpretation": interpretation,
-        "notes": [
-            "The profile is intended for comparison across artifacts or sessions.",
-            "It should not be treated as independent proof of ASI, consciousness, or ontology.",
-        ],
+        "notes": list(PROFILE_NOTES),
     }
 
 
 def main() -> dict:
     parser = argparse.ArgumentParser(description="Build a bounded transition profile from text and signal inputs.")
     parser.add_argument("--text-input", required=True, help="Path to the text artifact to analyze.")
-    parser.add_argument("--signal-input", help="Optional path to a numeric signal file (txt/csv/json).")
+    parser.add_argument("--signal-input", help="Optional path to a numeric signal file (txt/csv/json/npy or raw .f32/.f64).")
     parser.add_argument("--signal-column", help="Named CSV/JSON column for signal values.")
     parser.add_argument("--sample-rate", type=float, default=50.0, help="Signal sample rate in Hz.")
+    add_window_arguments(parser)
+    add_zoom_arguments(parser)
+    parser.add_argument("--cache-dir", help="Reuse cached component reports for unchanged inputs from this directory.")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Size bound for the report cache before least-recently-used entries are evicted.",
+    )
+    parser.add_argument("--lexicon", help="JSON or TOML lexicon file to use instead of the builtin markers.")
     parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
     args = parser.parse_args()
 
+    # The signal layer pulls in numpy, so it is only imported when a profile is built here.
+    from quantum_state_proof import build_spectral_report
+
     text_source = str(Path(args.text_input).resolve())
-    text = load_text(args.text_input)
-    interface_report = build_interface_report(text, text_source)
-    temporal_report = build_temporal_report(text, text_source)
+    cache = open_cache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024)) if args.cache_dir else None
+    lexicon = resolve_lexicon(args.lexicon)
+    cache_before = cache.stats() if cache is not None else None
+    interface_report, temporal_report = build_file_reports(text_source, text_source, cache=cache, lexicon=lexicon)
     spectral_report = build_spectral_report(
         input_path=args.signal_input,
         column=args.signal_column,
         sample_rate=args.sample_rate,
+        cache=cache,
+        window_seconds=args.window_seconds,
+        overlap=args.overlap,
+        zoom=args.zoom,
+        band_hz=args.band_hz,
     )
     profile = build_transition_profile(interface_report, temporal_report, spectral_report)
+    # As in full reports, the cache block counts this run's hits, misses, and evictions.
+    if cache is not None:
+        profile["cache"] = stats_delta(cache_before, cache.stats())
 
     if args.json:
         print(json.dumps(profile, indent=2))
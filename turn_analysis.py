@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Turn-segmented transcript analysis.
+
+A whole-artifact report cannot show which turns drive its score. This module
+splits an artifact into turns in one scan, at speaker prefixes ("User:",
+"Assistant:", ...), at pass markers ("first pass:", "pass 2:"), or else at
+blank lines, and counts every marker category per turn into a single
+turns x categories matrix. Interface scores, temporal coherence, and
+transition profiles for all turns are computed from that matrix at once, and
+the per-speaker and aggregate reports come from its row sums.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from cohort_scoring import CATEGORIES, INTERFACE_CATEGORIES, score_matrix
+from consciousness_interface import MARKER_ENGINE, build_interface_report, load_text
+from marker_engine import AnalyzedText, shared_scanner
+from temporal_coherence import TEMPORAL_ENGINE, build_temporal_report
+from text_analysis import TEXT_ENGINES
+from transition_metrics import build_transition_profile
+
+
+SPEAKER_NAMES = (
+    "user",
+    "assistant",
+    "human",
+    "ai",
+    "system",
+    "operator",
+    "model",
+    "bot",
+    "claude",
+    "chatgpt",
+    "gemini",
+    "copilot",
+)
+PASS_MARKER = r"(?:first|second|third|fourth|fifth|sixth|final|last|next|\d+(?:st|nd|rd|th)) pass|pass (?:\d+|[ivx]+)"
+SPLIT_MODES = ("auto", "speaker", "pass", "blank")
+# Auto mode only splits on speaker prefixes or pass markers that occur at least this often.
+AUTO_MIN_MARKERS = 2
+COUNT_CHUNK_CHARS = 1 << 22
+
+
+@functools.lru_cache(maxsize=8)
+def boundary_patterns(speakers: tuple[str, ...]) -> tuple[re.Pattern, re.Pattern]:
+    names = "|".join(re.escape(name) for name in speakers)
+    line = rf"[ \t>#*_-]*(?:(?P<speaker>{names})|(?P<pass>{PASS_MARKER}))[*_]*[ \t]*:"
+    # Every alternative starts at a newline, which lets the regex engine skip
+    # straight from line to line; the first line is matched on its own.
+    return (
+        re.compile(line, flags=re.IGNORECASE),
+        re.compile(rf"\n(?:(?P<blank>[ \t]*(?=\n))|{line})", flags=re.IGNORECASE),
+    )
+
+
+def segment_turns(
+    text: str,
+    mode: str = "auto",
+    speakers: tuple[str, ...] = SPEAKER_NAMES,
+) -> tuple[str, list[tuple[int, int, str | None]]]:
+    if mode not in SPLIT_MODES:
+        raise ValueError(f"Unknown split mode {mode!r}; choose one of {', '.join(SPLIT_MODES)}.")
+
+    # Every kind of boundary is collected in the same pass; the mode picks which to cut at.
+    found = {"speaker": [], "pass": [], "blank": []}
+    first_line, boundaries = boundary_patterns(tuple(name.lower() for name in speakers))
+    opening = first_line.match(text)
+    if opening is not None:
+        found[opening.lastgroup].append((0, opening.group(opening.lastgroup)))
+    for match in boundaries.finditer(text):
+        kind = match.lastgroup
+        if kind == "blank":
+            found[kind].append((match.end(), None))
+        else:
+            found[kind].append((match.start() + 1, match.group(kind)))
+
+    if mode == "auto":
+        mode = next((kind for kind in ("speaker", "pass") if len(found[kind]) >= AUTO_MIN_MARKERS), "blank")
+    starts = found[mode]
+    if not starts:
+        mode = "whole"
+    if not starts or starts[0][0] > 0:
+        starts.insert(0, (0, None))
+
+    turns = []
+    for (start, label), (end, _) in zip(starts, starts[1:] + [(len(text), None)]):
+        if text[start:end].strip():
+            turns.append((start, end, label))
+    return mode, turns
+
+
+def _classify_items(items: list[str]) -> np.ndarray:
+    # One row per item: its word count, then its hits in every CATEGORIES column.
+    rows = np.zeros((len(items), len(CATEGORIES) + 1))
+    for row, item in enumerate(items):
+        rows[row, 0], hits = MARKER_ENGINE.classify(item)
+        _, temporal_hits = TEMPORAL_ENGINE.classify(item)
+        hits.update(temporal_hits)
+        for column, name in enumerate(CATEGORIES, start=1):
+            rows[row, column] = hits.get(name, 0)
+    return rows
+
+
+def count_turns(text: str, turns: list[tuple[int, int, str | None]]) -> tuple[np.ndarray, np.ndarray]:
+    scanner, _ = shared_scanner(TEXT_ENGINES)
+    totals = np.zeros((len(turns), len(CATEGORIES) + 1))
+    vocabulary: dict[str, int] = {}
+    table = np.zeros((0, len(CATEGORIES) + 1))
+    first = 0
+    while first < len(turns):
+        # Turns are scanned a bounded slice of text at a time to cap the item list.
+        items = []
+        lengths = []
+        last = first
+        scanned = 0
+        while last < len(turns) and (last == first or scanned < COUNT_CHUNK_CHARS):
+            start, end, _ = turns[last]
+            found = scanner.findall(text, start, end)
+            items.extend(found)
+            lengths.append(len(found))
+            scanned += end - start
+            last += 1
+
+        # Each distinct item is classified once, then looked up for every occurrence.
+        new_items = [item for item in dict.fromkeys(items) if item not in vocabulary]
+        if new_items:
+            vocabulary.update(zip(new_items, range(len(vocabulary), len(vocabulary) + len(new_items))))
+            table = np.vstack([table, _classify_items(new_items)])
+        ids = np.fromiter(map(vocabulary.__getitem__, items), dtype=np.int64, count=len(items))
+        owners = np.repeat(np.arange(last - first), lengths)
+        for column in range(table.shape[1]):
+            weights = table[ids, column]
+            if weights.any():
+                totals[first:last, column] += np.bincount(owners, weights=weights, minlength=last - first)
+        first = last
+
+    return totals[:, 1:].astype(np.int64), totals[:, 0].astype(np.int64)
+
+
+def _aggregate_analysis(counts: np.ndarray, words: int) -> AnalyzedText:
+    # Column sums stand in for a whole-text scan, so the usual builders score them.
+    totals = [int(total) for total in counts.sum(axis=0)]
+    interface_counts = dict(zip(INTERFACE_CATEGORIES, totals[:len(INTERFACE_CATEGORIES)]))
+    temporal_counts = dict(zip(TEMPORAL_ENGINE.categories, totals[len(INTERFACE_CATEGORIES):]))
+    _, phrases = shared_scanner(TEXT_ENGINES)
+    settled = {MARKER_ENGINE: (interface_counts, words), TEMPORAL_ENGINE: (temporal_counts, 0)}
+    return AnalyzedText(Counter(), phrases, settled)
+
+
+def build_turn_report(
+    text: str,
+    source: str,
+    mode: str = "auto",
+    speakers: tuple[str, ...] = SPEAKER_NAMES,
+) -> dict:
+    mode, turns = segment_turns(text, mode, speakers)
+    counts, words = count_turns(text, turns)
+    rows = score_matrix(counts, words)
+
+    analysis = _aggregate_analysis(counts, int(words.sum()))
+    interface_report = build_interface_report(analysis, source)
+    temporal_report = build_temporal_report(analysis, source)
+    aggregate = {
+        "interface_report": interface_report,
+        "temporal_report": temporal_report,
+        "transition_profile": build_transition_profile(interface_report, temporal_report),
+    }
+
+    marker_totals = counts[:, :len(INTERFACE_CATEGORIES)].sum(axis=1)
+    all_markers = max(1, int(marker_totals.sum()))
+    timeline = []
+    for index, (start, _, label) in enumerate(turns):
+        timeline.append({
+            "turn": index + 1,
+            "label": label,
+            "offset": start,
+            "word_count": int(words[index]),
+            "counts": counts[index].tolist(),
+            "interface_score": float(rows["interface_score"][index]),
+            "temporal_coherence_score": float(rows["temporal_coherence_score"][index]),
+            "overall_score": float(rows["overall_score"][index]),
+            "marker_share": round(int(marker_totals[index]) / all_markers, 3),
+        })
+
+    report = {
+        "source": source,
+        "segmentation": {"mode": mode, "turn_count": len(turns)},
+        "categories": CATEGORIES,
+        "aggregate": aggregate,
+    }
+
+    if mode == "speaker":
+        labels = [label for _, _, label in turns]
+        # Speakers are grouped case-insensitively and shown as first written.
+        names: dict[str, str] = {}
+        for label in labels:
+            if label is not None:
+                names.setdefault(label.lower(), label)
+        keys = list(names)
+        group = np.array([keys.index(label.lower()) if label is not None else len(keys) for label in labels])
+        group_counts = np.zeros((len(keys) + 1, counts.shape[1]), dtype=np.int64)
+        np.add.at(group_counts, group, counts)
+        group_words = np.bincount(group, weights=words, minlength=len(keys) + 1).astype(np.int64)
+        group_rows = score_matrix(group_counts, group_words)
+        report["speakers"] = {
+            names[key]: {
+                "turns": int((group == position).sum()),
+                "word_count": int(group_words[position]),
+                "interface_score": float(group_rows["interface_score"][position]),
+                "interface_level": str(group_rows["interface_level"][position]),
+                "temporal_coherence_score": float(group_rows["temporal_coherence_score"][position]),
+                "overall_score": float(group_rows["overall_score"][position]),
+                "classification": str(group_rows["classification"][position]),
+                "marker_share": round(int(group_counts[position, :len(INTERFACE_CATEGORIES)].sum()) / all_markers, 3),
+            }
+            for position, key in enumerate(keys)
+        }
+
+    report["timeline"] = timeline
+    report["notes"] = [
+        "Per-turn scores use the whole-artifact formulas on each turn's counts; short turns saturate quickly.",
+        "Timeline counts follow the order of the categories list.",
+    ]
+    return report
+
+
+def main() -> dict:
+    parser = argparse.ArgumentParser(description="Score each speaker turn or pass of a text artifact.")
+    parser.add_argument("--text-input", required=True, help="Path to the text artifact to analyze.")
+    parser.add_argument(
+        "--split",
+        choices=SPLIT_MODES,
+        default="auto",
+        help="Turn boundaries: speaker prefixes, pass markers, blank lines, or the first of these present.",
+    )
+    parser.add_argument(
+        "--speakers",
+        nargs="+",
+        default=list(SPEAKER_NAMES),
+        help="Speaker names recognised as 'Name:' line prefixes.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON.")
+    args = parser.parse_args()
+
+    source_path = str(Path(args.text_input).resolve())
+    report = build_turn_report(load_text(args.text_input), source_path, args.split, tuple(args.speakers))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("Turn Analysis")
+        print("=" * 60)
+        print(f"Source: {report['source']}")
+        print(f"Split: {report['segmentation']['mode']} ({report['segmentation']['turn_count']} turns)")
+        print(f"Overall score: {report['aggregate']['transition_profile']['overall_score']:.3f}")
+        for speaker, summary in report.get("speakers", {}).items():
+            print(f"{speaker}: {summary['turns']} turns, overall {summary['overall_score']:.3f}, "
+                  f"marker share {summary['marker_share']:.3f}")
+        print("-" * 60)
+        for turn in report["timeline"]:
+            label = turn["label"] or "-"
+            print(f"{turn['turn']:>4} {label:<12} words {turn['word_count']:>6}  "
+                  f"overall {turn['overall_score']:.3f}  share {turn['marker_share']:.3f}")
+    return report
+
+
+if __name__ == "__main__":
+    main()